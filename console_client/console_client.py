@@ -1,6 +1,22 @@
+"""Play Hive in the console, optionally against a bot.
+
+Run from anywhere with:
+    python console_client/console_client.py [--bot-depth DEPTH]
+or from the repository root with python -m console_client.console_client.
+"""
+import argparse
 import collections
-from rules.piece import Piece
-from rules.game_board import GameBoard
+import os
+import sys
+
+if __name__ == '__main__':
+    # Run as a script, this file's directory is first on sys.path, where
+    # this module would shadow the console_client package.
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from console_client.ponderer import Ponderer  # noqa: E402
+from rules.piece import Piece  # noqa: E402
+from rules.game_board import GameBoard  # noqa: E402
 
 
 class ConsoleClient:
@@ -17,12 +33,28 @@ class ConsoleClient:
         Piece.Creature.BEETLE: "b",
         Piece.Creature.GRASSHOPPER: "g",
         Piece.Creature.ANT: "a",
+        Piece.Creature.MOSQUITO: "m",
+        Piece.Creature.LADYBUG: "l",
+        Piece.Creature.PILLBUG: "p",
     }
 
-    def __init__(self, game_board):
+    def __init__(self, game_board, ponderer=None):
+        """ponderer - A Ponderer to search in the background while waiting
+            for input. Entering "h" then shows its best move so far."""
+
         self.game_board = game_board
+        self.ponderer = ponderer
 
     def get_move(self):
+        if self.ponderer:
+            self.ponderer.start(self.game_board)
+        try:
+            return self._get_move()
+        finally:
+            if self.ponderer:
+                self.ponderer.stop()
+
+    def _get_move(self):
         unsorted_piece_moves = self.game_board.get_moves()
         sorted_keys = sorted(unsorted_piece_moves.keys())
 
@@ -41,7 +73,7 @@ class ConsoleClient:
             for i, piece in enumerate(piece_moves.keys()):
                 print(str(i) + ") " + str(piece))
 
-            piece_index = int(input("Select source piece number:"))
+            piece_index = self._input_index("Select source piece number:")
             piece, valid_moves = \
                 list(piece_moves.items())[piece_index]
             valid_moves = list(valid_moves)
@@ -49,7 +81,7 @@ class ConsoleClient:
             if len(valid_moves) > 1:
                 for i, move in enumerate(valid_moves):
                     print(str(i) + ") " + str(move))
-                dest_index = int(input("Select destination number:"))
+                dest_index = self._input_index("Select destination number:")
             else:
                 dest_index = 0
             dest = valid_moves[dest_index]
@@ -61,6 +93,18 @@ class ConsoleClient:
                 q=dest.q,
                 r=dest.r)
 
+    def _input_index(self, prompt):
+        while True:
+            text = input(prompt)
+            if self.ponderer and text.strip() == "h":
+                hint = self.ponderer.get_hint(self.game_board)
+                if hint:
+                    print("Hint: {} to ({}, {})".format(hint, hint.q, hint.r))
+                else:
+                    print("Hint: not found yet")
+                continue
+            return int(text)
+
     def game_state_as_string(self):
         result = "Current player: " + \
             str(self.game_board.player_turn.name) + "\n"
@@ -115,11 +159,40 @@ class ConsoleClient:
 
         return "   "
 
+
+def play_game(client, ponderer=None, bot_depth=None):
+    """Play client.game_board to the end, with ponderer moving for black
+    if given, and return its GameBoard.Result. A player without moves
+    passes."""
+
+    game_board = client.game_board
+    while game_board.get_result() is None:
+        if ponderer and game_board.player_turn == Piece.Color.BLACK:
+            move = ponderer.get_move(game_board, bot_depth)
+        else:
+            move = client.get_move()
+        if move is None:
+            game_board.pass_turn()
+        else:
+            game_board.place(move)
+    return game_board.get_result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bot-depth", type=int,
+                        help="Play black with a bot searching this deep, "
+                             "pondering during white's turns")
+    args = parser.parse_args(argv)
+
+    ponderer = None
+    if args.bot_depth:
+        ponderer = Ponderer(max_depth=args.bot_depth)
+    client = ConsoleClient(GameBoard(), ponderer)
+    result = play_game(client, ponderer, args.bot_depth)
+    print(client.game_state_as_string())
+    print("Result: " + result.name)
+
+
 if __name__ == '__main__':
-    client = ConsoleClient(GameBoard())
-    while True:
-        move = client.get_move()
-        if not move:
-            break
-        client.game_board.place(move)
-    print("Server Terminated.")
+    main()
@@ -0,0 +1,123 @@
+"""Searching positions in the background while a player thinks.
+
+A Ponderer searches the position the player is looking at in a thread,
+first for a hint of their own best move and then for the best reply to
+each of their moves, one depth at a time. Results are kept by the position's
+GameBoard.get_zobrist_hash, so the bot's move is usually ready as soon as
+the player has moved. The thread mostly runs while the main thread waits
+in input(), which releases the interpreter lock.
+"""
+import threading
+from search import alpha_beta
+
+
+class Ponderer:
+    """Background alpha-beta search of the positions around one position.
+
+    Attributes:
+        max_depth - The deepest depth searched.
+    """
+
+    def __init__(self, max_depth=3, evaluate=alpha_beta.evaluate):
+        self.max_depth = max_depth
+        self._evaluate = evaluate
+        self._results = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop_event = None
+
+    def start(self, game_board):
+        """Start searching game_board and the positions after each of its
+        moves, stopping any earlier search. game_board can be changed
+        while the search runs."""
+
+        self.stop()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._ponder, args=(game_board.copy(), self._stop_event),
+            daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the search and wait for its thread to finish."""
+
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_result(self, game_board):
+        """Get (value, move, depth) of the deepest search of game_board so
+        far, or None."""
+
+        with self._lock:
+            return self._results.get(game_board.get_zobrist_hash())
+
+    def get_hint(self, game_board):
+        """Get the best move found for game_board so far, or None."""
+
+        result = self.get_result(game_board)
+        return None if result is None else _copy_move(result[1])
+
+    def get_move(self, game_board, depth=2):
+        """Get the best move of game_board searched at least depth plies
+        deep, from the results if there is one and otherwise searching now.
+        Returns None if the player to move has to pass."""
+
+        result = self.get_result(game_board)
+        if result is not None and result[2] >= depth:
+            return _copy_move(result[1])
+
+        value, move = alpha_beta.get_best_move(game_board, depth,
+                                               self._evaluate)
+        self._store(game_board, value, move, depth)
+        return _copy_move(move)
+
+    def _ponder(self, game_board, stop_event):
+        def evaluate(searched_board):
+            if stop_event.is_set():
+                raise alpha_beta.SearchTimeout()
+            return self._evaluate(searched_board)
+
+        try:
+            for depth in range(1, self.max_depth + 1):
+                _, hint = self._search(game_board, depth, evaluate)
+                moves = alpha_beta.get_move_list(game_board)
+                if hint in moves:
+                    moves.remove(hint)
+                    moves.insert(0, hint)
+                for move in moves:
+                    self._search(alpha_beta.play(game_board, move), depth,
+                                 evaluate)
+        except alpha_beta.SearchTimeout:
+            pass
+
+    def _search(self, game_board, depth, evaluate):
+        """Search game_board unless it has been searched as deep, and get
+        (value, move)."""
+
+        result = self.get_result(game_board)
+        if result is not None and result[2] >= depth:
+            return result[:2]
+
+        value, move = alpha_beta.get_best_move(game_board, depth, evaluate)
+        self._store(game_board, value, move, depth)
+        return value, move
+
+    def _store(self, game_board, value, move, depth):
+        key = game_board.get_zobrist_hash()
+        with self._lock:
+            result = self._results.get(key)
+            if result is None or result[2] < depth:
+                self._results[key] = (value, move, depth)
+
+
+def _copy_move(move):
+    """Get a Piece of its own for a board to keep, as stored moves are
+    shared."""
+
+    return None if move is None else move.get_moved_absolute(move.q, move.r)
@@ -0,0 +1,122 @@
+"""An SQLite index of the positions reached in games.
+
+Each game's positions, including the empty board before the first move, are
+stored by a 64-bit hash of GameBoard.get_position_key with the game, ply
+and player to move. Games store their GameBoard.Result, or NULL if they
+weren't finished.
+"""
+import hashlib
+import sqlite3
+from rules import notation
+from rules.game_board import GameBoard
+
+
+_schema = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id INTEGER PRIMARY KEY,
+    source TEXT,
+    result INTEGER
+);
+CREATE TABLE IF NOT EXISTS positions (
+    position_hash INTEGER NOT NULL,
+    game_id INTEGER NOT NULL REFERENCES games (game_id),
+    ply INTEGER NOT NULL,
+    player_turn INTEGER NOT NULL,
+    PRIMARY KEY (game_id, ply)
+);
+CREATE INDEX IF NOT EXISTS positions_by_hash
+    ON positions (position_hash, game_id);
+"""
+
+
+def get_position_hash(game_board):
+    """Get a signed 64-bit hash of game_board.get_position_key(), as stored
+    in the database."""
+
+    key = game_board.get_position_key()
+    values = [key[0]] + [x for q, r, stack in key[1:]
+                         for x in (q, r, len(stack)) +
+                         tuple(y for piece in stack for y in piece)]
+    digest = hashlib.blake2b(
+        b"".join(int(x).to_bytes(2, "little", signed=True) for x in values),
+        digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+class PositionDatabase:
+    """Positions of games in an SQLite file, or in memory by default."""
+
+    def __init__(self, path=":memory:"):
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(_schema)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._connection.close()
+
+    def add_game(self, moves, result=None, source=None):
+        """Add the game of moves, as from notation.read_games, and get its
+        game id. result defaults to the result of the final position."""
+
+        return self.add_games([(moves, result, source)])[0]
+
+    def add_games(self, games):
+        """Add each (moves, result, source) of games in one transaction, and
+        get their game ids. games may be any iterable, such as a generator
+        over notation.read_games."""
+
+        game_ids = []
+        with self._connection:
+            for moves, result, source in games:
+                game_board = GameBoard()
+                positions = [(get_position_hash(game_board), 0,
+                              int(game_board.player_turn))]
+                for ply, move in enumerate(moves, 1):
+                    notation.play_move(game_board, move, validate=False)
+                    positions.append((get_position_hash(game_board), ply,
+                                      int(game_board.player_turn)))
+
+                if result is None:
+                    result = game_board.get_result()
+                cursor = self._connection.execute(
+                    "INSERT INTO games (source, result) VALUES (?, ?)",
+                    (source, None if result is None else int(result)))
+                game_id = cursor.lastrowid
+                self._connection.executemany(
+                    "INSERT INTO positions "
+                    "(position_hash, game_id, ply, player_turn) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(position_hash, game_id, ply, player_turn)
+                     for position_hash, ply, player_turn in positions])
+                game_ids.append(game_id)
+        return game_ids
+
+    def get_games(self, game_board):
+        """Get (game_id, ply) of the first time each game reached the
+        position of game_board, by game_id."""
+
+        return self._connection.execute(
+            "SELECT game_id, MIN(ply) FROM positions "
+            "WHERE position_hash = ? GROUP BY game_id ORDER BY game_id",
+            (get_position_hash(game_board),)).fetchall()
+
+    def get_result_counts(self, game_board):
+        """Get a dict of GameBoard.Result, or None for unfinished games, to
+        the number of games which reached the position of game_board."""
+
+        rows = self._connection.execute(
+            "SELECT games.result, COUNT(*) FROM games WHERE game_id IN "
+            "(SELECT game_id FROM positions WHERE position_hash = ?) "
+            "GROUP BY games.result",
+            (get_position_hash(game_board),)).fetchall()
+        return {None if result is None else GameBoard.Result(result): count
+                for result, count in rows}
+
+    def get_game_count(self):
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM games").fetchone()[0]
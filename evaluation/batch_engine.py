@@ -0,0 +1,310 @@
+"""Lockstep play of many independent games.
+
+BatchEngine holds every game as rows of the arrays made by
+features.pack_game_boards, so generating moves for, and applying moves
+to, the whole batch are array operations rather than a loop over
+GameBoards. The rules are those of GameBoard, with two additions a
+GameBoard leaves to its caller: a player without moves passes, and a game
+ends once a bee is surrounded.
+"""
+import collections
+import numpy
+from evaluation import features
+from rules.game_board import GameBoard
+from rules.piece import Piece
+
+
+ONGOING = -1
+WHITE_WON = GameBoard.Result.WHITE_WON
+BLACK_WON = GameBoard.Result.BLACK_WON
+DRAW = GameBoard.Result.DRAW
+
+Moves = collections.namedtuple(
+    "Moves", ["game_indices", "slot_indices", "q", "r", "counts", "starts"])
+Moves.__doc__ = """Legal moves of every game in a batch, ordered by game.
+
+game_indices, slot_indices, q, r - One entry per move, of the game, the
+    features.get_piece_slots index of the moving piece and the destination.
+counts, starts - One entry per game, of the number of moves it has and the
+    index of its first move.
+"""
+
+
+class BatchEngine:
+    """A batch of games, stepped one ply at a time.
+
+    Attributes:
+        state - The arrays of features.pack_game_boards, one row per game.
+        results - (games,) ONGOING, WHITE_WON, BLACK_WON or DRAW.
+    """
+
+    def __init__(self, game_boards):
+        self.state = features.pack_game_boards(game_boards)
+        self.results = numpy.full(len(game_boards), ONGOING, dtype=numpy.int8)
+
+        slots = features.get_piece_slots()
+        self._slot_colors = numpy.array([x[0] for x in slots])
+        self._slot_creatures = numpy.array([x[1] for x in slots])
+        self._slot_numbers = numpy.array([x[2] for x in slots])
+        self._bee_slots = numpy.array(
+            [slots.index((color, Piece.Creature.BEE, 0))
+             for color in Piece.Color])
+        self._update_results()
+
+    @classmethod
+    def new_games(cls, game_count):
+        return cls([GameBoard() for _ in range(game_count)])
+
+    def __len__(self):
+        return len(self.results)
+
+    def to_game_boards(self):
+        """Get a GameBoard for the position of each game."""
+
+        return features.unpack_game_boards(self.state)
+
+    def get_moves(self):
+        """Get the Moves of the player to move in every ongoing game."""
+
+        grid = features.Grid(self.state)
+        masks = self._get_move_masks(grid)
+
+        game_indices, slot_indices, q_indices, r_indices = \
+            numpy.nonzero(masks)
+        counts = numpy.bincount(game_indices, minlength=len(self))
+        starts = numpy.concatenate(([0], numpy.cumsum(counts)[:-1]))
+        return Moves(
+            game_indices,
+            slot_indices,
+            q_indices + grid.q_origin[game_indices],
+            r_indices + grid.r_origin[game_indices],
+            counts,
+            starts)
+
+    def get_random_move_indices(self, moves, rng):
+        """Get the (games,) index into moves of a uniformly random move for
+        each game, or -1 for games without moves. rng is a
+        numpy.random.Generator."""
+
+        offsets = numpy.floor(
+            rng.random(len(self)) * moves.counts).astype(numpy.int64)
+        return numpy.where(moves.counts > 0, moves.starts + offsets, -1)
+
+    def step(self, moves, move_indices):
+        """Advance every ongoing game one ply, making the move at
+        move_indices[game] of moves, or passing where it is -1."""
+
+        move_indices = numpy.asarray(move_indices)
+        ongoing = self.results == ONGOING
+        moving = ongoing & (move_indices >= 0)
+
+        selected = move_indices[moving]
+        self._apply(moves.game_indices[selected],
+                    moves.slot_indices[selected],
+                    moves.q[selected],
+                    moves.r[selected])
+
+        self.state["player_turn"][ongoing] = \
+            1 - self.state["player_turn"][ongoing]
+        self._update_results()
+
+    def step_random(self, rng):
+        """Advance every ongoing game one ply with a random legal move."""
+
+        moves = self.get_moves()
+        self.step(moves, self.get_random_move_indices(moves, rng))
+
+    def _get_move_masks(self, grid):
+        """Get a (games, slots, q, r) bool array of legal destinations."""
+
+        state = self.state
+        game_count, slot_count = state["placed"].shape
+        game_range = numpy.arange(game_count)
+        turn = state["player_turn"]
+        ongoing = self.results == ONGOING
+        turn_slots = self._slot_colors[None, :] == turn[:, None]
+
+        masks = numpy.zeros((game_count, slot_count) + grid.occupied.shape[1:],
+                            dtype=bool)
+
+        # As GameBoard._get_unplaced_moves.
+        unplaced = ~state["placed"] & turn_slots
+        lowest_unplaced = unplaced & self._is_lowest_numbered(unplaced)
+        placed_counts = (state["placed"] & turn_slots).sum(axis=1)
+        bee_placed = state["placed"][game_range, self._bee_slots[turn]]
+        must_place_bee = ~bee_placed & (placed_counts >= 3)
+        lowest_unplaced[must_place_bee] &= \
+            self._slot_creatures == Piece.Creature.BEE
+        lowest_unplaced &= ongoing[:, None]
+
+        placement_masks = numpy.where(
+            (turn == Piece.Color.WHITE)[:, None, None],
+            grid.get_placement_masks(Piece.Color.WHITE),
+            grid.get_placement_masks(Piece.Color.BLACK))
+        placing_games, placing_slots = numpy.nonzero(lowest_unplaced)
+        masks[placing_games, placing_slots] = placement_masks[placing_games]
+
+        # As GameBoard._get_placed_moves.
+        pinned = features.get_pinned(state)
+        moving = ongoing & bee_placed
+        movable = (state["top"] & ~pinned & turn_slots & moving[:, None])
+        game_indices, slot_indices = numpy.nonzero(movable)
+        for creature in Piece.Creature:
+            searches = self._slot_creatures[slot_indices] == creature
+            if not searches.any():
+                continue
+
+            search = features.Search(grid, state,
+                                      game_indices[searches],
+                                      slot_indices[searches])
+            masks[search.board_indices, search.slot_indices] = \
+                features.get_move_masks(creature, search)
+
+        throwers = (state["top"] & (state["height"] == 1) & turn_slots &
+                    moving[:, None])
+        self._add_throws(grid, masks, pinned, throwers)
+        return masks
+
+    def _is_lowest_numbered(self, unplaced):
+        """Get the (games, slots) unplaced slots with no lower numbered
+        unplaced slot of the same color and creature."""
+
+        lowest = numpy.ones(unplaced.shape, dtype=bool)
+        for slot_index in numpy.flatnonzero(self._slot_numbers):
+            lower_slots = (
+                (self._slot_colors == self._slot_colors[slot_index]) &
+                (self._slot_creatures == self._slot_creatures[slot_index]) &
+                (self._slot_numbers < self._slot_numbers[slot_index]))
+            lowest[:, slot_index] = ~unplaced[:, lower_slots].any(axis=1)
+        return lowest
+
+    def _add_throws(self, grid, masks, pinned, throwers):
+        """Add the throws of the (games, slots) throwers which are pillbugs,
+        or mosquitoes next to one, as Piece.get_throws."""
+
+        state = self.state
+        directions = features.DIRECTIONS
+        game_indices, slot_indices = numpy.nonzero(throwers)
+        search = features.Search(grid, state, game_indices, slot_indices)
+
+        # As Piece._can_throw, counting the mosquitoes next to a pillbug.
+        creatures = self._slot_creatures[slot_indices]
+        next_to_pillbug = numpy.zeros(len(slot_indices), dtype=bool)
+        for dq, dr in directions:
+            next_to_pillbug |= search.get_start_values(
+                search.creature, dq, dr) == Piece.Creature.PILLBUG
+        throwing = ((creatures == Piece.Creature.PILLBUG) |
+                    ((creatures == Piece.Creature.MOSQUITO) &
+                     next_to_pillbug))
+        search = search.get_subset(throwing)
+        search_range = numpy.arange(len(search.board_indices))
+        size = grid.occupied.shape[1]
+        slots = grid.slot[search.board_indices]
+
+        def get_values(values, q, r):
+            return values[search_range,
+                          numpy.clip(q, 0, size - 1),
+                          numpy.clip(r, 0, size - 1)]
+
+        for target_dq, target_dr in directions:
+            target_q = search.q + target_dq
+            target_r = search.r + target_dr
+            target_slots = get_values(slots, target_q, target_r)
+            safe_target_slots = numpy.maximum(target_slots, 0)
+            thrown = (
+                (target_slots >= 0) &
+                (state["height"][search.board_indices,
+                                 safe_target_slots] == 1) &
+                ~pinned[search.board_indices, safe_target_slots])
+
+            # Heights without the thrown piece. The thrower counts as one.
+            height = grid.height[search.board_indices]
+            height[search_range, numpy.clip(target_q, 0, size - 1),
+                   numpy.clip(target_r, 0, size - 1)] -= thrown
+
+            # Lifting onto the thrower, as Piece._freedom_to_climb.
+            thrown &= numpy.minimum(
+                get_values(height, search.q - target_dr,
+                           search.r + target_dq + target_dr),
+                get_values(height, search.q + target_dq + target_dr,
+                           search.r - target_dq)) <= 1
+
+            for dq, dr in directions:
+                if (dq, dr) == (target_dq, target_dr):
+                    continue
+
+                gate_height = numpy.minimum(
+                    get_values(height, search.q + dq + dr, search.r - dq),
+                    get_values(height, search.q - dr, search.r + dq + dr))
+                landing = (thrown & (gate_height <= 1) &
+                           (get_values(height, search.q + dq,
+                                       search.r + dr) == 0))
+                masks[search.board_indices[landing],
+                      target_slots[landing],
+                      search.q[landing] + dq,
+                      search.r[landing] + dr] = True
+
+    def _apply(self, game_indices, slot_indices, q, r):
+        """Move one slot in each of game_indices, which must be distinct."""
+
+        state = self.state
+        moving_slots = numpy.zeros(
+            (len(game_indices), state["placed"].shape[1]), dtype=bool)
+        moving_slots[numpy.arange(len(game_indices)), slot_indices] = True
+
+        placed = state["placed"][game_indices]
+        slot_q = state["q"][game_indices]
+        slot_r = state["r"][game_indices]
+        level = state["level"][game_indices]
+        height = state["height"][game_indices]
+        top = state["top"][game_indices]
+
+        # Leave the old cell, uncovering the piece below.
+        old_q = state["q"][game_indices, slot_indices][:, None]
+        old_r = state["r"][game_indices, slot_indices][:, None]
+        old_level = state["level"][game_indices, slot_indices][:, None]
+        was_placed = state["placed"][game_indices, slot_indices][:, None]
+        old_cell = (placed & was_placed &
+                    (slot_q == old_q) & (slot_r == old_r) & ~moving_slots)
+        top |= old_cell & (level == old_level - 1)
+        height -= old_cell
+
+        # Land on the new cell, covering any piece there.
+        new_cell = (placed & (slot_q == q[:, None]) & (slot_r == r[:, None]) &
+                    ~moving_slots)
+        new_height = new_cell.sum(axis=1) + 1
+        top &= ~new_cell
+        height = numpy.where(new_cell, new_height[:, None], height)
+
+        slot_q[moving_slots] = q
+        slot_r[moving_slots] = r
+        placed |= moving_slots
+        top |= moving_slots
+        level[moving_slots] = new_height - 1
+        height[moving_slots] = new_height
+
+        state["placed"][game_indices] = placed
+        state["q"][game_indices] = slot_q
+        state["r"][game_indices] = slot_r
+        state["level"][game_indices] = level
+        state["height"][game_indices] = height
+        state["top"][game_indices] = top
+
+    def _update_results(self):
+        """End the games where a bee is surrounded."""
+
+        grid = features.Grid(self.state)
+        surrounded = numpy.stack(
+            [features.get_liberties(
+                grid, self.state, bee_slot,
+                self.state["placed"][:, bee_slot]) == 0
+             for bee_slot in self._bee_slots], axis=1)
+
+        ongoing = self.results == ONGOING
+        results = numpy.select(
+            [surrounded.all(axis=1),
+             surrounded[:, Piece.Color.BLACK],
+             surrounded[:, Piece.Color.WHITE]],
+            [DRAW, WHITE_WON, BLACK_WON],
+            ONGOING)
+        self.results[ongoing] = results[ongoing]
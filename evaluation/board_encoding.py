@@ -0,0 +1,169 @@
+"""Fixed-shape array encoding of GameBoards for machine learning.
+
+Each board is encoded as a (plane, q, r) array over a square window of
+axial coordinates, centered on the hive. The planes are, in order:
+    One per color, creature and stack level, set where such a piece is.
+    One per color and creature, filled with the number of them in hand.
+    One filled with player_turn.
+
+Piece numbers and the position of the hive on the plane are not encoded,
+so decoding gives an equivalent board, centered on the window.
+"""
+import numpy
+from rules.game_board import GameBoard
+from rules.piece import Piece
+
+
+# The bottom piece, plus every beetle and mosquito.
+DEFAULT_STACK_LEVELS = 7
+
+
+def get_default_window_size():
+    """Get a window size which fits any hive, even one in a straight line.
+    """
+
+    return (sum(GameBoard.get_piece_creature_counts().values()) *
+            len(Piece.Color))
+
+
+def get_shape(window_size=None, stack_levels=DEFAULT_STACK_LEVELS):
+    """Get the shape of a single encoded board."""
+
+    if window_size is None:
+        window_size = get_default_window_size()
+
+    piece_planes = len(Piece.Color) * len(Piece.Creature) * stack_levels
+    hand_planes = len(Piece.Color) * len(Piece.Creature)
+    return (piece_planes + hand_planes + 1, window_size, window_size)
+
+
+def create_npy(path, board_count, window_size=None,
+               stack_levels=DEFAULT_STACK_LEVELS, dtype=numpy.uint8):
+    """Create a memory-mapped .npy file for board_count encoded boards, to be
+    filled by encode_game_boards."""
+
+    return numpy.lib.format.open_memmap(
+        path, mode="w+", dtype=dtype,
+        shape=(board_count,) + get_shape(window_size, stack_levels))
+
+
+def encode(game_board, window_size=None, stack_levels=DEFAULT_STACK_LEVELS,
+           dtype=numpy.uint8):
+    """Encode a single game_board into a new array."""
+
+    out = numpy.empty((1,) + get_shape(window_size, stack_levels),
+                      dtype=dtype)
+    encode_game_boards([game_board], out)
+    return out[0]
+
+
+def encode_game_boards(game_boards, out, start=0):
+    """Encode game_boards into out[start:], which may be memory-mapped.
+
+    The window size and stack levels are taken from the shape of out.
+    Returns the index after the last board written."""
+
+    plane_count, window_size, _ = out.shape[1:]
+    stack_levels = _get_stack_levels(plane_count)
+    creature_count = len(Piece.Creature)
+    hand_plane = len(Piece.Color) * creature_count * stack_levels
+
+    board_indices = []
+    planes = []
+    q_indices = []
+    r_indices = []
+    hand_counts = []
+    player_turns = []
+
+    for board_index, game_board in enumerate(game_boards, start):
+        stacks = game_board.get_stacks()
+        q_offset, r_offset = _get_offsets(stacks, window_size)
+
+        for (q, r), stack in stacks.items():
+            if len(stack) > stack_levels:
+                raise ValueError("Stack too high to encode: " + str(stack))
+
+            for level, piece in enumerate(stack):
+                board_indices.append(board_index)
+                planes.append(
+                    (piece.color * creature_count + piece.creature) *
+                    stack_levels + level)
+                q_indices.append(q + q_offset)
+                r_indices.append(r + r_offset)
+
+        board_hand_counts = [0] * (len(Piece.Color) * creature_count)
+        for piece in game_board.get_unplaced_pieces():
+            board_hand_counts[
+                piece.color * creature_count + piece.creature] += 1
+        hand_counts.append(board_hand_counts)
+        player_turns.append(game_board.player_turn)
+
+    end = start + len(player_turns)
+    if end == start:
+        return end
+
+    out[start:end] = 0
+    out[board_indices, planes, q_indices, r_indices] = 1
+    out[start:end, hand_plane:-1] = \
+        numpy.array(hand_counts)[:, :, None, None]
+    out[start:end, -1] = numpy.array(player_turns)[:, None, None]
+    return end
+
+
+def decode(array):
+    """Get a GameBoard from a single encoded board. Pieces are numbered from
+    zero in the order their planes are stored."""
+
+    plane_count, window_size, _ = array.shape
+    stack_levels = _get_stack_levels(plane_count)
+    center = window_size // 2
+
+    game_board = GameBoard()
+    piece_counts = {}
+
+    planes, q_indices, r_indices = numpy.nonzero(
+        array[:len(Piece.Color) * len(Piece.Creature) * stack_levels])
+    levels = planes % stack_levels
+    for i in numpy.lexsort((planes, levels)):
+        color = Piece.Color(planes[i] // stack_levels // len(Piece.Creature))
+        creature = Piece.Creature(
+            planes[i] // stack_levels % len(Piece.Creature))
+        piece_number = piece_counts.get((color, creature), 0)
+        piece_counts[(color, creature)] = piece_number + 1
+
+        game_board.force_place(Piece(
+            creature, color, piece_number,
+            int(q_indices[i]) - center,
+            int(r_indices[i]) - center))
+
+    game_board.player_turn = Piece.Color(int(array[-1, 0, 0]))
+    return game_board
+
+
+def _get_stack_levels(plane_count):
+    creature_plane_count = len(Piece.Color) * len(Piece.Creature)
+    stack_levels, remainder = divmod(
+        plane_count - creature_plane_count - 1, creature_plane_count)
+    if remainder or stack_levels < 1:
+        raise ValueError("Not an encoded board plane count: " +
+                         str(plane_count))
+    return stack_levels
+
+
+def _get_offsets(stacks, window_size):
+    """Get the offsets moving the middle of the hive to the window center."""
+
+    if not stacks:
+        return window_size // 2, window_size // 2
+
+    offsets = []
+    for axis in (0, 1):
+        low = min(x[axis] for x in stacks)
+        high = max(x[axis] for x in stacks)
+        if high - low >= window_size:
+            raise ValueError("Hive too large to encode in window size " +
+                             str(window_size))
+        offset = window_size // 2 - (low + high) // 2
+        offset = min(offset, window_size - 1 - high)
+        offsets.append(max(offset, -low))
+    return tuple(offsets)
@@ -0,0 +1,581 @@
+"""Position features for evaluating batches of GameBoards.
+
+The boards are packed into fixed-size arrays and every feature is computed
+for the whole batch at once with NumPy array operations. Movement is
+computed on a grid of the axial coordinates around each hive, so the
+results match Piece.get_moves for every piece regardless of player_turn.
+
+Grid, Search, get_move_masks, get_pinned and get_liberties work on the
+packed arrays for other batch code, such as evaluation.batch_engine.
+"""
+import numpy
+from rules.game_board import GameBoard
+from rules.hexcell import Direction, HexCell
+from rules.piece import Piece
+
+
+_per_color_feature_names = (
+    ["mobility_" + creature.name.lower() for creature in Piece.Creature] +
+    [
+        "placements",
+        "bee_liberties",
+        "pinned",
+        "in_hand",
+        "bee_covered",
+        "enemy_bee_distance",
+    ])
+
+FEATURE_NAMES = tuple(
+    [color.name.lower() + "_" + name
+     for color in Piece.Color
+     for name in _per_color_feature_names] +
+    ["player_turn"])
+
+# The (dq, dr) offset of each Direction, in Direction order.
+DIRECTIONS = tuple(HexCell._direction_coord_change[x][:2]
+                   for x in Direction)
+
+# The grid margin around the hive. Cells further than two steps from every
+# piece can't be moved to or affect a gate.
+_margin = 2
+
+
+def get_piece_slots():
+    """Get the fixed order of (color, creature, piece_number) used for the
+    piece axis of packed boards."""
+
+    return [(color, creature, piece_number)
+            for color in Piece.Color
+            for creature, piece_count in
+            GameBoard.get_piece_creature_counts().items()
+            for piece_number in range(piece_count)]
+
+
+def pack_game_boards(game_boards):
+    """Pack game_boards into arrays with one column per piece slot.
+
+    Returns a dict of:
+        q, r - (boards, slots) int coordinates, 0 when unplaced.
+        placed - (boards, slots) bool.
+        top - (boards, slots) bool, placed and not covered by another piece.
+        height - (boards, slots) number of pieces in the slot's cell.
+        level - (boards, slots) number of pieces below the slot.
+        player_turn - (boards,) int color.
+    """
+
+    slots = get_piece_slots()
+    slot_indices = {x: i for i, x in enumerate(slots)}
+    shape = (len(game_boards), len(slots))
+
+    packed = {
+        "q": numpy.zeros(shape, dtype=numpy.int32),
+        "r": numpy.zeros(shape, dtype=numpy.int32),
+        "placed": numpy.zeros(shape, dtype=bool),
+        "top": numpy.zeros(shape, dtype=bool),
+        "height": numpy.zeros(shape, dtype=numpy.int32),
+        "level": numpy.zeros(shape, dtype=numpy.int32),
+        "player_turn": numpy.zeros(len(game_boards), dtype=numpy.int32),
+    }
+
+    for board_index, game_board in enumerate(game_boards):
+        packed["player_turn"][board_index] = game_board.player_turn
+        for piece in game_board.get_placed_pieces():
+            slot_index = slot_indices[
+                (piece.color, piece.creature, piece.piece_number)]
+            packed["q"][board_index, slot_index] = piece.q
+            packed["r"][board_index, slot_index] = piece.r
+            packed["placed"][board_index, slot_index] = True
+            packed["top"][board_index, slot_index] = (
+                game_board.get_cell(piece.q, piece.r) is piece)
+            packed["level"][board_index, slot_index] = \
+                game_board.get_stack(piece.q, piece.r).index(piece)
+
+    same_cell = _get_same_cell(packed)
+    packed["height"] = same_cell.sum(axis=2, dtype=numpy.int32)
+    return packed
+
+
+def unpack_game_boards(packed):
+    """Get a GameBoard for each board of packed, as made by pack_game_boards.
+    Only q, r, placed, level and player_turn are read."""
+
+    slots = get_piece_slots()
+    game_boards = []
+    for board_index in range(len(packed["player_turn"])):
+        game_board = GameBoard()
+        slot_indices = numpy.flatnonzero(packed["placed"][board_index])
+        levels = packed["level"][board_index, slot_indices]
+        for slot_index in slot_indices[numpy.argsort(levels, kind="stable")]:
+            color, creature, piece_number = slots[slot_index]
+            game_board.force_place(Piece(
+                creature, color, piece_number,
+                int(packed["q"][board_index, slot_index]),
+                int(packed["r"][board_index, slot_index])))
+        game_board.player_turn = Piece.Color(
+            int(packed["player_turn"][board_index]))
+        game_boards.append(game_board)
+    return game_boards
+
+
+def extract_features(game_boards):
+    """Get a (len(game_boards), len(FEATURE_NAMES)) float array of features.
+    """
+
+    return extract_packed_features(pack_game_boards(game_boards))
+
+
+def extract_packed_features(packed):
+    """Like extract_features, but for the output of pack_game_boards."""
+
+    slots = get_piece_slots()
+    colors = numpy.array([x[0] for x in slots])
+    creatures = numpy.array([x[1] for x in slots])
+    board_count = len(packed["player_turn"])
+
+    bee_slots = [slots.index((color, Piece.Creature.BEE, 0))
+                 for color in Piece.Color]
+    bee_placed = packed["placed"][:, bee_slots]
+
+    grid = Grid(packed)
+    pinned = get_pinned(packed)
+    movable = (packed["top"] & ~pinned &
+               bee_placed[:, colors])
+    move_counts = _get_move_counts(packed, grid, creatures, movable)
+
+    features = []
+    for color in Piece.Color:
+        enemy_color = 1 - color
+        color_slots = colors == color
+
+        for creature in Piece.Creature:
+            creature_slots = color_slots & (creatures == creature)
+            features.append(move_counts[:, creature_slots].sum(axis=1))
+
+        features.append(grid.get_placement_counts(color))
+        features.append(get_liberties(
+            grid, packed, bee_slots[color], bee_placed[:, color]))
+        features.append(
+            (pinned | (packed["placed"] & ~packed["top"]))[
+                :, color_slots].sum(axis=1))
+        features.append((~packed["placed"][:, color_slots]).sum(axis=1))
+        features.append(~packed["top"][:, bee_slots[color]] &
+                        bee_placed[:, color])
+        features.append(_get_mean_distance(
+            packed, color_slots, bee_slots[enemy_color],
+            bee_placed[:, enemy_color]))
+
+    features.append(packed["player_turn"])
+    assert len(features) == len(FEATURE_NAMES)
+
+    result = numpy.empty((board_count, len(features)), dtype=numpy.float32)
+    for i, feature in enumerate(features):
+        result[:, i] = feature
+    return result
+
+
+def _get_same_cell(packed):
+    """Get a (boards, slots, slots) bool array of placed slot pairs sharing
+    a cell."""
+
+    placed = packed["placed"]
+    return ((packed["q"][:, :, None] == packed["q"][:, None, :]) &
+            (packed["r"][:, :, None] == packed["r"][:, None, :]) &
+            placed[:, :, None] & placed[:, None, :])
+
+
+def _get_distances(packed, target_q, target_r):
+    """Get the (boards, slots) hex distance of each slot to the (boards,)
+    target coordinates."""
+
+    dq = packed["q"] - target_q[:, None]
+    dr = packed["r"] - target_r[:, None]
+    return numpy.maximum(numpy.maximum(abs(dq), abs(dr)), abs(dq + dr))
+
+
+def _get_mean_distance(packed, color_slots, target_slot, target_placed):
+    distances = _get_distances(packed,
+                               packed["q"][:, target_slot],
+                               packed["r"][:, target_slot])
+    counted = packed["placed"] & color_slots
+    counts = counted.sum(axis=1)
+    totals = numpy.where(counted, distances, 0).sum(axis=1)
+    return numpy.where(target_placed & (counts > 0),
+                       totals / numpy.maximum(counts, 1), 0)
+
+
+def get_liberties(grid, packed, bee_slot, bee_placed):
+    """Get the (boards,) number of empty cells next to the bee in
+    bee_slot, or 6 where bee_placed is False."""
+
+    size = grid.occupied.shape[1]
+    bee_q = grid.get_q_index(packed["q"][:, bee_slot])
+    bee_r = grid.get_r_index(packed["r"][:, bee_slot])
+    occupied_neighbors = sum(
+        grid.occupied[grid.board_indices,
+                      numpy.clip(bee_q + dq, 0, size - 1),
+                      numpy.clip(bee_r + dr, 0, size - 1)]
+        for dq, dr in DIRECTIONS)
+    return numpy.where(bee_placed, 6 - occupied_neighbors, 6)
+
+
+def get_pinned(packed):
+    """Get the (boards, slots) top pieces which would split the hive if they
+    were removed. Pieces on top of a stack leave a piece behind, so never
+    split the hive."""
+
+    top = packed["top"]
+    board_count, slot_count = top.shape
+
+    distances = numpy.maximum(
+        numpy.maximum(
+            abs(packed["q"][:, :, None] - packed["q"][:, None, :]),
+            abs(packed["r"][:, :, None] - packed["r"][:, None, :])),
+        abs((packed["q"] + packed["r"])[:, :, None] -
+            (packed["q"] + packed["r"])[:, None, :]))
+    adjacent = (distances == 1) & top[:, :, None] & top[:, None, :]
+
+    # Each board's slots are bits of an integer, with one search per
+    # removed slot along axis 1.
+    bits = numpy.left_shift(numpy.int64(1), numpy.arange(slot_count))
+    adjacent_bits = numpy.where(adjacent, bits, 0).sum(axis=2)
+    remaining = (numpy.where(top, bits, 0).sum(axis=1)[:, None] & ~bits)
+    reached = remaining & -remaining
+
+    while True:
+        next_reached = reached.copy()
+        for slot_index in range(slot_count):
+            next_reached |= numpy.where(
+                reached & bits[slot_index],
+                adjacent_bits[:, slot_index, None], 0)
+        next_reached &= remaining
+        if (next_reached == reached).all():
+            break
+        reached = next_reached
+
+    split = reached != remaining
+    return split & top & (packed["height"] == 1)
+
+
+def _get_move_counts(packed, grid, creatures, movable):
+    move_counts = numpy.zeros(movable.shape, dtype=numpy.int32)
+    board_indices, slot_indices = numpy.nonzero(movable)
+
+    for creature in Piece.Creature:
+        searches = creatures[slot_indices] == creature
+        if not searches.any():
+            continue
+
+        search = Search(grid, packed,
+                         board_indices[searches], slot_indices[searches])
+        masks = get_move_masks(creature, search)
+        move_counts[search.board_indices, search.slot_indices] = \
+            masks.sum(axis=(1, 2))
+
+    return move_counts
+
+
+def get_move_masks(creature, search):
+    """Get a (searches, q, r) bool array of the destinations of each search's
+    piece if it moved like creature, as Piece.get_moves_<creature>."""
+
+    method_name = "_get_move_masks_" + creature.name
+    return globals()[method_name](search)
+
+
+def _get_move_masks_BEE(search):
+    return search.get_slides(steps=1)
+
+
+def _get_move_masks_SPIDER(search):
+    return search.get_slides(steps=3)
+
+
+def _get_move_masks_ANT(search):
+    return search.get_slides(steps=None)
+
+
+def _get_move_masks_PILLBUG(search):
+    return search.get_slides(steps=1)
+
+
+def _get_move_masks_BEETLE(search):
+    masks = numpy.zeros_like(search.start)
+    for dq, dr, climb in search.get_climbs():
+        masks |= _shift(search.start & climb, dq, dr, False)
+    return masks
+
+
+def _get_move_masks_LADYBUG(search):
+    climbs = search.get_climbs()
+    space = search.height == 0
+
+    # Two moves on top of the hive, then one down.
+    on_top = search.start
+    for _ in range(2):
+        next_on_top = numpy.zeros_like(on_top)
+        for dq, dr, climb in climbs:
+            next_on_top |= _shift(on_top & climb, dq, dr, False)
+        on_top = next_on_top & ~space
+
+    masks = numpy.zeros_like(on_top)
+    for dq, dr, climb in climbs:
+        masks |= _shift(on_top & climb, dq, dr, False)
+    return masks & space & ~search.start
+
+
+def _get_move_masks_MOSQUITO(search):
+    stacked = search.get_start_values(search.height) > 0
+    masks = numpy.zeros_like(search.start)
+
+    stacked_search = search.get_subset(stacked)
+    masks[stacked] = _get_move_masks_BEETLE(stacked_search)
+
+    # As Piece._get_mimicked_creatures.
+    mimicked = numpy.zeros((len(stacked), len(Piece.Creature)), dtype=bool)
+    for dq, dr in DIRECTIONS:
+        neighbor_creatures = search.get_start_values(search.creature, dq, dr)
+        for creature in Piece.Creature:
+            mimicked[:, creature] |= neighbor_creatures == creature
+    mimicked[stacked] = False
+    mimicked[:, Piece.Creature.MOSQUITO] = False
+
+    has_ant = mimicked[:, Piece.Creature.ANT, None]
+    for creature in (Piece.Creature.BEE,
+                     Piece.Creature.SPIDER,
+                     Piece.Creature.PILLBUG):
+        mimicked[:, creature] &= ~has_ant[:, 0]
+    mimicked[:, Piece.Creature.BEE] &= ~mimicked[:, Piece.Creature.PILLBUG]
+
+    for creature in Piece.Creature:
+        mimicking = mimicked[:, creature]
+        if mimicking.any():
+            masks[mimicking] |= get_move_masks(
+                creature, search.get_subset(mimicking))
+    return masks
+
+
+def _get_move_masks_GRASSHOPPER(search):
+    masks = numpy.zeros_like(search.start)
+    size = masks.shape[1]
+    search_range = numpy.arange(len(masks))
+
+    for dq, dr in DIRECTIONS:
+        jumped = search.get_start_values(search.height, dq, dr) > 0
+        landing_q = search.q + dq
+        landing_r = search.r + dr
+        for _ in range(size):
+            if not jumped.any():
+                break
+            landing_q = numpy.where(jumped, landing_q + dq, landing_q)
+            landing_r = numpy.where(jumped, landing_r + dr, landing_r)
+            landed = jumped & (search.height[
+                search_range,
+                numpy.clip(landing_q, 0, size - 1),
+                numpy.clip(landing_r, 0, size - 1)] == 0)
+            masks[search_range[landed],
+                  landing_q[landed],
+                  landing_r[landed]] = True
+            jumped &= ~landed
+    return masks
+
+
+class Search:
+    """The pieces of some boards of a Grid to search the moves of, with one
+    search per piece along axis 0 of every array."""
+
+    def __init__(self, grid, packed, board_indices, slot_indices):
+        self.board_indices = board_indices
+        self.slot_indices = slot_indices
+        self.q = packed["q"][board_indices, slot_indices] - \
+            grid.q_origin[board_indices]
+        self.r = packed["r"][board_indices, slot_indices] - \
+            grid.r_origin[board_indices]
+        search_range = numpy.arange(len(board_indices))
+
+        self.start = numpy.zeros(
+            (len(board_indices),) + grid.occupied.shape[1:], dtype=bool)
+        self.start[search_range, self.q, self.r] = True
+
+        self.occupied = grid.occupied[board_indices]
+        self.creature = grid.creature[board_indices]
+
+        # Heights without the moving piece, as Piece._get_stack_height.
+        self.height = grid.height[board_indices]
+        self.height[search_range, self.q, self.r] -= 1
+
+    def get_subset(self, searches):
+        subset = Search.__new__(Search)
+        for name, value in self.__dict__.items():
+            setattr(subset, name, value[searches])
+        return subset
+
+    def get_start_values(self, values, dq=0, dr=0):
+        """Get the (searches,) values at the offset from each start cell."""
+
+        size = values.shape[1]
+        return values[numpy.arange(len(values)),
+                      numpy.clip(self.q + dq, 0, size - 1),
+                      numpy.clip(self.r + dr, 0, size - 1)]
+
+    def get_slides(self, steps):
+        """Get the cells reachable by sliding exactly steps times, or any
+        number of times if steps is None. Cells reached sooner do not count,
+        like Piece.get_moves_SPIDER."""
+
+        blocking = self.height > 0
+        space = ~self.occupied
+
+        slides = []
+        for dq, dr, clockwise, counterclockwise in _get_gates():
+            gate_open = (
+                _shift(blocking, -clockwise[0], -clockwise[1], False) !=
+                _shift(blocking, -counterclockwise[0], -counterclockwise[1],
+                       False))
+            slides.append((dq, dr, gate_open & _shift(space, -dq, -dr, False)))
+
+        visited = self.start.copy()
+        frontier = self.start
+        step = 0
+        while step != steps and frontier.any():
+            next_frontier = numpy.zeros_like(frontier)
+            for dq, dr, slide in slides:
+                next_frontier |= _shift(frontier & slide, dq, dr, False)
+            next_frontier &= ~visited
+            visited |= next_frontier
+            frontier = next_frontier
+            step += 1
+
+        return visited & ~self.start if steps is None else frontier
+
+    def get_climbs(self):
+        """Get (dq, dr, climb) for each direction, where climb is whether a
+        piece which can climb may move from each cell to its neighbor in
+        that direction, as Piece._freedom_to_climb."""
+
+        climbs = []
+        for dq, dr, clockwise, counterclockwise in _get_gates():
+            end_height = _shift(self.height, -dq, -dr, 0)
+            clockwise_height = _shift(
+                self.height, -clockwise[0], -clockwise[1], 0)
+            counterclockwise_height = _shift(
+                self.height, -counterclockwise[0], -counterclockwise[1], 0)
+
+            climb = numpy.where(
+                (self.height == 0) & (end_height == 0),
+                (clockwise_height > 0) != (counterclockwise_height > 0),
+                numpy.minimum(clockwise_height, counterclockwise_height) <=
+                numpy.maximum(self.height, end_height))
+            climbs.append((dq, dr, climb))
+        return climbs
+
+
+def _get_gates():
+    """Get (dq, dr, clockwise, counterclockwise) for each direction, where
+    clockwise and counterclockwise are the offsets of the cells either side
+    of the gate, as HexCell.rotate_clockwise_about_origin and
+    rotate_counterclockwise_about_origin."""
+
+    return [(dq, dr, (dq + dr, -dq), (-dr, dq + dr))
+            for dq, dr in DIRECTIONS]
+
+
+class Grid:
+    """Occupancy of every board in a batch on a square window of axial
+    coordinates. Index [board, q - q_origin, r - r_origin]."""
+
+    def __init__(self, packed):
+        placed = packed["placed"]
+        board_count = len(placed)
+        self.board_indices = numpy.arange(board_count)
+
+        big = numpy.iinfo(numpy.int32).max
+        q_min = numpy.where(placed, packed["q"], big).min(axis=1)
+        r_min = numpy.where(placed, packed["r"], big).min(axis=1)
+        q_max = numpy.where(placed, packed["q"], -big).max(axis=1)
+        r_max = numpy.where(placed, packed["r"], -big).max(axis=1)
+        any_placed = placed.any(axis=1)
+        q_min = numpy.where(any_placed, q_min, 0)
+        r_min = numpy.where(any_placed, r_min, 0)
+        extent = numpy.where(any_placed,
+                             numpy.maximum(q_max - q_min, r_max - r_min), 0)
+
+        self.q_origin = q_min - _margin
+        self.r_origin = r_min - _margin
+        size = int(extent.max(initial=0)) + 2 * _margin + 1
+
+        self.occupied = numpy.zeros((board_count, size, size), dtype=bool)
+        self.color = numpy.full((board_count, size, size), -1,
+                                dtype=numpy.int8)
+        self.creature = numpy.full((board_count, size, size), -1,
+                                   dtype=numpy.int8)
+        self.slot = numpy.full((board_count, size, size), -1,
+                               dtype=numpy.int32)
+
+        top_boards, top_slots = numpy.nonzero(packed["top"])
+        top_q = self.get_q_index(packed["q"])[top_boards, top_slots]
+        top_r = self.get_r_index(packed["r"])[top_boards, top_slots]
+        slot_colors = numpy.array([x[0] for x in get_piece_slots()])
+
+        self.in_hand = numpy.stack(
+            [(~placed[:, slot_colors == color]).any(axis=1)
+             for color in Piece.Color], axis=1)
+
+        self.occupied[top_boards, top_q, top_r] = True
+        self.height = numpy.zeros((board_count, size, size),
+                                  dtype=numpy.int32)
+        self.height[top_boards, top_q, top_r] = \
+            packed["height"][top_boards, top_slots]
+        self.color[top_boards, top_q, top_r] = slot_colors[top_slots]
+        self.creature[top_boards, top_q, top_r] = numpy.array(
+            [x[1] for x in get_piece_slots()])[top_slots]
+        self.slot[top_boards, top_q, top_r] = top_slots
+
+    def get_q_index(self, q):
+        return q - self.q_origin.reshape((-1,) + (1,) * (q.ndim - 1))
+
+    def get_r_index(self, r):
+        return r - self.r_origin.reshape((-1,) + (1,) * (r.ndim - 1))
+
+    def get_placement_counts(self, color):
+        return self.get_placement_masks(color).sum(axis=(1, 2))
+
+    def get_placement_masks(self, color):
+        """Get the (boards, q, r) cells where color can place a piece, as
+        Piece._get_placements."""
+
+        friendly = numpy.zeros(self.occupied.shape, dtype=bool)
+        enemy = numpy.zeros(self.occupied.shape, dtype=bool)
+        for dq, dr in DIRECTIONS:
+            neighbor_color = _shift(self.color, -dq, -dr, -1)
+            friendly |= neighbor_color == color
+            enemy |= neighbor_color == 1 - color
+        placements = friendly & ~enemy & ~self.occupied
+
+        # The first placement of each color doesn't need a friendly neighbor.
+        piece_counts = (self.color >= 0).sum(axis=(1, 2))
+        color_counts = (self.color == color).sum(axis=(1, 2))
+        first_placements = (color_counts == 0) & (piece_counts == 1)
+        placements[first_placements] = \
+            (friendly | enemy)[first_placements]
+
+        empty_boards = piece_counts == 0
+        placements[empty_boards] = False
+        placements[self.board_indices[empty_boards],
+                   -self.q_origin[empty_boards],
+                   -self.r_origin[empty_boards]] = True
+
+        placements[~self.in_hand[:, color]] = False
+        return placements
+
+
+def _shift(grid, dq, dr, fill):
+    """Move the contents of grid's last two axes by (dq, dr), so that
+    result[..., q, r] == grid[..., q - dq, r - dr]."""
+
+    result = numpy.full_like(grid, fill)
+    size_q, size_r = grid.shape[-2:]
+    result[..., max(dq, 0):size_q + min(dq, 0),
+           max(dr, 0):size_r + min(dr, 0)] = \
+        grid[..., max(-dq, 0):size_q + min(-dq, 0),
+             max(-dr, 0):size_r + min(-dr, 0)]
+    return result
@@ -0,0 +1,261 @@
+"""Position evaluation kept up to date as moves are made and undone.
+
+An IncrementalEvaluator follows one line of play, such as the current line
+of a search. A move only recomputes what the cells it touched can affect:
+the moves of pieces near those cells or able to reach them, the liberties
+of a bee next to them, and the stacks at them. The pinned pieces are found
+again only when a cell is emptied or filled. Undoing a move goes back to
+the previous board and terms without any work.
+
+The terms follow evaluation.features, so mobility counts the moves of a
+color's pieces whichever player is to move.
+"""
+from rules.geometry import get_distance
+from rules.hexcell import Direction, HexCell
+from rules.mobility import get_articulation_cells, get_move_counts
+from rules.piece import Piece
+
+
+TERM_NAMES = (
+    "mobility",
+    "bee_liberties",
+    "pinned",
+    "in_hand",
+    "beetle_control",
+)
+
+DEFAULT_WEIGHTS = {
+    "mobility": 0.05,
+    "bee_liberties": 1.0,
+    "pinned": -0.2,
+    "in_hand": 0.0,
+    "beetle_control": 0.3,
+}
+
+_directions = tuple(HexCell._direction_coord_change[x][:2]
+                    for x in Direction)
+
+# How far from a piece a changed cell can affect its moves. Ants, and
+# mosquitoes which can move like them, can be affected by any change, and
+# grasshoppers by any on their lines.
+_move_radii = {
+    Piece.Creature.BEE: 2,
+    Piece.Creature.BEETLE: 2,
+    Piece.Creature.PILLBUG: 2,
+    Piece.Creature.SPIDER: 4,
+    Piece.Creature.LADYBUG: 4,
+}
+
+
+def get_terms(game_board):
+    """Get a dict of term name to [white, black] values of game_board,
+    computed from scratch."""
+
+    return _Frame.create(game_board).get_terms()
+
+
+def _get_neighbors(coords, cells):
+    q, r = coords
+    return ((q + dq, r + dr) for dq, dr in _directions
+            if (q + dq, r + dr) in cells)
+
+
+def _get_slot(piece):
+    return piece.color, piece.creature, piece.piece_number
+
+
+def _is_affected(piece, touched_cells):
+    """Check whether a change at touched_cells can change piece's moves."""
+
+    radius = _move_radii.get(piece.creature)
+    coords = (piece.q, piece.r)
+    if radius is not None:
+        return any(get_distance(coords, x) <= radius
+                   for x in touched_cells)
+    if piece.creature == Piece.Creature.GRASSHOPPER:
+        return any(q == piece.q or r == piece.r or
+                   q + r == piece.q + piece.r
+                   for q, r in touched_cells)
+    return True
+
+
+class _Frame:
+    """The terms of one position, and what they were computed from."""
+
+    @classmethod
+    def create(cls, game_board):
+        frame = cls()
+        frame.game_board = game_board
+        frame.bee_coords = [None, None]
+        for piece in game_board.get_placed_pieces():
+            if piece.creature == Piece.Creature.BEE:
+                frame.bee_coords[piece.color] = (piece.q, piece.r)
+
+        frame.terms = {x: [0, 0] for x in TERM_NAMES}
+        for color in Piece.Color:
+            frame.terms["in_hand"][color] = len(
+                list(game_board.get_unplaced_pieces(color)))
+            frame.terms["bee_liberties"][color] = \
+                frame.get_bee_liberties(color)
+
+        frame.articulation_cells = get_articulation_cells(
+            game_board.get_stacks())
+        frame.add_stacks(game_board.get_stacks(), 1)
+        frame.move_counts = {}
+        frame.update_mobility(None, {})
+        return frame
+
+    def get_terms(self):
+        return {x: list(y) for x, y in self.terms.items()}
+
+    def play(self, move):
+        """Get the frame after move, a Piece at its destination, or None to
+        pass."""
+
+        game_board = self.game_board.copy()
+        frame = _Frame()
+        frame.game_board = game_board
+        frame.bee_coords = list(self.bee_coords)
+        frame.terms = self.get_terms()
+        frame.articulation_cells = self.articulation_cells
+        frame.move_counts = self.move_counts
+        if move is None:
+            game_board.pass_turn()
+            return frame
+
+        moving_piece = game_board.get_piece(move)
+        touched_cells = [(move.q, move.r)]
+        if moving_piece.is_placed():
+            touched_cells.append((moving_piece.q, moving_piece.r))
+        else:
+            frame.terms["in_hand"][move.color] -= 1
+        # Moving between stacks leaves the same cells occupied.
+        cells_changed = (not game_board.get_stack_height(move.q, move.r) or
+                         len(touched_cells) == 1 or
+                         game_board.get_stack_height(*touched_cells[1]) == 1)
+
+        frame.add_stacks(touched_cells, -1)
+        game_board.force_move(move.get_moved_absolute(move.q, move.r))
+
+        if move.creature == Piece.Creature.BEE:
+            frame.bee_coords[move.color] = (move.q, move.r)
+        for color in Piece.Color:
+            bee_coords = frame.bee_coords[color]
+            if bee_coords is not None and any(
+                    get_distance(bee_coords, x) <= 1
+                    for x in touched_cells):
+                frame.terms["bee_liberties"][color] = \
+                    frame.get_bee_liberties(color)
+
+        if cells_changed:
+            frame.terms["pinned"] = [0, 0]
+            frame.terms["beetle_control"] = [0, 0]
+            frame.articulation_cells = get_articulation_cells(
+                game_board.get_stacks())
+            frame.add_stacks(game_board.get_stacks(), 1)
+        else:
+            frame.add_stacks(touched_cells, 1)
+
+        frame.update_mobility(touched_cells, self.move_counts)
+        return frame
+
+    def get_bee_liberties(self, color):
+        bee_coords = self.bee_coords[color]
+        if bee_coords is None:
+            return 6
+        return 6 - len(list(_get_neighbors(bee_coords,
+                                           self.game_board.get_stacks())))
+
+    def add_stacks(self, cells, sign):
+        """Add the pinned and beetle_control counts of the stacks at cells
+        to the terms, times sign."""
+
+        pinned = self.terms["pinned"]
+        beetle_control = self.terms["beetle_control"]
+        for coords in cells:
+            stack = self.game_board.get_stack(*coords)
+            if not stack:
+                continue
+            for piece in stack[:-1]:
+                pinned[piece.color] += sign
+            top_piece = stack[-1]
+            if len(stack) > 1:
+                beetle_control[top_piece.color] += sign
+            elif coords in self.articulation_cells:
+                pinned[top_piece.color] += sign
+
+    def update_mobility(self, touched_cells, previous_move_counts):
+        """Find the move count of every movable piece, reusing those of
+        previous_move_counts which touched_cells can't affect."""
+
+        game_board = self.game_board
+        self.move_counts = {}
+        mobility = [0, 0]
+        affected_pieces = []
+        for coords, stack in game_board.get_stacks().items():
+            piece = stack[-1]
+            if self.bee_coords[piece.color] is None or (
+                    len(stack) == 1 and coords in self.articulation_cells):
+                continue
+
+            slot = _get_slot(piece)
+            move_count = previous_move_counts.get(slot)
+            if move_count is None or _is_affected(piece, touched_cells):
+                affected_pieces.append(piece)
+                continue
+            self.move_counts[slot] = move_count
+            mobility[piece.color] += move_count
+
+        move_counts = get_move_counts(game_board, affected_pieces)
+        for piece in affected_pieces:
+            move_count = move_counts.get(piece, 0)
+            self.move_counts[_get_slot(piece)] = move_count
+            mobility[piece.color] += move_count
+        self.terms["mobility"] = mobility
+
+
+class IncrementalEvaluator:
+    """Evaluates the positions along a line of play from game_board.
+
+    Attributes:
+        weights - A dict of term name to its weight in evaluate.
+    """
+
+    def __init__(self, game_board, weights=None):
+        self.weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+        self._frames = [_Frame.create(game_board.copy())]
+
+    @property
+    def game_board(self):
+        """The current position. It must not be changed directly."""
+
+        return self._frames[-1].game_board
+
+    def apply(self, move):
+        """Make move, a Piece at its destination as from
+        search.alpha_beta.get_move_list, or pass if move is None. The move
+        isn't checked against the rules."""
+
+        self._frames.append(self._frames[-1].play(move))
+
+    def undo(self):
+        """Take back the last move applied."""
+
+        if len(self._frames) == 1:
+            raise ValueError("No move to undo")
+        self._frames.pop()
+
+    def get_terms(self):
+        """Get a dict of term name to [white, black] values of the current
+        position."""
+
+        return self._frames[-1].get_terms()
+
+    def evaluate(self):
+        """Get the weighted sum of the terms of the player to move, less
+        those of the other player."""
+
+        terms = self._frames[-1].terms
+        player = self.game_board.player_turn
+        return sum(weight * (terms[name][player] - terms[name][1 - player])
+                   for name, weight in self.weights.items())
@@ -0,0 +1,225 @@
+"""GameBoard positions in shared memory, for worker processes.
+
+A SharedBoards block holds the arrays of features.pack_game_boards for a
+batch of positions, optionally followed by a move list per position and a
+transposition table. Worker processes attach to the block by name and read
+the arrays in place, so handing them a batch of positions costs a name
+rather than pickling every GameBoard and its Pieces.
+
+Every array is a view of the block. They have to be dropped before close,
+which otherwise raises BufferError.
+"""
+from multiprocessing import shared_memory
+import numpy
+from evaluation import features
+from rules.piece import Piece
+
+
+_header_names = ("board_count", "move_capacity", "table_size")
+_alignment = 8
+
+
+def _get_layout(board_count, move_capacity, table_size):
+    """Get (name, dtype, shape) of each array in the block, in order."""
+
+    board_shape = (board_count, len(features.get_piece_slots()))
+    return [
+        ("header", numpy.int64, (len(_header_names),)),
+        ("q", numpy.int32, board_shape),
+        ("r", numpy.int32, board_shape),
+        ("placed", bool, board_shape),
+        ("top", bool, board_shape),
+        ("height", numpy.int32, board_shape),
+        ("level", numpy.int32, board_shape),
+        ("player_turn", numpy.int32, (board_count,)),
+        # Moves of board i are move_slots[move_starts[i]:move_starts[i + 1]]
+        # and the same range of move_q and move_r.
+        ("move_starts", numpy.int64, (board_count + 1,)),
+        ("move_slots", numpy.int32, (move_capacity,)),
+        ("move_q", numpy.int32, (move_capacity,)),
+        ("move_r", numpy.int32, (move_capacity,)),
+        # Each key is stored xored with its value and depth, so that an
+        # entry torn by a concurrent store fails _get_check.
+        ("table_checks", numpy.uint64, (table_size,)),
+        ("table_values", numpy.float64, (table_size,)),
+        ("table_depths", numpy.int64, (table_size,)),
+    ]
+
+
+def _get_offsets(layout):
+    """Get the byte offset of each array of layout, and the total size."""
+
+    offsets = []
+    size = 0
+    for _, dtype, shape in layout:
+        offsets.append(size)
+        size += numpy.dtype(dtype).itemsize * int(numpy.prod(shape))
+        size += -size % _alignment
+    return offsets, size
+
+
+class SharedBoards:
+    """A batch of positions in a multiprocessing.shared_memory block.
+
+    Create one with SharedBoards.create in the parent process and pass name
+    to workers, which use SharedBoards.attach.
+
+    Attributes:
+        packed - The pack_game_boards dict of the positions, as views of the
+            block.
+    """
+
+    def __init__(self, shared_memory_block, owner):
+        """Use create or attach rather than calling this directly."""
+
+        self._shared_memory = shared_memory_block
+        self._owner = owner
+
+        header = numpy.ndarray((len(_header_names),), dtype=numpy.int64,
+                               buffer=shared_memory_block.buf)
+        layout = _get_layout(*(int(x) for x in header))
+        offsets, _ = _get_offsets(layout)
+        self._arrays = {
+            name: numpy.ndarray(shape, dtype=dtype,
+                                buffer=shared_memory_block.buf,
+                                offset=offset)
+            for (name, dtype, shape), offset in zip(layout, offsets)}
+
+        self.packed = {
+            name: self._arrays[name]
+            for name in ("q", "r", "placed", "top", "height", "level",
+                         "player_turn")}
+
+    @classmethod
+    def create(cls, game_boards, piece_moves=None, table_size=0):
+        """Publish game_boards into a new block.
+
+        piece_moves - Optionally, one GameBoard.get_moves() result per board.
+        table_size - The number of transposition table entries.
+        """
+
+        slot_indices = {x: i for i, x in enumerate(features.get_piece_slots())}
+        moves = []
+        move_starts = [0]
+        for board_moves in piece_moves or [{}] * len(game_boards):
+            for piece, destinations in board_moves.items():
+                slot_index = slot_indices[
+                    (piece.color, piece.creature, piece.piece_number)]
+                moves.extend((slot_index, x.q, x.r) for x in destinations)
+            move_starts.append(len(moves))
+
+        header = (len(game_boards), len(moves), table_size)
+        _, size = _get_offsets(_get_layout(*header))
+        shared_boards = cls(
+            _create_block(size, header), owner=True)
+
+        arrays = shared_boards._arrays
+        for name, values in features.pack_game_boards(game_boards).items():
+            arrays[name][...] = values
+        arrays["move_starts"][...] = move_starts
+        if moves:
+            arrays["move_slots"][...], arrays["move_q"][...], \
+                arrays["move_r"][...] = zip(*moves)
+        arrays["table_depths"][...] = -1
+        return shared_boards
+
+    @classmethod
+    def attach(cls, name):
+        """Attach to the block published as name by another process."""
+
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self):
+        return self._shared_memory.name
+
+    def __len__(self):
+        return len(self.packed["player_turn"])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Detach from the block, and free it if this process created it."""
+
+        self._arrays = None
+        self.packed = None
+        self._shared_memory.close()
+        if self._owner:
+            self._shared_memory.unlink()
+
+    def get_game_board(self, board_index):
+        """Get a new GameBoard of the position at board_index."""
+
+        return features.unpack_game_boards(
+            {name: values[board_index:board_index + 1]
+             for name, values in self.packed.items()})[0]
+
+    def get_moves(self, board_index):
+        """Get the published moves of board_index, as Pieces at their
+        destinations to pass to GameBoard.place."""
+
+        slots = features.get_piece_slots()
+        start, end = self._arrays["move_starts"][board_index:board_index + 2]
+        moves = []
+        for slot_index, q, r in zip(self._arrays["move_slots"][start:end],
+                                    self._arrays["move_q"][start:end],
+                                    self._arrays["move_r"][start:end]):
+            color, creature, piece_number = slots[slot_index]
+            moves.append(Piece(creature, color, piece_number, int(q), int(r)))
+        return moves
+
+    def probe(self, key):
+        """Get the (value, depth) stored for the int key, or None.
+
+        Entries are replaced without locking. A probe overlapping a store
+        to the same slot sees a mix of the two entries, which fails the
+        check and is missed, so entries may be lost but are never wrong."""
+
+        index, key = self._get_table_index(key)
+        check = self._arrays["table_checks"][index]
+        value = self._arrays["table_values"][index]
+        depth = self._arrays["table_depths"][index]
+        if depth < 0 or check != _get_check(key, value, depth):
+            return None
+        return float(value), int(depth)
+
+    def store(self, key, value, depth):
+        """Store value for the int key, replacing any shallower entry in the
+        same table slot."""
+
+        index, key = self._get_table_index(key)
+        if self._arrays["table_depths"][index] > depth:
+            return
+
+        value = numpy.float64(value)
+        depth = numpy.int64(depth)
+        self._arrays["table_checks"][index] = _get_check(key, value, depth)
+        self._arrays["table_values"][index] = value
+        self._arrays["table_depths"][index] = depth
+
+    def _get_table_index(self, key):
+        table_size = len(self._arrays["table_checks"])
+        if not table_size:
+            raise ValueError("No transposition table was created")
+
+        key = numpy.uint64(key % 2 ** 64)
+        return int(key % numpy.uint64(table_size)), key
+
+
+def _get_check(key, value, depth):
+    """Get the uint64 key xored with the bits of the float64 value and of
+    the int64 depth, shifted clear of the low bits of the value."""
+
+    return (key ^ value.view(numpy.uint64) ^
+            (depth.view(numpy.uint64) << numpy.uint64(32)))
+
+
+def _create_block(size, header):
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    numpy.ndarray((len(header),), dtype=numpy.int64,
+                  buffer=block.buf)[...] = header
+    return block
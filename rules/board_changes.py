@@ -0,0 +1,59 @@
+"""Keeping a copy of a GameBoard up to date from its change log.
+
+A client loads one to_json_object snapshot of a board whose change log is
+recorded, then applies the changes from get_changes after the snapshot's
+sequence number, rather than loading a new snapshot after every move.
+"""
+from rules.game_board import GameBoard
+from rules.piece import Piece
+
+
+class ClientBoard:
+    """A GameBoard rebuilt from a snapshot and changes.
+
+    Attributes:
+        game_board - The GameBoard, which should only be changed with apply.
+        sequence - The sequence number of the last change applied.
+    """
+
+    def __init__(self, json_object):
+        self.game_board = GameBoard(json_object=json_object)
+        self.sequence = json_object.get("sequence", 0)
+
+    def apply(self, changes):
+        """Apply changes in order. Changes already applied are skipped, and
+        a missing change raises ValueError."""
+
+        for change in changes:
+            if change["sequence"] <= self.sequence:
+                continue
+            if change["sequence"] != self.sequence + 1:
+                raise ValueError("Missing changes " +
+                                 str(self.sequence + 1) + " to " +
+                                 str(change["sequence"] - 1))
+
+            apply_change(self.game_board, change)
+            self.sequence = change["sequence"]
+
+
+def apply_change(game_board, change):
+    """Apply one change from GameBoard.get_changes to game_board, checking
+    that it starts from the same position."""
+
+    if change["piece"] is not None:
+        color, creature, piece_number = change["piece"]
+        piece = game_board.get_piece(
+            Piece(Piece.Creature(creature), Piece.Color(color), piece_number))
+        from_coords = [piece.q, piece.r] if piece.is_placed() else None
+        if from_coords != change["from"]:
+            raise ValueError("Change " + str(change["sequence"]) +
+                             " moves " + str(piece) + " from " +
+                             str(change["from"]) + " not " + str(from_coords))
+
+        q, r = change["to"]
+        game_board.force_place(piece.get_moved_absolute(q, r))
+        if game_board.get_stack_height(q, r) - 1 != change["level"]:
+            raise ValueError("Change " + str(change["sequence"]) +
+                             " stacks " + str(piece) + " at a different level")
+
+    game_board.player_turn = Piece.Color[change["turn"]]
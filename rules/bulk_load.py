@@ -0,0 +1,57 @@
+"""Loading batches of GameBoard snapshots from JSON lines.
+
+Each line holds one GameBoard.to_json_object. Run
+    python -m rules.bulk_load FILE...
+to load files and report the load throughput.
+"""
+import collections
+import json
+import sys
+import time
+from rules.game_board import GameBoard
+
+
+LoadReport = collections.namedtuple(
+    "LoadReport", ["board_count", "byte_count", "seconds"])
+LoadReport.__doc__ = """The size and duration of a load."""
+
+
+def load_json_lines(lines, trusted=True):
+    """Get (game_boards, LoadReport) of the boards on lines, skipping blank
+    ones. Trusted boards use GameBoard.load_json_objects, others are checked
+    piece by piece as they are registered."""
+
+    start = time.perf_counter()
+    json_objects = []
+    byte_count = 0
+    for line in lines:
+        byte_count += len(line)
+        if line.strip():
+            json_objects.append(json.loads(line))
+
+    if trusted:
+        game_boards = GameBoard.load_json_objects(json_objects)
+    else:
+        game_boards = [GameBoard(json_object=x) for x in json_objects]
+    return game_boards, LoadReport(
+        len(game_boards), byte_count, time.perf_counter() - start)
+
+
+def write_json_lines(game_boards, file):
+    for game_board in game_boards:
+        file.write(json.dumps(game_board.to_json_object()) + "\n")
+
+
+def main(argv=None):
+    paths = sys.argv[1:] if argv is None else argv
+    for path in paths:
+        with open(path) as json_file:
+            _, report = load_json_lines(json_file)
+        print("{}: {} boards in {:.3f} s, {:.0f} boards/s, {:.1f} MB/s".format(
+            path, report.board_count, report.seconds,
+            report.board_count / max(report.seconds, 1e-9),
+            report.byte_count / 1e6 / max(report.seconds, 1e-9)))
+
+
+if __name__ == "__main__":
+    main()
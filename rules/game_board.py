@@ -1,29 +1,149 @@
 from rules.hexgrid import HexGrid
 from rules.piece import Piece
+from rules.trace import Tracer
+from enum import IntEnum, unique
 import math
 import collections
+import hashlib
+import sys
+import time
+
+
+# The random 64 bit key of each (color, creature, q, r, level) seen so far.
+# Keys are derived from their tuple, so hashes match between processes.
+_piece_keys = {}
+
+
+def _get_piece_key(piece, level):
+    key = (piece.color, piece.creature, piece.q, piece.r, level)
+    piece_key = _piece_keys.get(key)
+    if piece_key is None:
+        digest = hashlib.blake2b(
+            ",".join(str(int(x)) for x in key).encode(), digest_size=8)
+        piece_key = _piece_keys[key] = int.from_bytes(digest.digest(), "big")
+    return piece_key
+
+
+# Xored into the hash of positions with black to play.
+_black_turn_key = int.from_bytes(
+    hashlib.blake2b(b"black", digest_size=8).digest(), "big")
+
+
+def _is_gil_enabled():
+    """Check whether threads take turns running Python code. Free-threaded
+    builds can turn the GIL back on when a module needs it, so this is
+    checked on every use."""
+
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is None or is_gil_enabled()
 
 
 class GameBoard(HexGrid):
+    """The position of a game of Hive.
+
+    Attributes:
+        repetition_limit - If set, get_result is a draw once the position
+            has occurred this many times, like 3 for threefold repetition.
+        move_limit - If set, get_result is a draw after this many turns.
+    """
+
+    @unique
+    class Result(IntEnum):
+        WHITE_WON = Piece.Color.WHITE
+        BLACK_WON = Piece.Color.BLACK
+        DRAW = 2
+
+    repetition_limit = None
+    move_limit = None
 
     _piece_creature_counts = {
         Piece.Creature.BEE: 1,
         Piece.Creature.SPIDER: 2,
         Piece.Creature.BEETLE: 2,
         Piece.Creature.GRASSHOPPER: 3,
-        Piece.Creature.ANT: 3
+        Piece.Creature.ANT: 3,
+        Piece.Creature.MOSQUITO: 1,
+        Piece.Creature.LADYBUG: 1,
+        Piece.Creature.PILLBUG: 1
     }
 
+    @classmethod
+    def get_piece_creature_counts(cls):
+        """Get a dict of each creature to how many of it each color has."""
+
+        return dict(cls._piece_creature_counts)
+
     def __init__(self, json_object=None):
         super().__init__()
-
-        self._placed_pieces = set()
-        self._unplaced_pieces = set()
+        self._init_containers()
 
         if not json_object:
             self._init_empty()
         else:
             self._init_from_json_object(json_object)
+        self._start_position_history()
+
+    @classmethod
+    def load_json_objects(cls, json_objects):
+        """Get a GameBoard for each of json_objects, as from to_json_object,
+        without checking them. Pieces are built from lookup tables and each
+        stack is put together at once, ordered by the pieces' levels."""
+
+        colors = {x.name: x for x in Piece.Color}
+        creatures = {x.name: x for x in Piece.Creature}
+
+        game_boards = []
+        for json_object in json_objects:
+            game_board = cls.__new__(cls)
+            HexGrid.__init__(game_board)
+            game_board._init_containers()
+
+            stacks = collections.defaultdict(list)
+            for json_piece_object in json_object["pieces"]:
+                q = json_piece_object["q"]
+                r = json_piece_object["r"]
+                piece = Piece(creatures[json_piece_object["creature"]],
+                              colors[json_piece_object["color"]],
+                              json_piece_object["piece_number"],
+                              q, r)
+                if q == q:  # Not NaN.
+                    stacks[(q, r)].append(
+                        (json_piece_object.get("level", 0), piece))
+                else:
+                    game_board._unplaced_pieces.add(piece)
+
+            for coords, leveled_pieces in stacks.items():
+                if len(leveled_pieces) == 1:
+                    _, piece = leveled_pieces[0]
+                    stack = (piece,)
+                else:
+                    leveled_pieces.sort(key=lambda x: x[0])
+                    stack = tuple(x for _, x in leveled_pieces)
+                    for below, piece in zip(stack, stack[1:]):
+                        piece.above = below
+                game_board._registered_cells[coords] = stack[-1]
+                game_board._stacks[coords] = stack
+                game_board._placed_pieces.update(stack)
+                for level, piece in enumerate(stack):
+                    game_board._pieces_hash ^= _get_piece_key(piece, level)
+
+            game_board.player_turn = colors[json_object["player_turn"]]
+            game_board._start_position_history()
+            game_boards.append(game_board)
+        return game_boards
+
+    def _init_containers(self):
+        self._placed_pieces = set()
+        self._unplaced_pieces = set()
+        self._stacks = {}
+        self._move_cache = {}
+        self._containers_shared = False
+        self._pieces_shared = False
+        self._change_log = None
+        self._change_sequence = 0
+        self._open_change = None
+        self._pieces_hash = 0
+        self._tracer = None
 
     def _init_empty(self):
         for color in Piece.Color:
@@ -34,7 +154,11 @@ class GameBoard(HexGrid):
         self.player_turn = Piece.Color.WHITE
 
     def _init_from_json_object(self, json_object):
-        for json_piece_object in json_object["pieces"]:
+        # Pieces higher in a stack have a level. Older snapshots without
+        # levels are loaded in list order.
+        json_piece_objects = sorted(json_object["pieces"],
+                                    key=lambda x: x.get("level", 0))
+        for json_piece_object in json_piece_objects:
             board_piece = Piece(json_object=json_piece_object)
             if board_piece.is_placed():
                 self._register_new_piece(board_piece)
@@ -49,30 +173,277 @@ class GameBoard(HexGrid):
             return False
         return True
 
+    def copy(self):
+        """Get a GameBoard in the same state which can be changed
+        independently of this one.
+
+        The cell registry and piece sets are shared until either board is
+        next changed, and Piece instances are shared for good. Boards which
+        have been copied never modify a Piece in place."""
+
+        board_copy = type(self).__new__(type(self))
+        board_copy.__dict__.update(self.__dict__)
+        board_copy._change_log = None
+        board_copy._open_change = None
+        board_copy._tracer = None
+
+        self._containers_shared = board_copy._containers_shared = True
+        self._pieces_shared = board_copy._pieces_shared = True
+        return board_copy
+
+    def _own_containers(self):
+        """Copy any containers still shared with another board, so that they
+        can be modified."""
+
+        if not self._containers_shared:
+            return
+
+        self._registered_cells = dict(self._registered_cells)
+        self._placed_pieces = set(self._placed_pieces)
+        self._unplaced_pieces = set(self._unplaced_pieces)
+        self._stacks = dict(self._stacks)
+        self._repetitions = dict(self._repetitions)
+        self._containers_shared = False
+
+    def get_move_cache(self):
+        """Get a dict for reusing move generation results in the current
+        position. A new dict is used whenever the position changes."""
+
+        return self._move_cache
+
     def place(self, new_piece):
-        local_instance = self._get_piece(new_piece)
-        assert local_instance
-        assert new_piece.color == self.player_turn
+        """Make a move for player_turn. new_piece is normally one of
+        player_turn's pieces, but may be any piece thrown by a pillbug."""
+
+        local_instance = self.get_piece(new_piece)
+        if local_instance is None:
+            self._raise_invalid(
+                "Piece is not on this game board:" + str(new_piece))
 
-        available_moves = local_instance.get_moves(self)
-        if self.get_cell(new_piece.q, new_piece.r) not in available_moves:
-            raise ValueError("Piece does not represent a valid move:" +
-                             str(local_instance) + " to " + str(new_piece))
+        if not self.is_valid_move(new_piece):
+            self._raise_invalid("Piece does not represent a valid move:" +
+                                str(local_instance) + " to " +
+                                str(new_piece))
+
+        self.force_move(new_piece)
+
+    def force_move(self, new_piece):
+        """Like place, but doesn't verify game mechanics. Unlike
+        force_place, player_turn's turn ends."""
 
         self.force_place(new_piece)
-        self.player_turn = new_piece.opposite_color()
+        self._end_turn()
+
+    def pass_turn(self):
+        """Pass player_turn's turn, as when they have no moves. Whether
+        they have any isn't checked."""
+
+        self._end_turn()
+
+    def _end_turn(self):
+        if self.player_turn == Piece.Color.WHITE:
+            self.player_turn = Piece.Color.BLACK
+        else:
+            self.player_turn = Piece.Color.WHITE
+        self._add_position()
+        if self._tracer is not None:
+            self._tracer.record("turn", player_turn=self.player_turn.name)
+
+        if self._change_log is None:
+            return
+        if self._open_change is not None:
+            self._open_change["turn"] = self.player_turn.name
+            self._open_change = None
+        else:
+            self._add_change(None, None, None, None)  # A pass.
+
+    def _start_position_history(self):
+        position_hash = self.get_zobrist_hash()
+        self._position_history = (position_hash, None)
+        self._repetitions = {position_hash: 1}
+        self._ply_count = 0
+        self._placed_since_position = False
+
+    def _add_position(self):
+        """Record the position at the end of a turn. Placing a piece can't
+        be undone, so the positions before it can't occur again and only
+        the ones since the last placement are counted."""
+
+        self._own_containers()
+        position_hash = self.get_zobrist_hash()
+        self._position_history = (position_hash, self._position_history)
+        self._ply_count += 1
+        if self._placed_since_position:
+            self._repetitions = {position_hash: 1}
+            self._placed_since_position = False
+        else:
+            self._repetitions[position_hash] = \
+                self._repetitions.get(position_hash, 0) + 1
+
+    def get_zobrist_hash(self):
+        """Get a 64 bit hash of the stacks and player_turn, kept up to date
+        with each change. Unlike get_position_key, pieces in different
+        places are different positions even if the hive is only shifted."""
+
+        if self.player_turn == Piece.Color.BLACK:
+            return self._pieces_hash ^ _black_turn_key
+        return self._pieces_hash
+
+    def get_position_history(self):
+        """Get the get_zobrist_hash of each position after a turn, oldest
+        first, starting from the position the board was created with."""
+
+        history = []
+        node = self._position_history
+        while node is not None:
+            position_hash, node = node
+            history.append(position_hash)
+        history.reverse()
+        return history
+
+    def get_ply_count(self):
+        """Get the number of turns since the board was created."""
+
+        return self._ply_count
+
+    def get_repetition_count(self):
+        """Get the number of times the current position has occurred after
+        a turn, counting this one. A position set up with force_place and
+        no turn since counts once."""
+
+        return self._repetitions.get(self.get_zobrist_hash(), 1)
+
+    def start_trace(self, capacity=1000):
+        """Record the last capacity events of this board in a
+        rules.trace.Tracer, and get it. The tracer is not copied with the
+        board."""
+
+        if self._tracer is None:
+            self._tracer = Tracer(capacity)
+        return self._tracer
+
+    def stop_trace(self):
+        self._tracer = None
+
+    def get_tracer(self):
+        """Get the Tracer of start_trace, or None if tracing is off."""
+
+        return self._tracer
+
+    def _raise_invalid(self, message):
+        if self._tracer is not None:
+            self._tracer.record("invalid_move", message=message)
+        raise ValueError(message)
+
+    def start_change_log(self):
+        """Record every later change of the position, for get_changes. The
+        change log is not copied with the board."""
+
+        if self._change_log is None:
+            self._change_log = []
+            self._change_log_start = self._change_sequence
+
+    def get_change_sequence(self):
+        """Get the sequence number of the last change, which to_json_object
+        also includes while the change log is recorded."""
+
+        return self._change_sequence
+
+    def get_changes(self, since=0):
+        """Get the changes after sequence number since, oldest first, as
+        dicts of:
+            sequence - The sequence number, counting up from one.
+            piece - [color, creature, piece_number] of the moved piece, or
+                None for a pass.
+            from, to - [q, r] of the piece before and after, from being
+                None for a placement.
+            level - The number of pieces below the piece after the move.
+            turn - The name of player_turn after the change.
+        """
+
+        if self._change_log is None:
+            raise ValueError("The change log was not started")
+        if since < self._change_log_start:
+            raise ValueError("Changes before " +
+                             str(self._change_log_start) + " weren't logged")
+        return self._change_log[since - self._change_log_start:]
+
+    def _add_change(self, piece, from_coords, to_coords, level):
+        self._change_sequence += 1
+        change = {
+            "sequence": self._change_sequence,
+            "piece": None if piece is None else [
+                int(piece.color), int(piece.creature), piece.piece_number],
+            "from": from_coords,
+            "to": to_coords,
+            "level": level,
+            "turn": self.player_turn.name,
+        }
+        self._change_log.append(change)
+        return change
+
+    def is_valid_move(self, new_piece):
+        """Check if new_piece is one of the moves in get_moves, without
+        generating every move for the current player."""
+
+        local_instance = self.get_piece(new_piece)
+        if not local_instance:
+            return False
+
+        if local_instance.is_placed():
+            if self.bee_is_unplaced(self.player_turn):
+                return False
+            if (local_instance.color == self.player_turn and
+                    local_instance.is_valid_move(self, new_piece)):
+                return True
+            return self._is_valid_throw(local_instance, new_piece)
+        else:
+            if local_instance.color != self.player_turn:
+                return False
+            if (self._must_place_bee() and
+                    local_instance.creature != Piece.Creature.BEE):
+                return False
+            if local_instance not in \
+                    self._get_lowest_numbered_piece_by_creature():
+                return False
+
+        return local_instance.is_valid_move(self, new_piece)
+
+    def _is_valid_throw(self, local_instance, new_piece):
+        for neighbor in local_instance.get_neighbors(self):
+            if (Piece.is_piece(neighbor) and
+                    neighbor.is_valid_throw(self, local_instance, new_piece)):
+                return True
+        return False
 
     def force_place(self, new_piece):
         """Like place, but doesn't verify game mechanics.
         Storage consistency assumptions are validated however."""
 
-        local_instance = self._get_piece(new_piece)
+        local_instance = self.get_piece(new_piece)
         self._validate_placement(new_piece, local_instance)
+        from_coords = None
+        if local_instance.is_placed():
+            from_coords = [local_instance.q, local_instance.r]
+        else:
+            self._placed_since_position = True
+
         self._remove_replaced_piece(local_instance)
         self._register_new_piece(new_piece)
+        if self._tracer is not None:
+            self._tracer.record("move", piece=str(new_piece),
+                                from_coords=from_coords,
+                                to_coords=[new_piece.q, new_piece.r])
+
+        if self._change_log is not None:
+            self._open_change = self._add_change(
+                new_piece, from_coords, [new_piece.q, new_piece.r],
+                self.get_stack_height(new_piece.q, new_piece.r) - 1)
+
+    def get_piece(self, piece):
+        """Get this board's piece with the color, creature and number of
+        piece, or None if there isn't one."""
 
-    def _get_piece(self, piece):
-        """Get a piece based on its color, type and number."""
         for unplaced_piece in self._unplaced_pieces:
             if (piece.color == unplaced_piece.color and
                     piece.creature == unplaced_piece.creature and
@@ -90,60 +461,114 @@ class GameBoard(HexGrid):
     def _validate_placement(self, new_piece, local_instance):
         # Make sure this new_piece is valid to place.
         if local_instance is new_piece:
-            raise ValueError(
+            self._raise_invalid(
                 "Unable to place new_piece already on game board:" +
                 str(new_piece))
 
         if not local_instance:
-            raise ValueError(
+            self._raise_invalid(
                 "Piece not available for placement:" + str(new_piece))
 
         if math.isnan(new_piece.q) or math.isnan(new_piece.r):
-            raise ValueError("Piece does not have coordinates specified:" +
-                             str(new_piece))
+            self._raise_invalid(
+                "Piece does not have coordinates specified:" +
+                str(new_piece))
 
     def _remove_replaced_piece(self, replaced_piece):
-        self._remove_placed(replaced_piece)
-        self._remove_unplaced(replaced_piece)
+        # A board sharing its pieces with a copy unplaces a new Piece rather
+        # than replaced_piece, and that is the one to take back out.
+        unplaced_piece = self._remove_placed(replaced_piece)
+        self._remove_unplaced(unplaced_piece or replaced_piece)
 
     def _remove_unplaced(self, unplaced_piece):
-        if unplaced_piece not in self._unplaced_pieces:
-            return
-
-        next_unplaced_piece = Piece(
-            unplaced_piece.creature,
-            unplaced_piece.color,
-            unplaced_piece.piece_number + 1)
-
-        max_piece_count = self._piece_creature_counts[unplaced_piece.creature]
-        if next_unplaced_piece.piece_number < max_piece_count:
-            self._unplaced_pieces.add(next_unplaced_piece)
-        self._unplaced_pieces.remove(unplaced_piece)
+        # Every piece starts out unplaced, so there is no next piece to add.
+        self._own_containers()
+        self._unplaced_pieces.discard(unplaced_piece)
 
     def _remove_placed(self, placed_piece):
         if placed_piece not in self._placed_pieces:
             return
 
+        self._own_containers()
+        self._move_cache = {}
         self._placed_pieces.remove(placed_piece)
         self.unregister_cell(placed_piece)
-        self._unplaced_pieces.add(placed_piece)
 
-        placed_piece.q = math.nan
-        placed_piece.r = math.nan
-        placed_piece.s = math.nan
+        coords = (placed_piece.q, placed_piece.r)
+        stack = self._stacks.pop(coords)
+        assert stack[-1] is placed_piece
+        self._pieces_hash ^= _get_piece_key(placed_piece, len(stack) - 1)
+        if len(stack) > 1:
+            self._stacks[coords] = stack[:-1]
+
+        if self._pieces_shared:
+            unplaced_piece = Piece(
+                placed_piece.creature,
+                placed_piece.color,
+                placed_piece.piece_number)
+        else:
+            # Clear the coordinates before hashing into the unplaced set.
+            unplaced_piece = placed_piece
+            unplaced_piece.q = math.nan
+            unplaced_piece.r = math.nan
+            unplaced_piece.s = math.nan
+        self._unplaced_pieces.add(unplaced_piece)
 
         if placed_piece.above:
             self.register_cell(placed_piece.above)
+        return unplaced_piece
 
     def _register_new_piece(self, new_piece):
+        self._own_containers()
+        self._move_cache = {}
         bottom_piece = self.get_cell(new_piece.q, new_piece.r)
         if Piece.is_piece(bottom_piece):
             self.unregister_cell(bottom_piece)
             new_piece.above = bottom_piece
+        else:
+            new_piece.above = None
 
         self.register_cell(new_piece)
         self._placed_pieces.add(new_piece)
 
+        coords = (new_piece.q, new_piece.r)
+        stack = self._stacks.get(coords, ())
+        self._pieces_hash ^= _get_piece_key(new_piece, len(stack))
+        self._stacks[coords] = stack + (new_piece,)
+
+    def get_stack(self, q, r):
+        """Get a tuple of the pieces at the specified coordinates, from the
+        bottom up. The last piece is the one registered in the grid."""
+
+        return self._stacks.get((q, r), ())
+
+    def get_stacks(self):
+        """Get a dict of the (q, r) of each occupied cell to its get_stack.
+        The dict belongs to the board and must not be changed."""
+
+        return self._stacks
+
+    def get_stack_height(self, q, r):
+        """Get the number of pieces at the specified coordinates."""
+
+        return len(self._stacks.get((q, r), ()))
+
+    def get_position_key(self):
+        """Get a hashable key which is the same for boards with the same
+        player_turn and stacks of creatures in the same places relative to
+        each other. Piece numbers aren't part of the key."""
+
+        if not self._stacks:
+            return (self.player_turn,)
+
+        q_min = min(q for q, _ in self._stacks)
+        r_min = min(r for _, r in self._stacks)
+        stacks = sorted(
+            (q - q_min, r - r_min,
+             tuple((x.color, x.creature) for x in stack))
+            for (q, r), stack in self._stacks.items())
+        return (self.player_turn,) + tuple(stacks)
+
     def get_pieces(self, color=None):
         pieces = set(self.get_placed_pieces(color))
         pieces.update(self.get_unplaced_pieces(color))
@@ -159,36 +584,80 @@ class GameBoard(HexGrid):
             return self._unplaced_pieces
         return (x for x in self._unplaced_pieces if x.color == color)
 
-    def get_moves(self):
-        piece_moves = collections.defaultdict(list)
+    def get_moves(self, executor=None):
+        """Get a dict of each piece which can move to its destinations.
 
-        piece_moves.update(self._get_placed_moves())
+        executor - A concurrent.futures.ThreadPoolExecutor to find the
+            moves of the placed pieces in, one task per piece. It is only
+            used without the GIL, as otherwise the threads would only take
+            turns. Finding moves only reads the board, and the move cache
+            is shared safely, so the tasks need no locks."""
+
+        if self._tracer is not None:
+            start = time.monotonic_ns()
+
+        piece_moves = collections.defaultdict(list)
+        piece_moves.update(self._get_placed_moves(executor))
         piece_moves.update(self._get_unplaced_moves())
 
+        if self._tracer is not None:
+            self._tracer.record(
+                "moves_generated",
+                count=sum(len(x) for x in piece_moves.values()),
+                duration_ns=time.monotonic_ns() - start)
         return piece_moves
 
-    def _get_placed_moves(self):
+    @classmethod
+    def get_moves_of_boards(cls, game_boards, executor=None):
+        """Get the get_moves() of each of game_boards, one task per board
+        of executor, a concurrent.futures.ThreadPoolExecutor, if there is
+        no GIL."""
+
+        if executor is None or _is_gil_enabled():
+            return [x.get_moves() for x in game_boards]
+        return list(executor.map(cls.get_moves, game_boards))
+
+    def _get_placed_moves(self, executor=None):
         piece_moves = collections.defaultdict(list)
 
         if self.bee_is_unplaced(self.player_turn):
             return piece_moves
 
-        for placed_piece in self.get_placed_pieces(self.player_turn):
-            moves = placed_piece.get_moves(self)
+        # Covered pieces can't move.
+        pieces = [x for x in self.get_placed_pieces(self.player_turn)
+                  if self.get_cell(x.q, x.r) is x]
+        if executor is not None and len(pieces) > 1 and \
+                not _is_gil_enabled():
+            results = list(executor.map(self._get_piece_moves, pieces))
+        else:
+            results = [self._get_piece_moves(x) for x in pieces]
+
+        for placed_piece, (moves, _) in zip(pieces, results):
             if moves:
                 piece_moves[placed_piece] = moves
+
+        for _, throws in results:
+            for thrown_piece, destinations in throws.items():
+                piece_moves[thrown_piece] = destinations.union(
+                    piece_moves.get(thrown_piece, ()))
         return piece_moves
 
+    def _get_piece_moves(self, placed_piece):
+        """Get the moves and throws of an uncovered piece of player_turn."""
+
+        return placed_piece.get_moves(self), placed_piece.get_throws(self)
+
     def _get_unplaced_moves(self):
         piece_moves = collections.defaultdict(list)
         must_place_bee = self._must_place_bee()
 
         for piece in self._get_lowest_numbered_piece_by_creature():
-            if must_place_bee:
-                if piece.creature == Piece.Creature.BEE:
-                    piece_moves[piece] = piece.get_moves(self)
-            else:
-                piece_moves[piece] = piece.get_moves(self)
+            if must_place_bee and piece.creature != Piece.Creature.BEE:
+                continue
+
+            moves = piece.get_moves(self)
+            if moves:
+                piece_moves[piece] = moves
 
         return piece_moves
 
@@ -210,6 +679,36 @@ class GameBoard(HexGrid):
                 return False
         return True
 
+    def bee_is_surrounded(self, player):
+        """Check if player's bee is placed with a piece on every side."""
+
+        for placed_piece in self.get_placed_pieces(player):
+            if placed_piece.creature == Piece.Creature.BEE:
+                return all(Piece.is_piece(x)
+                           for x in placed_piece.get_neighbors(self))
+        return False
+
+    def get_result(self):
+        """Get the Result of a finished game, or None if it is still being
+        played. A game finishes when a bee is surrounded, and is drawn if
+        both bees are, or by repetition_limit or move_limit."""
+
+        white_lost = self.bee_is_surrounded(Piece.Color.WHITE)
+        black_lost = self.bee_is_surrounded(Piece.Color.BLACK)
+        if white_lost and black_lost:
+            return self.Result.DRAW
+        if black_lost:
+            return self.Result.WHITE_WON
+        if white_lost:
+            return self.Result.BLACK_WON
+        if (self.repetition_limit is not None and
+                self.get_repetition_count() >= self.repetition_limit):
+            return self.Result.DRAW
+        if (self.move_limit is not None and
+                self._ply_count >= self.move_limit):
+            return self.Result.DRAW
+        return None
+
     def _must_place_bee(self):
         bee_is_unplaced = self.bee_is_unplaced(
             self.player_turn)
@@ -220,8 +719,17 @@ class GameBoard(HexGrid):
         return False
 
     def to_json_object(self):
-        pieces = [x.to_json_object() for x in self.get_pieces()]
-        return {
+        pieces = []
+        for stack in self._stacks.values():
+            for level, piece in enumerate(stack):
+                pieces.append(piece.to_json_object())
+                if level:
+                    pieces[-1]["level"] = level
+        pieces.extend(x.to_json_object() for x in self._unplaced_pieces)
+        json_object = {
             "pieces": pieces,
             "player_turn": self.player_turn.name
         }
+        if self._change_log is not None:
+            json_object["sequence"] = self._change_sequence
+        return json_object
@@ -0,0 +1,130 @@
+"""Distances, rings, spirals and lines of hex cells, from lookup tables.
+
+Cells are (q, r) coordinates, as HexCell.q and r and the keys of
+GameBoard.get_stacks. Queries within WINDOW_RADIUS of the origin, which
+games played from GameBoard() rarely leave, are answered from tables built
+on import and caches of recent results. Queries outside it are computed on
+demand with the same results.
+"""
+import functools
+from rules.hexcell import HexCell
+
+
+WINDOW_RADIUS = 32
+
+# The steps around a ring, starting from the cell in Direction.Q_POS.
+_ring_steps = ((-1, 1), (-1, 0), (0, -1), (1, -1), (1, 0), (0, 1))
+
+
+def _compute_distance(dq, dr):
+    return max(abs(dq), abs(dr), abs(dq + dr))
+
+
+def _build_distances():
+    """Get the table of _compute_distance(dq, dr) at [dq][dr] for offsets
+    of up to twice WINDOW_RADIUS, with negative offsets indexed from the
+    end of each list."""
+
+    offsets = (list(range(2 * WINDOW_RADIUS + 1)) +
+               list(range(-2 * WINDOW_RADIUS, 0)))
+    return [[_compute_distance(dq, dr) for dr in offsets] for dq in offsets]
+
+
+def _build_ring_offsets(radius):
+    if not radius:
+        return ((0, 0),)
+    q, r = radius, 0
+    offsets = []
+    for dq, dr in _ring_steps:
+        for _ in range(radius):
+            offsets.append((q, r))
+            q, r = q + dq, r + dr
+    return tuple(offsets)
+
+
+_distances = _build_distances()
+_ring_offsets = tuple(_build_ring_offsets(x)
+                      for x in range(WINDOW_RADIUS + 1))
+
+
+def get_distance(first, second):
+    """Get the number of steps between the cells first and second."""
+
+    dq = first[0] - second[0]
+    dr = first[1] - second[1]
+    if -2 * WINDOW_RADIUS <= dq <= 2 * WINDOW_RADIUS and \
+            -2 * WINDOW_RADIUS <= dr <= 2 * WINDOW_RADIUS:
+        return _distances[dq][dr]
+    return _compute_distance(dq, dr)
+
+
+def get_ring(center, radius):
+    """Get a tuple of the cells radius steps from center, going around
+    from the one in Direction.Q_POS."""
+
+    if _in_window(center, radius):
+        return _get_cached_ring(center, radius)
+    return _get_ring(center, radius)
+
+
+def get_spiral(center, radius):
+    """Get a tuple of the cells up to radius steps from center, nearest
+    first, in the order of get_ring."""
+
+    if _in_window(center, radius):
+        return _get_cached_spiral(center, radius)
+    return _get_spiral(center, radius)
+
+
+def get_line(start, direction, length):
+    """Get a tuple of the length cells after start in the Direction
+    direction."""
+
+    dq, dr, _ = HexCell._direction_coord_change[direction]
+    if _in_window(start, length):
+        return _get_cached_line(start, dq, dr, length)
+    return _get_line(start, dq, dr, length)
+
+
+def get_piece_distances(game_board, target, color=None):
+    """Get a dict of each placed piece of game_board, or only those of
+    color, to its distance from the cell target."""
+
+    distances = {}
+    for coords, stack in game_board.get_stacks().items():
+        distance = get_distance(coords, target)
+        for piece in stack:
+            if color is None or piece.color == color:
+                distances[piece] = distance
+    return distances
+
+
+def _in_window(center, radius):
+    """Check the cells up to radius from center are in the window."""
+
+    return (radius <= WINDOW_RADIUS and
+            _compute_distance(*center) <= WINDOW_RADIUS - radius)
+
+
+def _get_ring(center, radius):
+    q, r = center
+    if radius <= WINDOW_RADIUS:
+        offsets = _ring_offsets[radius]
+    else:
+        offsets = _build_ring_offsets(radius)
+    return tuple((q + dq, r + dr) for dq, dr in offsets)
+
+
+def _get_spiral(center, radius):
+    return tuple(x for ring_radius in range(radius + 1)
+                 for x in get_ring(center, ring_radius))
+
+
+def _get_line(start, dq, dr, length):
+    q, r = start
+    return tuple((q + dq * x, r + dr * x) for x in range(1, length + 1))
+
+
+_get_cached_ring = functools.lru_cache(maxsize=4096)(_get_ring)
+_get_cached_spiral = functools.lru_cache(maxsize=1024)(_get_spiral)
+_get_cached_line = functools.lru_cache(maxsize=4096)(_get_line)
@@ -56,6 +56,10 @@ class HexCell:
         return first == second
 
     def __hash__(self):
+        # NaN hashes by identity since Python 3.10, so every unplaced cell
+        # shares one hash explicitly to keep it usable in sets.
+        if self.q != self.q:
+            return hash((None, None, None))
         return hash((self.q, self.r, self.s))
 
     def __str__(self):
@@ -101,6 +105,32 @@ class HexCell:
 
         return hex_grid.get_cell(q, r)
 
+    def get_distance(self, other):
+        """Get the number of steps between this cell and other."""
+
+        return max(abs(self.q - other.q),
+                   abs(self.r - other.r),
+                   abs(self.s - other.s))
+
+    def get_direction_to(self, other):
+        """Get the Direction of the straight line from this cell to other,
+        or None if the cells do not share an axis."""
+
+        distance = self.get_distance(other)
+        if not distance:
+            return None
+
+        coord_change = (
+            (other.q - self.q) / distance,
+            (other.r - self.r) / distance,
+            (other.s - self.s) / distance)
+
+        for direction, direction_coord_change in \
+                self._direction_coord_change.items():
+            if coord_change == direction_coord_change:
+                return direction
+        return None
+
     def get_offset_coords(self):
         col = self.q + (self.r - (self.r & 1)) // 2
         row = self.r
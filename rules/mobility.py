@@ -0,0 +1,295 @@
+"""Move counts of the pieces of a GameBoard, for both colors at once.
+
+The counts are those of Piece.get_moves if it were each piece's color's
+turn, without throws by a pillbug: a piece can move if its color's bee is
+placed, it is on top of its stack and lifting it doesn't split the hive.
+They are found on the (q, r) coordinates of GameBoard.get_stacks, so no
+HexCell is made and the move cache is neither read nor filled.
+"""
+from rules.hexcell import Direction, HexCell
+from rules.piece import Piece
+
+
+_directions = tuple(HexCell._direction_coord_change[x][:2]
+                    for x in Direction)
+
+# (dq, dr, clockwise, counterclockwise) for each direction, where clockwise
+# and counterclockwise are the offsets of the cells either side of the
+# gate, as HexCell.rotate_clockwise_about_origin and
+# rotate_counterclockwise_about_origin.
+_gates = tuple((dq, dr, (dq + dr, -dq), (-dr, dq + dr))
+               for dq, dr in _directions)
+
+
+def get_move_count(game_board, piece):
+    """Get the number of cells piece can move to, or 0 if it can't move."""
+
+    heights = _get_heights(game_board)
+    if not _get_movable(game_board, heights, [piece]):
+        return 0
+    return _count_moves(game_board, heights, piece)
+
+
+def get_piece_move_counts(game_board):
+    """Get a dict of each piece of either color which can move to the
+    number of cells it can move to."""
+
+    return get_move_counts(
+        game_board, [x[-1] for x in game_board.get_stacks().values()])
+
+
+def get_move_counts(game_board, pieces):
+    """Get a dict of each of pieces which can move to the number of cells
+    it can move to, as get_move_count for each but sharing the work."""
+
+    heights = _get_heights(game_board)
+    return {piece: _count_moves(game_board, heights, piece)
+            for piece in _get_movable(game_board, heights, pieces)}
+
+
+def get_creature_move_counts(game_board):
+    """Get a dict of (color, creature) to the moves of those pieces, with
+    every pair present."""
+
+    creature_counts = {(color, creature): 0
+                       for color in Piece.Color
+                       for creature in Piece.Creature}
+    for piece, count in get_piece_move_counts(game_board).items():
+        creature_counts[(piece.color, piece.creature)] += count
+    return creature_counts
+
+
+def get_color_move_counts(game_board):
+    """Get the [white, black] number of moves of each color's pieces."""
+
+    color_counts = [0, 0]
+    for piece, count in get_piece_move_counts(game_board).items():
+        color_counts[piece.color] += count
+    return color_counts
+
+
+def get_articulation_cells(cells):
+    """Get the set of cells which would split the rest of cells, a
+    collection of (q, r), if they were removed."""
+
+    articulation_cells = set()
+    if not cells:
+        return articulation_cells
+
+    root = next(iter(cells))
+    depths = {root: 0}
+    lows = {root: 0}
+    root_child_count = 0
+    stack = [(root, None, _get_neighbors(root, cells))]
+    while stack:
+        coords, parent, neighbors = stack[-1]
+        for neighbor in neighbors:
+            if neighbor == parent:
+                continue
+            if neighbor in depths:
+                lows[coords] = min(lows[coords], depths[neighbor])
+            else:
+                depths[neighbor] = lows[neighbor] = depths[coords] + 1
+                stack.append(
+                    (neighbor, coords, _get_neighbors(neighbor, cells)))
+                break
+        else:
+            stack.pop()
+            if parent is None:
+                continue
+            lows[parent] = min(lows[parent], lows[coords])
+            if parent == root:
+                root_child_count += 1
+            elif lows[coords] >= depths[parent]:
+                articulation_cells.add(parent)
+
+    if root_child_count > 1:
+        articulation_cells.add(root)
+    return articulation_cells
+
+
+def _get_neighbors(coords, cells):
+    q, r = coords
+    return ((q + dq, r + dr) for dq, dr in _directions
+            if (q + dq, r + dr) in cells)
+
+
+def _get_heights(game_board):
+    return {coords: len(stack)
+            for coords, stack in game_board.get_stacks().items()}
+
+
+def _get_movable(game_board, heights, pieces):
+    """Get the pieces of pieces which can move, as Piece.can_move for
+    either color."""
+
+    bee_placed = [False, False]
+    for coords, stack in game_board.get_stacks().items():
+        for piece in stack:
+            if piece.creature == Piece.Creature.BEE:
+                bee_placed[piece.color] = True
+
+    articulation_cells = None
+    movable = []
+    for piece in pieces:
+        coords = (piece.q, piece.r)
+        if not bee_placed[piece.color] or \
+                game_board.get_cell(*coords) is not piece:
+            continue
+        if heights[coords] == 1:
+            if len(heights) == 1:
+                continue  # Only one piece on the board.
+            if articulation_cells is None:
+                articulation_cells = get_articulation_cells(heights)
+            if coords in articulation_cells:
+                continue
+        movable.append(piece)
+    return movable
+
+
+def _count_moves(game_board, heights, piece):
+    """Count the moves of the movable piece, lifting it off heights while
+    they are found."""
+
+    coords = (piece.q, piece.r)
+    height = heights[coords]
+    if height == 1:
+        del heights[coords]
+    else:
+        heights[coords] = height - 1
+
+    try:
+        if piece.creature == Piece.Creature.MOSQUITO:
+            return len(_get_mosquito_moves(game_board, heights, coords,
+                                           height))
+        return len(_get_moves(piece.creature, heights, coords))
+    finally:
+        heights[coords] = height
+
+
+def _get_mosquito_moves(game_board, heights, coords, height):
+    """As Piece.get_moves_MOSQUITO."""
+
+    if height > 1:
+        return _get_moves(Piece.Creature.BEETLE, heights, coords)
+
+    stacks = game_board.get_stacks()
+    creatures = Piece.get_mimicked_creatures(
+        stacks[x][-1].creature for x in _get_neighbors(coords, stacks))
+
+    if len(creatures) == 1:
+        return _get_moves(creatures.pop(), heights, coords)
+    moves = set()
+    for creature in creatures:
+        moves.update(_get_moves(creature, heights, coords))
+    return moves
+
+
+def _get_moves(creature, heights, coords):
+    """Get the distinct cells a piece lifted from coords can move to like
+    creature, which is not a mosquito."""
+
+    return globals()["_get_moves_" + creature.name](heights, coords)
+
+
+def _can_slide(heights, q, r, gate):
+    """Check a piece on the ground can slide from (q, r) through gate, as
+    Piece._freedom_to_move into an empty cell."""
+
+    dq, dr, clockwise, counterclockwise = gate
+    return ((q + dq, r + dr) not in heights and
+            ((q + clockwise[0], r + clockwise[1]) in heights) !=
+            ((q + counterclockwise[0], r + counterclockwise[1]) in heights))
+
+
+def _can_climb(heights, q, r, gate):
+    """As Piece._freedom_to_climb from (q, r) through gate."""
+
+    dq, dr, clockwise, counterclockwise = gate
+    start_height = heights.get((q, r), 0)
+    end_height = heights.get((q + dq, r + dr), 0)
+    if not start_height and not end_height:
+        return _can_slide(heights, q, r, gate)
+    gate_height = min(
+        heights.get((q + clockwise[0], r + clockwise[1]), 0),
+        heights.get((q + counterclockwise[0], r + counterclockwise[1]), 0))
+    return gate_height <= max(start_height, end_height)
+
+
+def _get_slides(heights, coords, steps):
+    """Get the cells first reached by exactly steps slides from coords, or
+    by any number of slides if steps is None, as Piece.get_moves_SPIDER and
+    get_moves_ANT."""
+
+    visited = {coords}
+    layer = [coords]
+    step = 0
+    while layer and step != steps:
+        next_layer = []
+        for q, r in layer:
+            for gate in _gates:
+                neighbor = (q + gate[0], r + gate[1])
+                if neighbor not in visited and \
+                        _can_slide(heights, q, r, gate):
+                    visited.add(neighbor)
+                    next_layer.append(neighbor)
+        layer = next_layer
+        step += 1
+
+    if steps is None:
+        visited.discard(coords)
+        return visited
+    return layer
+
+
+def _get_moves_BEE(heights, coords):
+    q, r = coords
+    return [(q + x[0], r + x[1]) for x in _gates
+            if _can_slide(heights, q, r, x)]
+
+
+def _get_moves_PILLBUG(heights, coords):
+    return _get_moves_BEE(heights, coords)
+
+
+def _get_moves_BEETLE(heights, coords):
+    q, r = coords
+    return [(q + x[0], r + x[1]) for x in _gates
+            if _can_climb(heights, q, r, x)]
+
+
+def _get_moves_SPIDER(heights, coords):
+    return _get_slides(heights, coords, 3)
+
+
+def _get_moves_ANT(heights, coords):
+    return _get_slides(heights, coords, None)
+
+
+def _get_moves_GRASSHOPPER(heights, coords):
+    moves = []
+    for dq, dr in _directions:
+        q, r = coords[0] + dq, coords[1] + dr
+        if (q, r) not in heights:
+            continue  # Grasshoppers must jump over at least one piece.
+        while (q, r) in heights:
+            q, r = q + dq, r + dr
+        moves.append((q, r))
+    return moves
+
+
+def _get_moves_LADYBUG(heights, coords):
+    # Two moves on top of the hive, then one down.
+    on_top_cells = {coords}
+    for _ in range(2):
+        on_top_cells = {
+            (q + x[0], r + x[1])
+            for q, r in on_top_cells for x in _gates
+            if (q + x[0], r + x[1]) in heights and
+            _can_climb(heights, q, r, x)}
+
+    return {(q + x[0], r + x[1])
+            for q, r in on_top_cells for x in _gates
+            if (q + x[0], r + x[1]) not in heights and
+            (q + x[0], r + x[1]) != coords and
+            _can_climb(heights, q, r, x)}
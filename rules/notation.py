@@ -0,0 +1,225 @@
+"""Reading and writing moves in standard Hive notation.
+
+A piece is written as its color, creature letter and number, like wA1 or
+bQ. Numbers start from one and are left out for creatures with a single
+piece. A move is the moving piece followed by a piece next to its
+destination, with a mark for the side it is on:
+    -bS1  west      bS1-  east
+    \\bS1  northwest bS1/  northeast
+    /bS1  southwest bS1\\  southeast
+A reference piece without a mark means moving on top of it. The first move
+of a game has no reference piece, and "pass" passes.
+
+Games are written one per line, as their moves separated by ";".
+"""
+import re
+from rules.game_board import GameBoard
+from rules.piece import Piece
+
+
+PASS = "pass"
+
+_color_letters = {
+    Piece.Color.WHITE: "w",
+    Piece.Color.BLACK: "b",
+}
+
+_creature_letters = {
+    Piece.Creature.BEE: "Q",
+    Piece.Creature.SPIDER: "S",
+    Piece.Creature.BEETLE: "B",
+    Piece.Creature.GRASSHOPPER: "G",
+    Piece.Creature.ANT: "A",
+    Piece.Creature.MOSQUITO: "M",
+    Piece.Creature.LADYBUG: "L",
+    Piece.Creature.PILLBUG: "P",
+}
+
+# The (dq, dr) offset from the reference piece of each mark, with rows of
+# increasing r drawn below each other as in HexCell.get_offset_coords.
+_prefix_offsets = {"-": (-1, 0), "\\": (0, -1), "/": (-1, 1)}
+_suffix_offsets = {"-": (1, 0), "/": (1, -1), "\\": (0, 1)}
+
+_piece_pattern = "([wb])([QSBGAMLP])([1-9]?)"
+_piece_re = re.compile(_piece_pattern + "$")
+_move_re = re.compile(
+    _piece_pattern + r"(?:\s+([-/\\]?)" + _piece_pattern + r"([-/\\]?))?$")
+
+# The fields before the moves of a Universal Hive Protocol GameString.
+_header_re = re.compile(
+    r"(Base(\+[MLP]+)?|NotStarted|InProgress|Draw|WhiteWins|BlackWins|"
+    r"(White|Black)\[\d+\])$")
+
+_colors = {v: k for k, v in _color_letters.items()}
+_creatures = {v: k for k, v in _creature_letters.items()}
+
+
+def piece_to_string(piece):
+    """Get the notation of piece, like wA1."""
+
+    result = _color_letters[piece.color] + _creature_letters[piece.creature]
+    if GameBoard.get_piece_creature_counts()[piece.creature] > 1:
+        result += str(piece.piece_number + 1)
+    return result
+
+
+def parse_piece(text):
+    """Get an unplaced Piece from its notation."""
+
+    match = _piece_re.match(text.strip())
+    if not match:
+        raise ValueError("Not a piece: " + repr(text))
+    return _get_piece(*match.groups())
+
+
+def move_to_string(game_board, move):
+    """Get the notation of move, a Piece at its destination, or None to
+    pass, made by player_turn on game_board."""
+
+    if move is None:
+        return PASS
+
+    moving_piece = piece_to_string(move)
+    stack = [x for x in game_board.get_stack(move.q, move.r)
+             if not _is_same_piece(x, move)]
+    if stack:
+        return moving_piece + " " + piece_to_string(stack[-1])
+
+    for prefix, suffix, (dq, dr) in _get_sides():
+        stack = [x for x in game_board.get_stack(move.q - dq, move.r - dr)
+                 if not _is_same_piece(x, move)]
+        if stack:
+            return (moving_piece + " " + prefix +
+                    piece_to_string(stack[-1]) + suffix)
+
+    if game_board.get_placed_pieces():
+        raise ValueError("Move isn't next to another piece: " + repr(move))
+    return moving_piece
+
+
+def _get_sides():
+    """Get (prefix, suffix, (dq, dr)) of every side, one of the marks being
+    empty."""
+
+    return ([("", mark, offset) for mark, offset in _suffix_offsets.items()] +
+            [(mark, "", offset) for mark, offset in _prefix_offsets.items()])
+
+
+def parse_move(game_board, text):
+    """Get the move of text made by player_turn on game_board, as a Piece at
+    its destination, or None for a pass. The move isn't checked against
+    the rules."""
+
+    text = text.strip()
+    if text == PASS:
+        return None
+
+    match = _move_re.match(text)
+    if not match:
+        raise ValueError("Not a move: " + repr(text))
+    (color, creature, number, prefix, reference_color, reference_creature,
+     reference_number, suffix) = match.groups()
+    piece = _get_piece(color, creature, number)
+
+    if reference_color is None:
+        if game_board.get_placed_pieces():
+            raise ValueError("Move needs a reference piece: " + repr(text))
+        return piece.get_moved_absolute(0, 0)
+
+    if prefix and suffix:
+        raise ValueError("Move has two marks: " + repr(text))
+    reference = game_board.get_piece(
+        _get_piece(reference_color, reference_creature, reference_number))
+    if reference is None or not reference.is_placed():
+        raise ValueError("Reference piece isn't placed: " + repr(text))
+
+    dq, dr = (_prefix_offsets[prefix] if prefix else
+              _suffix_offsets[suffix] if suffix else (0, 0))
+    return piece.get_moved_absolute(reference.q + dq, reference.r + dr)
+
+
+def _get_piece(color, creature, number):
+    creature = _creatures[creature]
+    piece_count = GameBoard.get_piece_creature_counts()[creature]
+    if piece_count == 1:
+        if number:
+            raise ValueError("Numbered single piece: " +
+                             color + _creature_letters[creature] + number)
+        piece_number = 0
+    else:
+        if not number or int(number) > piece_count:
+            raise ValueError("Bad piece number: " +
+                             color + _creature_letters[creature] + number)
+        piece_number = int(number) - 1
+    return Piece(creature, _colors[color], piece_number)
+
+
+def _is_same_piece(first, second):
+    return (first.color == second.color and
+            first.creature == second.creature and
+            first.piece_number == second.piece_number)
+
+
+def play_move(game_board, move, validate=True):
+    """Make move, as from parse_move, on game_board. With validate, moves
+    have to follow the rules and passing needs there to be no moves."""
+
+    if move is None:
+        if validate and game_board.get_moves():
+            raise ValueError("Can't pass with moves available")
+        game_board.pass_turn()
+        return
+
+    # The board keeps the Piece it is given, so give it one of its own.
+    move = move.get_moved_absolute(move.q, move.r)
+    if validate:
+        game_board.place(move)
+    else:
+        game_board.force_move(move)
+
+
+def game_to_string(moves):
+    """Get the notation line of the game of moves from the empty board."""
+
+    game_board = GameBoard()
+    texts = []
+    for move in moves:
+        texts.append(move_to_string(game_board, move))
+        play_move(game_board, move, validate=False)
+    return ";".join(texts)
+
+
+def read_games(lines, validate=True):
+    """Replay the game on each line of lines, such as an open file, one at a
+    time. Blank lines and lines starting with "#" are skipped, as are the
+    fields before the moves of a Universal Hive Protocol GameString.
+
+    Yields (game_board, moves) of the final position and the moves made, as
+    from parse_move. Raises ValueError with the line number of the first
+    bad move."""
+
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        game_board = GameBoard()
+        moves = []
+        for text in line.split(";"):
+            if not text.strip() or _header_re.match(text.strip()):
+                continue
+            try:
+                move = parse_move(game_board, text)
+                play_move(game_board, move, validate)
+            except ValueError as error:
+                raise ValueError("Line " + str(line_number) + ": " +
+                                 str(error)) from error
+            moves.append(move)
+        yield game_board, moves
+
+
+def write_games(games, file):
+    """Write each sequence of moves in games to file as a notation line."""
+
+    for moves in games:
+        file.write(game_to_string(moves) + "\n")
@@ -2,6 +2,7 @@ from enum import IntEnum, unique
 from . import hexcell
 import math
 import functools
+import heapq
 
 
 @functools.total_ordering
@@ -14,9 +15,9 @@ class Piece(hexcell.HexCell):
         BEETLE = 2
         GRASSHOPPER = 3
         ANT = 4
-        # MOSQUITO = 5
-        # LADYBUG = 6
-        # PILLBUG = 7
+        MOSQUITO = 5
+        LADYBUG = 6
+        PILLBUG = 7
 
     @unique
     class Color(IntEnum):
@@ -42,7 +43,7 @@ class Piece(hexcell.HexCell):
             self.creature = creature
             self.color = color
             self.piece_number = piece_number
-            self.above = None
+        self.above = None
 
     def __lt__(self, other):
         attribute_names = [
@@ -100,14 +101,80 @@ class Piece(hexcell.HexCell):
 
     # TODO why does everything take game_board?
     def get_moves(self, game_board):
-        if math.nan in (self.q, self.r, self.s):
+        if not self.is_placed():
             return self._get_placements(game_board)
 
         if not self.can_move(game_board):
             return []
 
-        method_name = "get_moves_" + self.creature.name
-        return getattr(self, method_name)(game_board)
+        return self._get_creature_moves(self.creature, game_board)
+
+    def _get_creature_moves(self, creature, game_board):
+        """Get the moves of this piece if it moved like creature. Results are
+        shared by every call in the same position of game_board."""
+
+        move_cache = game_board.get_move_cache()
+        key = (self.q, self.r, creature)
+        tracer = game_board.get_tracer()
+        moves = move_cache.get(key)
+        if moves is None:
+            if tracer is not None:
+                tracer.record("cache_miss", piece=str(self),
+                              creature=creature.name)
+            method_name = "get_moves_" + creature.name
+            # Threads finding the same moves at once all get the first
+            # stored.
+            moves = move_cache.setdefault(key, frozenset(
+                getattr(self, method_name)(game_board)))
+        elif tracer is not None:
+            tracer.record("cache_hit", piece=str(self),
+                          creature=creature.name)
+        return moves
+
+    def is_valid_move(self, game_board, destination):
+        """Check if destination is one of get_moves(game_board) without
+        generating the other moves. Searches stop as soon as the
+        destination is found or shown to be unreachable."""
+
+        destination = game_board.get_cell(destination.q, destination.r)
+
+        if not self.is_placed():
+            return self._is_valid_placement(game_board, destination)
+
+        if self.is_piece(destination) and not self._can_climb(game_board):
+            return False
+
+        if not self.can_move(game_board):
+            return False
+
+        method_name = "_is_valid_move_" + self.creature.name
+        return getattr(self, method_name)(game_board, destination)
+
+    def _is_valid_placement(self, game_board, destination):
+        if game_board.player_turn != self.color:
+            return False
+
+        if self.is_piece(destination):
+            return False
+
+        if not list(game_board.get_placed_pieces(self.color)):
+            oppisite_pieces = list(game_board.get_placed_pieces(
+                self.opposite_color()))
+            if not oppisite_pieces:
+                return destination == game_board.get_cell(0, 0)
+
+            assert len(oppisite_pieces) == 1
+            return oppisite_pieces[0].get_distance(destination) == 1
+
+        has_friendly_neighbor = False
+        for neighbor in destination.get_neighbors(game_board):
+            if not self.is_piece(neighbor):
+                continue
+            if neighbor.color != self.color:
+                return False
+            has_friendly_neighbor = True
+
+        return has_friendly_neighbor
 
     def _get_placements(self, game_board):
         open_neighbors = set()
@@ -123,7 +190,7 @@ class Piece(hexcell.HexCell):
                 return {game_board.get_cell(0, 0)}
 
             assert len(oppisite_pieces) == 1
-            return oppisite_pieces[0].get_neighbors(game_board)
+            return set(oppisite_pieces[0].get_neighbors(game_board))
 
         for piece in game_board.get_placed_pieces(self.color):
             for open_neighbor in piece._get_space_neighbors(piece, game_board):
@@ -145,6 +212,19 @@ class Piece(hexcell.HexCell):
         if game_board.player_turn != self.color:
             return False
 
+        return self._can_leave_cell(game_board)
+
+    def _can_leave_cell(self, game_board):
+        """Check whether this piece can be lifted from its cell without
+        splitting the hive, regardless of whose turn it is."""
+
+        top_piece = game_board.get_cell(self.q, self.r)
+        if self.is_piece(top_piece) and top_piece is not self:
+            return False  # Covered by another piece.
+
+        if game_board.get_stack_height(self.q, self.r) > 1:
+            return True  # Leaves the piece below behind.
+
         partitions = [[x] for x in self._get_piece_neighbors(self, game_board)]
 
         if not partitions:  # Only one piece on the board.
@@ -178,7 +258,7 @@ class Piece(hexcell.HexCell):
         return len(partitions) == 1
 
     def get_moves_BEE(self, game_board):
-        return self._get_freedom_to_move_neighbors(self, game_board)
+        return set(self._get_freedom_to_move_neighbors(self, game_board))
 
     def get_moves_SPIDER(self, game_board):
         visited = {self}
@@ -198,21 +278,137 @@ class Piece(hexcell.HexCell):
         return previous_search_results
 
     def get_moves_BEETLE(self, game_board):
-        moves = set(self._get_freedom_to_move_neighbors(self, game_board))
-        moves.union(self._get_piece_neighbors(self, game_board))
+        return {x for x in self.get_neighbors(game_board)
+                if self._freedom_to_climb(self, x, game_board)}
+
+    def get_moves_MOSQUITO(self, game_board):
+        if game_board.get_stack_height(self.q, self.r) > 1:
+            return self._get_creature_moves(self.Creature.BEETLE, game_board)
 
+        moves = set()
+        for creature in self._get_mimicked_creatures(game_board):
+            moves.update(self._get_creature_moves(creature, game_board))
         return moves
 
+    def get_moves_LADYBUG(self, game_board):
+        on_top_cells = {self}
+        for _ in range(2):
+            on_top_cells = {
+                neighbor
+                for on_top_cell in on_top_cells
+                for neighbor in self._get_piece_neighbors(
+                    on_top_cell, game_board)
+                if neighbor is not self and
+                self._freedom_to_climb(on_top_cell, neighbor, game_board)}
+
+        return {
+            neighbor
+            for on_top_cell in on_top_cells
+            for neighbor in self._get_space_neighbors(on_top_cell, game_board)
+            if self._freedom_to_climb(on_top_cell, neighbor, game_board)}
+
+    def get_moves_PILLBUG(self, game_board):
+        return self.get_moves_BEE(game_board)
+
+    def get_throws(self, game_board):
+        """Get the moves of adjacent pieces made with the pillbug ability of
+        this piece, as a dict of piece to destinations.
+
+        Unlike the printed rules, a throw may move the piece the opponent
+        moved last, and a pillbug the opponent just threw may throw. Boards
+        don't record the last move, and JSON positions couldn't carry it."""
+
+        if not self._can_throw(game_board):
+            return {}
+
+        destinations = self._get_space_neighbors(self, game_board)
+        throws = {}
+        for piece in self._get_piece_neighbors(self, game_board):
+            if not piece._can_be_thrown(game_board):
+                continue
+
+            piece_throws = {x for x in destinations
+                            if self._is_open_throw(piece, x, game_board)}
+            if piece_throws:
+                throws[piece] = piece_throws
+        return throws
+
+    def is_valid_throw(self, game_board, piece, destination):
+        """Check if destination is in get_throws(game_board)[piece]."""
+
+        destination = game_board.get_cell(destination.q, destination.r)
+        return (self.get_distance(piece) == 1 and
+                self.get_distance(destination) == 1 and
+                not self.is_piece(destination) and
+                self._can_throw(game_board) and
+                piece._can_be_thrown(game_board) and
+                self._is_open_throw(piece, destination, game_board))
+
+    def _can_throw(self, game_board):
+        if self.creature not in (self.Creature.PILLBUG,
+                                 self.Creature.MOSQUITO):
+            return False
+
+        if game_board.player_turn != self.color:
+            return False
+
+        if game_board.get_cell(self.q, self.r) is not self or \
+                game_board.get_stack_height(self.q, self.r) > 1:
+            return False
+
+        # Not _get_mimicked_creatures, which drops the pillbug next to an ant.
+        return (self.creature == self.Creature.PILLBUG or
+                any(x.creature == self.Creature.PILLBUG
+                    for x in self._get_piece_neighbors(self, game_board)))
+
+    def _can_be_thrown(self, game_board):
+        return (game_board.get_stack_height(self.q, self.r) == 1 and
+                self._can_leave_cell(game_board))
+
+    def _is_open_throw(self, piece, destination, game_board):
+        """Check piece can be lifted onto this piece and down to destination.
+        """
+
+        return (piece._freedom_to_climb(piece, self, game_board) and
+                piece._freedom_to_climb(self, destination, game_board))
+
+    def _get_mimicked_creatures(self, game_board):
+        """Get the creatures whose moves a mosquito here takes on."""
+
+        return self.get_mimicked_creatures(
+            x.creature for x in self._get_piece_neighbors(self, game_board))
+
+    @classmethod
+    def get_mimicked_creatures(cls, neighbor_creatures):
+        """Get the set of creatures whose moves a mosquito on the ground
+        takes on next to pieces of neighbor_creatures, leaving out those
+        whose moves another one's include."""
+
+        creatures = set(neighbor_creatures)
+        creatures.discard(cls.Creature.MOSQUITO)
+
+        # Ants reach every cell bees, spiders and pillbugs slide to, and
+        # pillbugs move like bees.
+        if cls.Creature.ANT in creatures:
+            creatures -= {cls.Creature.BEE,
+                          cls.Creature.SPIDER,
+                          cls.Creature.PILLBUG}
+        elif cls.Creature.PILLBUG in creatures:
+            creatures.discard(cls.Creature.BEE)
+        return creatures
+
     def get_moves_GRASSHOPPER(self, game_board):
         viable_landing_locations = set()
         for direction in hexcell.Direction:
-            next_landing_location = self
+            next_landing_location = self.get_neighbor(game_board, direction)
+            if not self.is_piece(next_landing_location):
+                continue  # Grasshoppers must jump over at least one piece.
+
             while self.is_piece(next_landing_location):
                 next_landing_location = next_landing_location.get_neighbor(
                     game_board, direction)
 
-            if self is not next_landing_location:
-                viable_landing_locations.add(next_landing_location)
+            viable_landing_locations.add(next_landing_location)
 
         return viable_landing_locations
 
@@ -231,6 +427,93 @@ class Piece(hexcell.HexCell):
         visited.remove(self)
         return visited
 
+    def _is_valid_move_BEE(self, game_board, destination):
+        if self.get_distance(destination) != 1:
+            return False
+        return self._freedom_to_move(self, destination, game_board)
+
+    def _is_valid_move_SPIDER(self, game_board, destination):
+        # get_moves_SPIDER yields the cells exactly three steps away, so
+        # search by layer and skip cells too far away to reach destination
+        # in the remaining steps.
+        visited = {self}
+        previous_search_results = {self}
+
+        for remaining_steps in (2, 1, 0):
+            next_search_results = set()
+            for previous_search_result in previous_search_results:
+                free_neighbors = self._get_freedom_to_move_neighbors(
+                    previous_search_result, game_board)
+                for neighbor in free_neighbors:
+                    if neighbor in visited:
+                        continue
+                    if neighbor == destination:
+                        return remaining_steps == 0
+                    visited.add(neighbor)
+                    if neighbor.get_distance(destination) <= remaining_steps:
+                        next_search_results.add(neighbor)
+            previous_search_results = next_search_results
+
+        return False
+
+    def _is_valid_move_BEETLE(self, game_board, destination):
+        if self.get_distance(destination) != 1:
+            return False
+        return self._freedom_to_climb(self, destination, game_board)
+
+    def _is_valid_move_GRASSHOPPER(self, game_board, destination):
+        direction = self.get_direction_to(destination)
+        if direction is None or self.get_distance(destination) < 2:
+            return False
+
+        next_landing_location = self.get_neighbor(game_board, direction)
+        while self.is_piece(next_landing_location):
+            next_landing_location = next_landing_location.get_neighbor(
+                game_board, direction)
+
+        return next_landing_location == destination
+
+    def _is_valid_move_ANT(self, game_board, destination):
+        # Best first search, expanding the cells closest to destination.
+        visited = {self}
+        unvisited = [(self.get_distance(destination), 0, self)]
+        push_count = 1
+
+        while unvisited:
+            _, _, next_unvisited = heapq.heappop(unvisited)
+            free_neighbors = self._get_freedom_to_move_neighbors(
+                next_unvisited, game_board)
+            for neighbor in (x for x in free_neighbors if x not in visited):
+                if neighbor == destination:
+                    return True
+                visited.add(neighbor)
+                heapq.heappush(unvisited, (
+                    neighbor.get_distance(destination),
+                    push_count,
+                    neighbor))
+                push_count += 1
+
+        return False
+
+    def _is_valid_move_MOSQUITO(self, game_board, destination):
+        if game_board.get_stack_height(self.q, self.r) > 1:
+            return self._is_valid_move_BEETLE(game_board, destination)
+
+        for creature in self._get_mimicked_creatures(game_board):
+            method_name = "_is_valid_move_" + creature.name
+            if getattr(self, method_name)(game_board, destination):
+                return True
+        return False
+
+    def _is_valid_move_LADYBUG(self, game_board, destination):
+        if self.get_distance(destination) > 3:
+            return False
+        return destination in self._get_creature_moves(
+            self.Creature.LADYBUG, game_board)
+
+    def _is_valid_move_PILLBUG(self, game_board, destination):
+        return self._is_valid_move_BEE(game_board, destination)
+
     def _get_piece_neighbors(self, hex_cell, game_board):
         return {x for x in hex_cell.get_neighbors(game_board)
                 if Piece.is_piece(x)}
@@ -270,6 +553,45 @@ class Piece(hexcell.HexCell):
 
         return (clockwise_blocked != counterclockwise_blocked)
 
+    def _freedom_to_climb(self, start, end, game_board):
+        """Like _freedom_to_move, but for pieces which can move on top of the
+        hive. A gate only blocks if both of its stacks are higher than the
+        start, without this piece, and the end."""
+
+        start_height = self._get_stack_height(start, game_board)
+        end_height = self._get_stack_height(end, game_board)
+
+        if not start_height and not end_height:
+            return self._freedom_to_move(start, end, game_board)
+
+        diff = end - start
+        clockwise_neighbor_hex = (
+            diff.rotate_clockwise_about_origin() + start)
+        counterclockwise_neighbor_hex = (
+            diff.rotate_counterclockwise_about_origin() + start)
+
+        gate_height = min(
+            self._get_stack_height(clockwise_neighbor_hex, game_board),
+            self._get_stack_height(counterclockwise_neighbor_hex, game_board))
+        return gate_height <= max(start_height, end_height)
+
+    def _get_stack_height(self, hex_cell, game_board):
+        """Get the number of pieces at hex_cell, other than this one."""
+
+        height = game_board.get_stack_height(hex_cell.q, hex_cell.r)
+        if height and game_board.get_cell(hex_cell.q, hex_cell.r) is self:
+            height -= 1
+        return height
+
+    def _can_climb(self, game_board):
+        if self.creature == self.Creature.BEETLE:
+            return True
+        if self.creature == self.Creature.MOSQUITO:
+            return (game_board.get_stack_height(self.q, self.r) > 1 or
+                    self.Creature.BEETLE in
+                    self._get_mimicked_creatures(game_board))
+        return False
+
     def is_placed(self):
         if math.isnan(self.q) or math.isnan(self.r) or math.isnan(self.s):
             return False
@@ -0,0 +1,65 @@
+"""Recent events of a GameBoard, kept in a fixed-size ring buffer.
+
+Tracing is off unless GameBoard.start_trace is called, and a traced board
+only appends a tuple per event, so it can be left on for every game of a
+server and the last events dumped when one of them stalls or fails. Events
+are TraceEvents with a time.monotonic_ns timestamp and one of the kinds:
+    move - A piece was placed or moved: piece, from_coords and to_coords.
+    turn - A turn ended, passing if no move was made: player_turn.
+    moves_generated - GameBoard.get_moves ran: count and duration_ns.
+    invalid_move - A move was rejected: message.
+    cache_hit, cache_miss - A piece's moves were looked up in the move
+        cache: piece and creature.
+"""
+import collections
+import contextlib
+import json
+import sys
+import time
+
+
+TraceEvent = collections.namedtuple("TraceEvent", ["time_ns", "kind", "data"])
+TraceEvent.__doc__ = """An event, with a dict of data depending on kind."""
+
+
+class Tracer:
+    """A ring buffer of the last capacity TraceEvents."""
+
+    def __init__(self, capacity=1000):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._events = collections.deque(maxlen=capacity)
+
+    def __len__(self):
+        return len(self._events)
+
+    def record(self, kind, **data):
+        self._events.append(TraceEvent(time.monotonic_ns(), kind, data))
+
+    def get_events(self):
+        """Get the recorded TraceEvents, oldest first."""
+
+        return list(self._events)
+
+    def clear(self):
+        self._events.clear()
+
+    def dump(self, file=None):
+        """Write the events to file, by default sys.stderr, as JSON lines of
+        their time_ns, kind and data."""
+
+        file = file or sys.stderr
+        for event in self._events:
+            file.write(json.dumps(event._asdict(), default=str) + "\n")
+        file.flush()
+
+    @contextlib.contextmanager
+    def dump_on_exception(self, file=None):
+        """Get a context manager which dumps the events to file if an
+        exception leaves it, and lets the exception propagate."""
+
+        try:
+            yield self
+        except BaseException:
+            self.dump(file)
+            raise
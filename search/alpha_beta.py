@@ -0,0 +1,102 @@
+"""Depth-limited alpha-beta search of GameBoard positions.
+
+Values are from the point of view of the player to move, so a child's value
+is the negation of its own. A player without moves passes.
+"""
+import math
+import time
+from rules.game_board import GameBoard
+
+
+# Greater than any evaluate value. Wins found sooner score higher.
+WIN_VALUE = 1000.0
+
+
+class SearchTimeout(Exception):
+    """Raised when a search passes its deadline."""
+
+
+def evaluate(game_board):
+    """Get the number of pieces around the enemy bee, less those around the
+    bee of the player to move."""
+
+    player = game_board.player_turn
+    return (_get_bee_neighbor_count(game_board, 1 - player) -
+            _get_bee_neighbor_count(game_board, player))
+
+
+def _get_bee_neighbor_count(game_board, color):
+    for piece in game_board.get_placed_pieces(color):
+        if piece.creature == piece.Creature.BEE:
+            return sum(piece.is_piece(x)
+                       for x in piece.get_neighbors(game_board))
+    return 0
+
+
+def get_move_list(game_board):
+    """Get the moves of game_board.get_moves() as Pieces at their
+    destinations, in a fixed order."""
+
+    moves = [piece.get_moved_absolute(x.q, x.r)
+             for piece, destinations in game_board.get_moves().items()
+             for x in destinations]
+    moves.sort(key=lambda x: (x.color, x.creature, x.piece_number, x.q, x.r))
+    return moves
+
+
+def play(game_board, move):
+    """Get a copy of game_board after move, one of its get_move_list, or
+    after passing if move is None."""
+
+    child = game_board.copy()
+    if move is None:
+        child.pass_turn()
+    else:
+        child.force_move(move.get_moved_absolute(move.q, move.r))
+    return child
+
+
+def negamax(game_board, depth, alpha=-math.inf, beta=math.inf,
+            evaluate=evaluate, deadline=None):
+    """Get the value of game_board searched depth plies deep.
+
+    Values at or below alpha, or at or above beta, are only bounds on the
+    true value. deadline is a time.monotonic() after which SearchTimeout
+    is raised."""
+
+    if deadline is not None and time.monotonic() > deadline:
+        raise SearchTimeout()
+
+    result = game_board.get_result()
+    if result == GameBoard.Result.DRAW:
+        return 0.0
+    if result is not None:
+        value = WIN_VALUE + depth
+        return value if result == game_board.player_turn else -value
+
+    if depth <= 0:
+        return evaluate(game_board)
+
+    best_value = -math.inf
+    for move in get_move_list(game_board) or [None]:
+        value = -negamax(play(game_board, move), depth - 1, -beta, -alpha,
+                         evaluate, deadline)
+        best_value = max(best_value, value)
+        alpha = max(alpha, value)
+        if alpha >= beta:
+            break
+    return best_value
+
+
+def get_best_move(game_board, depth, evaluate=evaluate, deadline=None):
+    """Get (value, move) of the best move of game_board searched depth plies
+    deep. move is None if the player to move has to pass."""
+
+    best_value = -math.inf
+    best_move = None
+    for move in get_move_list(game_board) or [None]:
+        value = -negamax(play(game_board, move), depth - 1, -math.inf,
+                         -best_value, evaluate, deadline)
+        if value > best_value:
+            best_value, best_move = value, move
+    return best_value, best_move
@@ -0,0 +1,234 @@
+"""Breadth-first enumeration of the distinct positions of the opening.
+
+Positions are kept as canonical keys, a few bytes each rather than a
+GameBoard, which are the same for positions which only differ by a shift,
+rotation or reflection of the hive, or by which piece of a creature is
+where. Each ply's new positions are collected in memory up to a limit and
+then written to a sorted run file. The runs are merged into the ply's
+frontier, less every position seen at an earlier ply, so memory use is
+bounded by the limit however large the tree gets.
+
+Run
+    python -m search.opening_enumeration PLIES [--memory-limit N]
+to print the number of new distinct positions at each ply.
+"""
+import argparse
+import heapq
+import os
+import sys
+import tempfile
+from rules.game_board import GameBoard
+from rules.piece import Piece
+
+
+def _rotate(q, r):
+    """Rotate (q, r) by 60 degrees around (0, 0)."""
+
+    return q + r, -q
+
+
+def _get_transforms():
+    """Get the 12 symmetries of the hex grid as functions of (q, r)."""
+
+    transforms = []
+    for reflect in (False, True):
+        for rotation_count in range(6):
+            def transform(q, r, reflect=reflect,
+                          rotation_count=rotation_count):
+                if reflect:
+                    q, r = r, q
+                for _ in range(rotation_count):
+                    q, r = _rotate(q, r)
+                return q, r
+            transforms.append(transform)
+    return transforms
+
+
+_transforms = _get_transforms()
+
+
+def get_canonical_key(game_board):
+    """Get bytes which are the same for game_board and every board with the
+    same player_turn and the same stacks of creatures up to symmetry. The
+    smallest encoding over the symmetries of the grid is used."""
+
+    stacks = [(q, r, bytes(x.color * 16 + x.creature for x in stack))
+              for (q, r), stack in game_board.get_stacks().items()]
+    return min(_encode(game_board.player_turn, stacks, transform)
+               for transform in _transforms)
+
+
+def _encode(player_turn, stacks, transform):
+    transformed = [transform(q, r) + (pieces,) for q, r, pieces in stacks]
+    if transformed:
+        q_min = min(x[0] for x in transformed)
+        r_min = min(x[1] for x in transformed)
+    encoded = bytearray([player_turn])
+    for q, r, pieces in sorted(transformed):
+        encoded += bytes([q - q_min, r - r_min, len(pieces)])
+        encoded += pieces
+    return bytes(encoded)
+
+
+def get_game_board(key):
+    """Get a GameBoard of the position of a get_canonical_key key."""
+
+    game_board = GameBoard()
+    piece_numbers = {}
+    index = 1
+    while index < len(key):
+        q, r, height = key[index:index + 3]
+        for value in key[index + 3:index + 3 + height]:
+            color = Piece.Color(value // 16)
+            creature = Piece.Creature(value % 16)
+            piece_number = piece_numbers.get((color, creature), 0)
+            piece_numbers[(color, creature)] = piece_number + 1
+            game_board.force_place(
+                Piece(creature, color, piece_number, q, r))
+        index += 3 + height
+    game_board.player_turn = Piece.Color(key[0])
+    return game_board
+
+
+def get_child_keys(key):
+    """Get the set of keys of the positions one turn after key. Finished
+    games have none, and a player without moves passes."""
+
+    game_board = get_game_board(key)
+    if game_board.get_result() is not None:
+        return set()
+
+    piece_moves = game_board.get_moves()
+    if not piece_moves:
+        game_board.pass_turn()
+        return {get_canonical_key(game_board)}
+
+    child_keys = set()
+    for piece, destinations in piece_moves.items():
+        for destination in destinations:
+            child = game_board.copy()
+            child.force_move(
+                piece.get_moved_absolute(destination.q, destination.r))
+            child_keys.add(get_canonical_key(child))
+    return child_keys
+
+
+def enumerate_positions(max_ply, memory_limit=1000000, directory=None):
+    """Get a list of the number of distinct positions first reached at each
+    ply from 0 to max_ply, starting from GameBoard().
+
+    memory_limit - The number of keys held in memory before they are
+        written to a run file.
+    directory - Where to put the run files, by default the system's
+        temporary directory.
+    """
+
+    if memory_limit < 1:
+        raise ValueError("memory_limit must be at least 1")
+
+    with tempfile.TemporaryDirectory(dir=directory) as run_directory:
+        paths = _PathMaker(run_directory)
+        frontier_path = paths.get()
+        _write_run(frontier_path, [get_canonical_key(GameBoard())])
+        seen_path = frontier_path
+        counts = [1]
+
+        for _ in range(max_ply):
+            old_paths = {frontier_path, seen_path}
+            run_paths = []
+            child_keys = set()
+            for key in _read_keys(frontier_path):
+                child_keys.update(get_child_keys(key))
+                if len(child_keys) >= memory_limit:
+                    run_paths.append(paths.get())
+                    _write_run(run_paths[-1], child_keys)
+                    child_keys = set()
+            if child_keys or not run_paths:
+                run_paths.append(paths.get())
+                _write_run(run_paths[-1], child_keys)
+
+            new_keys = _subtract(_merge_unique(run_paths),
+                                 _read_keys(seen_path))
+            frontier_path = paths.get()
+            counts.append(_write_run(frontier_path, new_keys))
+
+            merged_path = paths.get()
+            _write_run(merged_path, _merge_unique([seen_path, frontier_path]))
+            for path in old_paths.union(run_paths):
+                os.remove(path)
+            seen_path = merged_path
+        return counts
+
+
+class _PathMaker:
+
+    def __init__(self, directory):
+        self._directory = directory
+        self._count = 0
+
+    def get(self):
+        self._count += 1
+        return os.path.join(self._directory, str(self._count) + ".run")
+
+
+def _write_run(path, keys):
+    """Write keys to path in sorted order, one hex line each, sorting them
+    unless they are already an iterator in order. Returns the count."""
+
+    if not hasattr(keys, "__next__"):
+        keys = sorted(keys)
+
+    count = 0
+    with open(path, "w") as run_file:
+        for key in keys:
+            run_file.write(key.hex() + "\n")
+            count += 1
+    return count
+
+
+def _read_keys(path):
+    with open(path) as run_file:
+        for line in run_file:
+            yield bytes.fromhex(line.rstrip("\n"))
+
+
+def _merge_unique(paths):
+    """Iterate over the keys of the sorted runs at paths, in order and
+    without duplicates."""
+
+    previous = None
+    for key in heapq.merge(*(_read_keys(x) for x in paths)):
+        if key != previous:
+            yield key
+            previous = key
+
+
+def _subtract(keys, excluded_keys):
+    """Iterate over the sorted keys which aren't in sorted excluded_keys."""
+
+    excluded = next(excluded_keys, None)
+    for key in keys:
+        while excluded is not None and excluded < key:
+            excluded = next(excluded_keys, None)
+        if key != excluded:
+            yield key
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("plies", type=int)
+    parser.add_argument("--memory-limit", type=int, default=1000000,
+                        help="Keys held in memory before spilling to disk")
+    parser.add_argument("--directory",
+                        help="Where to write the run files")
+    args = parser.parse_args(argv)
+
+    counts = enumerate_positions(args.plies, args.memory_limit,
+                                 args.directory)
+    for ply, count in enumerate(counts):
+        print("{:>3} {:>12}".format(ply, count))
+    print("Total {:>10}".format(sum(counts)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Alpha-beta search with the root moves split across processes.
+
+Each iterative deepening depth searches the root moves in rounds. The
+first, best-ordered move is searched alone for a bound, and each later
+round is spread over the workers with the best value found so far as its
+alpha, so that workers cut off moves which can't improve on it. The
+position and its moves are published once with SharedBoards, and tasks
+refer to moves by index.
+"""
+from concurrent import futures
+import math
+import os
+import time
+from evaluation.shared_boards import SharedBoards
+from search import alpha_beta
+
+
+def get_best_move(game_board, time_limit, max_depth=math.inf,
+                  worker_count=None, executor=None,
+                  evaluate=alpha_beta.evaluate):
+    """Get (value, move, depth) of the best move of game_board found within
+    time_limit seconds, from the deepest depth searched in full.
+
+    worker_count - The number of processes, by default one per CPU.
+    executor - A concurrent.futures.ProcessPoolExecutor of worker_count
+        processes to use instead of creating one for this search.
+    evaluate - A picklable function, as alpha_beta.evaluate.
+    """
+
+    deadline = time.monotonic() + time_limit
+    shared_boards = SharedBoards.create([game_board],
+                                        [game_board.get_moves()])
+    worker_count = worker_count or os.cpu_count()
+    own_executor = executor is None
+    if own_executor:
+        executor = futures.ProcessPoolExecutor(worker_count)
+
+    try:
+        moves = shared_boards.get_moves(0)
+        if len(moves) <= 1:
+            return (evaluate(game_board),
+                    moves[0] if moves else None, 0)
+
+        order = list(range(len(moves)))
+        best = (-math.inf, moves[0], 0)
+        depth = 1
+        while depth <= max_depth and time.monotonic() < deadline:
+            values = _search_depth(executor, worker_count,
+                                   shared_boards.name, order, depth,
+                                   evaluate, deadline)
+            if values is None:
+                break
+
+            order.sort(key=lambda x: -values[x])
+            best = (values[order[0]], moves[order[0]], depth)
+            if abs(best[0]) >= alpha_beta.WIN_VALUE:
+                break
+            depth += 1
+        return best
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+        shared_boards.close()
+
+
+def _search_depth(executor, worker_count, name, order, depth, evaluate,
+                  deadline):
+    """Get the value of each move index searched depth plies deep, searching
+    in order, or None if the deadline passes first. Values of moves which
+    can't beat an earlier one are upper bounds."""
+
+    values = {}
+    alpha = -math.inf
+    rounds = [order[:1]] + [order[i:i + worker_count]
+                            for i in range(1, len(order), worker_count)]
+    for move_indices in rounds:
+        tasks = [executor.submit(_search_move, name, x, depth, alpha,
+                                 evaluate, deadline)
+                 for x in move_indices]
+        timeout = None
+        if deadline != math.inf:
+            timeout = max(deadline - time.monotonic(), 0)
+        _, not_done = futures.wait(tasks, timeout=timeout)
+        if not_done:
+            for task in not_done:
+                task.cancel()
+            return None
+
+        for move_index, task in zip(move_indices, tasks):
+            value = task.result()
+            if value is None:
+                return None
+            values[move_index] = value
+            alpha = max(alpha, value)
+    return values
+
+
+# The position of the last block a worker process read, as
+# (name, game_board, moves).
+_worker_position = (None, None, None)
+
+
+def _search_move(name, move_index, depth, alpha, evaluate, deadline):
+    """Search one root move in a worker process. Returns None if the
+    deadline passes first."""
+
+    global _worker_position
+    if _worker_position[0] != name:
+        with SharedBoards.attach(name) as shared_boards:
+            _worker_position = (name, shared_boards.get_game_board(0),
+                                shared_boards.get_moves(0))
+
+    _, game_board, moves = _worker_position
+    try:
+        return -alpha_beta.negamax(
+            alpha_beta.play(game_board, moves[move_index]), depth - 1,
+            -math.inf, -alpha, evaluate, deadline)
+    except alpha_beta.SearchTimeout:
+        return None
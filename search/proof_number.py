@@ -0,0 +1,158 @@
+"""Depth-first proof-number search for forced bee surrounds.
+
+solve tries to prove that a player can force a win, however the other
+player answers, within a budget of searched nodes. Positions are scored
+with proof and disproof numbers, the number of positions that would have to
+be solved to prove or disprove them, and the search always continues in
+the position which is cheapest to settle. The numbers are kept in a
+transposition table keyed by GameBoard.get_zobrist_hash, which holds at
+most table_size positions and drops the ones that took the least work when
+it is full.
+
+A position which repeats one earlier in the line being searched counts as
+not won, so a proof never relies on repetition. A disproof only means that
+no forced win exists without one, and draws count as not won.
+"""
+import collections
+from search import alpha_beta
+
+
+Solution = collections.namedtuple(
+    "Solution", ["proven", "move", "node_count"])
+Solution.__doc__ = """The result of solve.
+
+proven - True if the player can force a win, False if they can't and None
+    if the budget ran out first.
+move - A winning move of a proven player to move, or None.
+node_count - The number of positions searched.
+"""
+
+_INFINITY = 10 ** 9
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+def solve(game_board, player=None, node_budget=10000, table_size=1000000):
+    """Try to prove that player, by default player_turn, can force a win
+    from game_board by surrounding the other bee. A proven win for the
+    player not to move proves a loss for the player to move."""
+
+    if player is None:
+        player = game_board.player_turn
+    solver = _Solver(player, node_budget, table_size)
+
+    try:
+        phi, delta = solver.search(game_board, _INFINITY, _INFINITY)
+    except _BudgetExceeded:
+        return Solution(None, None, solver.node_count)
+
+    proven = (phi == 0) == (game_board.player_turn == player)
+    move = None
+    if (proven and game_board.player_turn == player and
+            game_board.get_result() is None):
+        move = solver.get_winning_move(game_board)
+    return Solution(proven, move, solver.node_count)
+
+
+class _Solver:
+    """One df-pn search. Numbers are phi and delta, the proof and disproof
+    numbers of the player to move winning when that is the proving player,
+    and the other way around when it isn't."""
+
+    def __init__(self, player, node_budget, table_size):
+        self.player = player
+        self.node_budget = node_budget
+        self.table_size = table_size
+        self.node_count = 0
+        self.table = {}
+        self.path = set()
+
+    def search(self, game_board, phi_threshold, delta_threshold):
+        """Search game_board until its phi or delta reaches its threshold,
+        and get (phi, delta)."""
+
+        terminal_values = self.get_terminal_values(game_board)
+        if terminal_values is not None:
+            return terminal_values
+
+        self.node_count += 1
+        if self.node_count > self.node_budget:
+            raise _BudgetExceeded()
+
+        key = game_board.get_zobrist_hash()
+        start_count = self.node_count
+        children = [alpha_beta.play(game_board, x)
+                    for x in alpha_beta.get_move_list(game_board) or [None]]
+
+        self.path.add(key)
+        try:
+            while True:
+                values = [self.get_values(x) for x in children]
+                phi = min(x[1] for x in values)
+                delta = min(_INFINITY, sum(x[0] for x in values))
+                if phi >= phi_threshold or delta >= delta_threshold:
+                    break
+
+                # Search the child with the least delta, until it passes
+                # the second least or this node reaches its threshold.
+                order = sorted(range(len(values)),
+                               key=lambda x: values[x][1])
+                best_phi, best_delta = values[order[0]]
+                second_delta = (values[order[1]][1] if len(order) > 1
+                                else _INFINITY)
+                self.search(
+                    children[order[0]],
+                    min(_INFINITY, delta_threshold + best_phi - delta),
+                    min(phi_threshold, second_delta + 1))
+        finally:
+            self.path.discard(key)
+
+        self.store(key, phi, delta, self.node_count - start_count)
+        return phi, delta
+
+    def get_terminal_values(self, game_board):
+        """Get (phi, delta) of a finished game, or None."""
+
+        result = game_board.get_result()
+        if result is None:
+            return None
+        return self.get_settled_values(game_board, result == self.player)
+
+    def get_settled_values(self, game_board, won):
+        """Get (phi, delta) of game_board once it's known whether the
+        proving player has won."""
+
+        if won == (game_board.player_turn == self.player):
+            return 0, _INFINITY
+        return _INFINITY, 0
+
+    def get_values(self, game_board):
+        terminal_values = self.get_terminal_values(game_board)
+        if terminal_values is not None:
+            return terminal_values
+
+        key = game_board.get_zobrist_hash()
+        if key in self.path:
+            return self.get_settled_values(game_board, False)
+
+        entry = self.table.get(key)
+        if entry is None:
+            return 1, 1
+        return entry[:2]
+
+    def store(self, key, phi, delta, work):
+        if key not in self.table and len(self.table) >= self.table_size:
+            # Keep the half of the table that took the most work.
+            by_work = sorted(self.table, key=lambda x: self.table[x][2])
+            for old_key in by_work[:len(by_work) // 2 + 1]:
+                del self.table[old_key]
+        self.table[key] = (phi, delta, work)
+
+    def get_winning_move(self, game_board):
+        for move in alpha_beta.get_move_list(game_board):
+            _, delta = self.get_values(alpha_beta.play(game_board, move))
+            if delta == 0:
+                return move
+        return None
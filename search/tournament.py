@@ -0,0 +1,253 @@
+"""Bot against bot tournaments, with Elo estimates.
+
+Players are given as specs:
+    random      Plays random moves.
+    depth:N     Plays the best move of alpha_beta searched N plies deep.
+    time:S      Searches deeper and deeper for S seconds a move.
+
+Games are spread over a process pool. Each pairing plays an even number
+of games with the colors swapped every game, and every game starts with a
+few random moves from its seed so that repeated games differ. Both games
+of a color-swapped pair share a seed, so each side gets both colors of
+the same opening. Run
+    python -m search.tournament random depth:1 depth:2 [--gauntlet]
+to play a round robin, or a gauntlet of the first player against the rest.
+"""
+import argparse
+import collections
+from concurrent import futures
+import itertools
+import math
+import random
+import sys
+import time
+from rules import notation
+from rules.game_board import GameBoard
+from search import alpha_beta
+
+
+Player = collections.namedtuple("Player", ["spec", "kind", "budget"])
+Player.__doc__ = """A bot, as parsed from its spec by parse_player."""
+
+GameRecord = collections.namedtuple(
+    "GameRecord",
+    ["white", "black", "seed", "result", "moves", "seconds"])
+GameRecord.__doc__ = """A finished game.
+
+white, black - The spec of each player.
+result - The GameBoard.Result. Reaching move_limit or repetition_limit is a
+    draw.
+moves - The moves made, as from notation.parse_move.
+"""
+
+EloEstimate = collections.namedtuple(
+    "EloEstimate", ["spec", "elo", "lower", "upper", "games", "score"])
+EloEstimate.__doc__ = """The rating of a player against its opponents.
+
+elo - The Elo difference to the average opponent it played.
+lower, upper - The bounds of a 95% confidence interval of elo.
+score - The fraction of points won, counting draws as half.
+"""
+
+# A win counts as a score of one, a draw as a half.
+_scores = {
+    GameBoard.Result.WHITE_WON: (1.0, 0.0),
+    GameBoard.Result.BLACK_WON: (0.0, 1.0),
+    GameBoard.Result.DRAW: (0.5, 0.5),
+}
+
+
+def parse_player(spec):
+    """Get the Player of spec, raising ValueError if it's not one."""
+
+    kind, _, budget = spec.partition(":")
+    try:
+        if kind == "random" and not budget:
+            return Player(spec, kind, None)
+        if kind == "depth" and int(budget) > 0:
+            return Player(spec, kind, int(budget))
+        if kind == "time" and float(budget) > 0:
+            return Player(spec, kind, float(budget))
+    except ValueError:
+        pass
+    raise ValueError("Not a player: " + repr(spec))
+
+
+def get_move(player, game_board, rng):
+    """Get the move of player on game_board, or None to pass."""
+
+    moves = alpha_beta.get_move_list(game_board)
+    if len(moves) <= 1 or player.kind == "random":
+        return rng.choice(moves) if moves else None
+    if player.kind == "depth":
+        return alpha_beta.get_best_move(game_board, player.budget)[1]
+
+    deadline = time.monotonic() + player.budget
+    best_move = moves[0]
+    for depth in itertools.count(1):
+        try:
+            value, best_move = alpha_beta.get_best_move(
+                game_board, depth, deadline=deadline)
+        except alpha_beta.SearchTimeout:
+            break
+        if abs(value) >= alpha_beta.WIN_VALUE:
+            break
+    return best_move
+
+
+def play_game(white, black, seed, random_plies=2, move_limit=200,
+              repetition_limit=3):
+    """Play a game between the white and black specs from GameBoard(),
+    starting with random_plies random moves, and get its GameRecord."""
+
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    players = (parse_player(white), parse_player(black))
+    game_board = GameBoard()
+    game_board.move_limit = move_limit
+    game_board.repetition_limit = repetition_limit
+
+    moves = []
+    while game_board.get_result() is None:
+        player = players[game_board.player_turn]
+        if len(moves) < random_plies:
+            player = Player("random", "random", None)
+        move = get_move(player, game_board, rng)
+        game_board = alpha_beta.play(game_board, move)
+        moves.append(move)
+
+    return GameRecord(white, black, seed, game_board.get_result(), moves,
+                      time.perf_counter() - start)
+
+
+def get_round_robin_pairings(specs, games_per_pair):
+    """Get (white, black) of every game in which each pair of specs meets
+    games_per_pair times, swapping colors every game.
+
+    An odd games_per_pair is rounded up, so that each color-swapped pair
+    of games follows the other."""
+
+    return [pair if i % 2 == 0 else pair[::-1]
+            for pair in itertools.combinations(specs, 2)
+            for i in range(games_per_pair + games_per_pair % 2)]
+
+
+def get_gauntlet_pairings(specs, games_per_pair):
+    """Like get_round_robin_pairings, but only the first spec's games
+    against each of the others."""
+
+    return [pair if i % 2 == 0 else pair[::-1]
+            for pair in ((specs[0], x) for x in specs[1:])
+            for i in range(games_per_pair + games_per_pair % 2)]
+
+
+def run(pairings, worker_count=None, seed=0, **game_options):
+    """Play the (white, black) games of pairings in a process pool.
+
+    Returns (game_records, seconds), with the records in pairing order.
+    Each two games of pairings share a seed, so that a color-swapped pair
+    starts from the same random moves. game_options are passed to
+    play_game."""
+
+    start = time.perf_counter()
+    with futures.ProcessPoolExecutor(worker_count) as executor:
+        tasks = [executor.submit(play_game, white, black, seed + i // 2,
+                                 **game_options)
+                 for i, (white, black) in enumerate(pairings)]
+        game_records = [x.result() for x in tasks]
+    return game_records, time.perf_counter() - start
+
+
+def get_elo_estimates(game_records):
+    """Get an EloEstimate of each player of game_records, best first."""
+
+    game_scores = collections.defaultdict(list)
+    for game_record in game_records:
+        white_score, black_score = _scores[game_record.result]
+        game_scores[game_record.white].append(white_score)
+        game_scores[game_record.black].append(black_score)
+
+    estimates = []
+    for spec, scores in game_scores.items():
+        count = len(scores)
+        score = sum(scores) / count
+        variance = sum((x - score) ** 2 for x in scores) / count
+        margin = 1.96 * math.sqrt(variance / count)
+        estimates.append(EloEstimate(
+            spec, _get_elo(score), _get_elo(score - margin),
+            _get_elo(score + margin), count, score))
+    estimates.sort(key=lambda x: (-x.score, x.spec))
+    return estimates
+
+
+def _get_elo(score):
+    """Get the Elo difference expected to score score, which is infinite
+    for scores of zero or one."""
+
+    if score <= 0:
+        return -math.inf
+    if score >= 1:
+        return math.inf
+    return -400 * math.log10(1 / score - 1)
+
+
+def write_game_records(game_records, file):
+    """Write each game as a notation line after its result, which
+    notation.read_games skips."""
+
+    result_names = {
+        GameBoard.Result.WHITE_WON: "WhiteWins",
+        GameBoard.Result.BLACK_WON: "BlackWins",
+        GameBoard.Result.DRAW: "Draw",
+    }
+    for game_record in game_records:
+        file.write("# {} - {}, seed {}\n".format(
+            game_record.white, game_record.black, game_record.seed))
+        file.write(result_names[game_record.result] + ";" +
+                   notation.game_to_string(game_record.moves) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("players", nargs="+", type=parse_player)
+    parser.add_argument("--gauntlet", action="store_true",
+                        help="Only play the first player against the rest")
+    parser.add_argument("--games", type=int, default=10,
+                        help="Games per pair of players, rounded up to "
+                        "an even number")
+    parser.add_argument("--workers", type=int,
+                        help="Processes, by default one per CPU")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--move-limit", type=int, default=200,
+                        help="Plies before a game is drawn")
+    parser.add_argument("--output", help="Write the games to this file")
+    args = parser.parse_args(argv)
+
+    specs = [x.spec for x in args.players]
+    if len(specs) < 2:
+        parser.error("At least two players are needed")
+    get_pairings = (get_gauntlet_pairings if args.gauntlet
+                    else get_round_robin_pairings)
+    game_records, seconds = run(get_pairings(specs, args.games),
+                                args.workers, args.seed,
+                                move_limit=args.move_limit)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            write_game_records(game_records, output_file)
+
+    print("{:<12} {:>8} {:>18} {:>6} {:>6}".format(
+        "Player", "Elo", "95% interval", "Games", "Score"))
+    for estimate in get_elo_estimates(game_records):
+        print("{:<12} {:>8.0f} {:>8.0f} to {:>6.0f} {:>6} {:>6.1%}".format(
+            estimate.spec, estimate.elo, estimate.lower, estimate.upper,
+            estimate.games, estimate.score))
+
+    ply_count = sum(len(x.moves) for x in game_records)
+    print("{} games, {} plies in {:.1f} s: {:.2f} games/s, {:.0f} plies/s"
+          .format(len(game_records), ply_count, seconds,
+                  len(game_records) / seconds, ply_count / seconds))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
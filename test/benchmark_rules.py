@@ -0,0 +1,226 @@
+"""Microbenchmarks of the rules hot paths, with a regression check.
+
+Run from the repository root with:
+    python test/benchmark_rules.py [--baseline PATH] [--threshold 0.25]
+
+Each benchmark is timed on fixed positions and the best time per call is
+compared with the baseline file. The run fails if any benchmark is more than
+threshold slower. A missing baseline is created from the run, and
+--update-baseline replaces an existing one.
+
+The directory is run as a script because the standard library's test
+package shadows it for python -m test.benchmark_rules.
+"""
+import argparse
+import functools
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+import random_play  # noqa: E402
+from rules.game_board import GameBoard  # noqa: E402
+from rules.piece import Piece  # noqa: E402
+
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(__file__),
+                                     "benchmark_rules_baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+
+def _play_random_moves(game_board, seed, placed_count):
+    """Play seeded random moves until placed_count pieces are placed."""
+
+    rng = random.Random(seed)
+    while len(game_board.get_placed_pieces()) < placed_count:
+        random_play.play_random_move(game_board, rng)
+    return game_board
+
+
+def _get_tall_stack_board():
+    """Get a board with both beetles of each color and a mosquito stacked
+    on the white bee."""
+
+    game_board = GameBoard()
+    pieces = [
+        (Piece.Creature.BEE, Piece.Color.WHITE, 0, 0, 0),
+        (Piece.Creature.BEE, Piece.Color.BLACK, 0, 1, 0),
+        (Piece.Creature.ANT, Piece.Color.WHITE, 0, -1, 0),
+        (Piece.Creature.ANT, Piece.Color.BLACK, 0, 2, 0),
+        (Piece.Creature.SPIDER, Piece.Color.WHITE, 0, -1, 1),
+        (Piece.Creature.SPIDER, Piece.Color.BLACK, 0, 2, -1),
+        (Piece.Creature.BEETLE, Piece.Color.WHITE, 0, 0, 0),
+        (Piece.Creature.BEETLE, Piece.Color.BLACK, 0, 0, 0),
+        (Piece.Creature.BEETLE, Piece.Color.WHITE, 1, 0, 0),
+        (Piece.Creature.BEETLE, Piece.Color.BLACK, 1, 0, 0),
+        (Piece.Creature.MOSQUITO, Piece.Color.WHITE, 0, 0, 0),
+        (Piece.Creature.GRASSHOPPER, Piece.Color.BLACK, 0, 1, 1),
+    ]
+    for creature, color, piece_number, q, r in pieces:
+        game_board.force_place(Piece(creature, color, piece_number, q, r))
+    return game_board
+
+
+def get_positions():
+    """Get a dict of position name to GameBoard, the same on every run."""
+
+    return {
+        "opening": _play_random_moves(GameBoard(), 1, 4),
+        "midgame": _play_random_moves(GameBoard(), 2, 12),
+        "endgame": _play_random_moves(GameBoard(), 3, 22),
+        "tall_stacks": _get_tall_stack_board(),
+    }
+
+
+def get_benchmarks(game_board):
+    """Get a dict of benchmark name to a function to time on game_board.
+    Move caches are cleared inside each function so that every call does
+    the full work."""
+
+    top_pieces = sorted(x for x in game_board.get_placed_pieces()
+                        if game_board.get_cell(x.q, x.r) is x)
+    turn_pieces = [x for x in top_pieces
+                   if x.color == game_board.player_turn]
+    coords = [(q, r)
+              for x in top_pieces
+              for q in range(x.q - 1, x.q + 2)
+              for r in range(x.r - 1, x.r + 2)]
+
+    def get_cell():
+        for q, r in coords:
+            game_board.get_cell(q, r)
+
+    def get_neighbors():
+        for piece in top_pieces:
+            list(piece.get_neighbors(game_board))
+
+    def can_move():
+        for piece in turn_pieces:
+            piece.can_move(game_board)
+
+    def get_moves():
+        game_board.get_move_cache().clear()
+        game_board.get_moves()
+
+    benchmarks = {
+        "HexGrid.get_cell": get_cell,
+        "HexCell.get_neighbors": get_neighbors,
+        "Piece.can_move": can_move,
+        "GameBoard.get_moves": get_moves,
+    }
+
+    unplaced_pieces = sorted(
+        game_board.get_unplaced_pieces(game_board.player_turn))
+    if unplaced_pieces:
+        benchmarks["Piece._get_placements"] = functools.partial(
+            unplaced_pieces[0]._get_placements, game_board)
+
+    for creature in Piece.Creature:
+        pieces = [x for x in top_pieces if x.creature == creature]
+        if pieces:
+            benchmarks["Piece.get_moves_" + creature.name] = \
+                _get_creature_benchmark(game_board, pieces, creature)
+
+    piece_moves = game_board.get_moves()
+    if piece_moves:
+        piece = min(piece_moves)
+        destination = min(piece_moves[piece], key=lambda x: (x.q, x.r))
+        move = piece.get_moved_absolute(destination.q, destination.r)
+
+        def place():
+            game_board.get_move_cache().clear()
+            game_board.copy().place(move.get_moved_absolute(move.q, move.r))
+
+        benchmarks["GameBoard.place"] = place
+
+    return benchmarks
+
+
+def _get_creature_benchmark(game_board, pieces, creature):
+    method_name = "get_moves_" + creature.name
+
+    def get_creature_moves():
+        game_board.get_move_cache().clear()
+        for piece in pieces:
+            getattr(piece, method_name)(game_board)
+
+    return get_creature_moves
+
+
+def run(repeat=5, min_time=0.05):
+    """Get a dict of "<position>/<benchmark>" to the best seconds per call,
+    timing repeat runs of at least min_time seconds each."""
+
+    results = {}
+    for position_name, game_board in get_positions().items():
+        for name, function in get_benchmarks(game_board).items():
+            timer = timeit.Timer(function)
+            number = 1
+            while timer.timeit(number) < min_time:
+                number *= 2
+            best = min(timer.repeat(repeat, number))
+            results[position_name + "/" + name] = best / number
+    return results
+
+
+def get_regressions(results, baseline, threshold):
+    """Get a dict of name to (baseline, result) seconds for the results more
+    than threshold slower than baseline. Names missing from either are
+    ignored."""
+
+    return {name: (baseline[name], seconds)
+            for name, seconds in sorted(results.items())
+            if name in baseline and
+            seconds > baseline[name] * (1 + threshold)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH,
+                        help="JSON file of baseline seconds per call")
+    parser.add_argument("--output",
+                        help="Also write this run's results to this file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown as a fraction of the baseline")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Replace the baseline with this run's results")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    if args.output:
+        _write_json(args.output, results)
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        _write_json(args.baseline, results)
+        print("Wrote baseline " + args.baseline)
+        return 0
+
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+
+    for name, seconds in sorted(results.items()):
+        change = ""
+        if name in baseline:
+            change = "{:+.1%}".format(seconds / baseline[name] - 1)
+        print("{:<45} {:>10.2f} us {:>8}".format(name, seconds * 1e6, change))
+
+    regressions = get_regressions(results, baseline, args.threshold)
+    for name, (baseline_seconds, seconds) in regressions.items():
+        print("Regression: {} {:.2f} us -> {:.2f} us".format(
+            name, baseline_seconds * 1e6, seconds * 1e6))
+    return 1 if regressions else 0
+
+
+def _write_json(path, results):
+    with open(path, "w") as json_file:
+        json.dump(results, json_file, indent=2, sort_keys=True)
+        json_file.write("\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,406 @@
+"""Differential fuzzing of GameBoard.get_moves against a reference.
+
+Run from the repository root with:
+    python test/fuzz_moves.py [--games 100] [--plies 60] [--seed 0]
+        [--creatures BEE,ANT,BEETLE] [--output-dir move_fuzz_failures]
+
+Every position of seeded random games from GameBoard() is checked against
+get_reference_moves, a slow generator written straight from the rules on a
+dict of stacks, which shares no code with rules.piece. A position where the
+two differ is shrunk by removing pieces for as long as they still differ,
+and saved as a JSON file with the GameBoard.to_json_object of the smallest
+position and the moves only one of the generators found. Exit status is 1
+if any position differed.
+
+The reference follows the rules as this repository plays them: spiders
+move to the cells exactly three slides away by the shortest route, a
+mosquito on top of the hive moves as a beetle, and a pillbug may throw any
+piece which could leave its cell, including one moved on the last turn.
+
+The directory is run as a script because the standard library's test
+package shadows it for python -m test.fuzz_moves.
+"""
+import argparse
+import collections
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+import random_play  # noqa: E402
+from rules.game_board import GameBoard  # noqa: E402
+from rules.piece import Piece  # noqa: E402
+
+
+# Neighbor offsets in order around a cell, so that the two cells next to
+# both a cell and its neighbor in _directions[i] are in _directions[i - 1]
+# and _directions[i + 1].
+_directions = [(1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1)]
+
+Mismatch = collections.namedtuple("Mismatch", ["missing", "extra", "error"])
+Mismatch.__doc__ = """How get_moves differed from get_reference_moves.
+
+missing - Moves only the reference found, as from get_reference_moves.
+extra - Moves only get_moves found.
+error - The repr of an exception raised by get_moves, or None.
+"""
+
+
+def _get_neighbors(coords):
+    q, r = coords
+    return [(q + dq, r + dr) for dq, dr in _directions]
+
+
+def _get_gates(start, end):
+    """Get the two cells next to both start and end."""
+
+    index = _directions.index((end[0] - start[0], end[1] - start[1]))
+    return [(start[0] + _directions[(index + x) % 6][0],
+             start[1] + _directions[(index + x) % 6][1])
+            for x in (-1, 1)]
+
+
+def _is_connected(stacks):
+    cells = set(stacks)
+    if not cells:
+        return False
+    seen = set()
+    unvisited = [next(iter(cells))]
+    while unvisited:
+        cell = unvisited.pop()
+        if cell in seen:
+            continue
+        seen.add(cell)
+        unvisited.extend(x for x in _get_neighbors(cell) if x in cells)
+    return seen == cells
+
+
+def _without(stacks, coords):
+    """Get stacks with the top piece at coords lifted off."""
+
+    stacks = dict(stacks)
+    if len(stacks[coords]) > 1:
+        stacks[coords] = stacks[coords][:-1]
+    else:
+        del stacks[coords]
+    return stacks
+
+
+def _can_slide(stacks, start, end):
+    """Check a piece on the ground can slide from start to end, keeping in
+    touch with the hive and not squeezing through a gate."""
+
+    return (end not in stacks and
+            sum(x in stacks for x in _get_gates(start, end)) == 1)
+
+
+def _can_climb(stacks, start, end):
+    """Check a piece at start can step to end, on or off the hive."""
+
+    height = [len(stacks.get(x, ())) for x in [start, end] +
+              _get_gates(start, end)]
+    if not height[0] and not height[1]:
+        return _can_slide(stacks, start, end)
+    return min(height[2:]) <= max(height[:2])
+
+
+def _get_slides(stacks, start, steps=None):
+    """Get the distance in slides from start of every cell reachable by
+    sliding, up to steps slides."""
+
+    distances = {start: 0}
+    layer = [start]
+    while layer and (steps is None or distances[layer[0]] < steps):
+        next_layer = []
+        for cell in layer:
+            for neighbor in _get_neighbors(cell):
+                if neighbor not in distances and \
+                        _can_slide(stacks, cell, neighbor):
+                    distances[neighbor] = distances[cell] + 1
+                    next_layer.append(neighbor)
+        layer = next_layer
+    return distances
+
+
+def _get_piece_moves(stacks, coords, creature):
+    """Get the cells the top piece at coords can move to like creature."""
+
+    rest = _without(stacks, coords)
+    if creature in (Piece.Creature.BEE, Piece.Creature.PILLBUG):
+        return {x for x in _get_neighbors(coords)
+                if _can_slide(rest, coords, x)}
+    if creature == Piece.Creature.BEETLE:
+        return {x for x in _get_neighbors(coords)
+                if _can_climb(rest, coords, x)}
+    if creature == Piece.Creature.SPIDER:
+        return {x for x, distance in _get_slides(rest, coords, 3).items()
+                if distance == 3}
+    if creature == Piece.Creature.ANT:
+        return set(_get_slides(rest, coords)) - {coords}
+    if creature == Piece.Creature.GRASSHOPPER:
+        moves = set()
+        for dq, dr in _directions:
+            cell = (coords[0] + dq, coords[1] + dr)
+            if cell not in rest:
+                continue
+            while cell in rest:
+                cell = (cell[0] + dq, cell[1] + dr)
+            moves.add(cell)
+        return moves
+    if creature == Piece.Creature.LADYBUG:
+        cells = {coords}
+        for _ in range(2):
+            cells = {y for x in cells for y in _get_neighbors(x)
+                     if y in rest and _can_climb(rest, x, y)}
+        return {y for x in cells for y in _get_neighbors(x)
+                if y not in rest and y != coords and _can_climb(rest, x, y)}
+
+    # A mosquito.
+    if len(stacks[coords]) > 1:
+        return _get_piece_moves(stacks, coords, Piece.Creature.BEETLE)
+    moves = set()
+    for neighbor in _get_neighbors(coords):
+        if neighbor in stacks:
+            mimicked = stacks[neighbor][-1][1]
+            if mimicked != Piece.Creature.MOSQUITO:
+                moves |= _get_piece_moves(stacks, coords, mimicked)
+    return moves
+
+
+def _get_throws(stacks, coords):
+    """Get (piece, destination) of each throw of the pillbug, or mosquito
+    next to one, at coords."""
+
+    if len(stacks[coords]) > 1:
+        return set()
+    neighbors = [x for x in _get_neighbors(coords) if x in stacks]
+    creature = stacks[coords][-1][1]
+    if creature != Piece.Creature.PILLBUG and not (
+            creature == Piece.Creature.MOSQUITO and
+            any(stacks[x][-1][1] == Piece.Creature.PILLBUG
+                for x in neighbors)):
+        return set()
+
+    throws = set()
+    for start in neighbors:
+        rest = _without(stacks, start)
+        if len(stacks[start]) > 1 or not _is_connected(rest):
+            continue
+        if not _can_climb(rest, start, coords):
+            continue
+        for end in _get_neighbors(coords):
+            if end not in stacks and _can_climb(rest, coords, end):
+                throws.add((stacks[start][-1], end))
+    return throws
+
+
+def get_reference_moves(json_object):
+    """Get every move of the GameBoard.to_json_object json_object, as a set
+    of (color, creature, piece_number, q, r) of the piece and where it
+    goes."""
+
+    stacks = collections.defaultdict(list)
+    unplaced = []
+    for json_piece_object in sorted(json_object["pieces"],
+                                    key=lambda x: x.get("level", 0)):
+        piece = (Piece.Color[json_piece_object["color"]],
+                 Piece.Creature[json_piece_object["creature"]],
+                 json_piece_object["piece_number"])
+        q, r = json_piece_object["q"], json_piece_object["r"]
+        if q == q:  # Not NaN.
+            stacks[(q, r)].append(piece)
+        else:
+            unplaced.append(piece)
+    stacks = dict(stacks)
+    color = Piece.Color[json_object["player_turn"]]
+
+    moves = set()
+    own_placed = [x for stack in stacks.values() for x in stack
+                  if x[0] == color]
+
+    # Placements of the lowest numbered piece of each creature in hand.
+    if not stacks:
+        cells = {(0, 0)}
+    elif not own_placed:
+        cells = {y for x in stacks for y in _get_neighbors(x)} - set(stacks)
+    else:
+        cells = {y for x in stacks for y in _get_neighbors(x)
+                 if y not in stacks and
+                 any(z in stacks for z in _get_neighbors(y)) and
+                 all(stacks[z][-1][0] == color for z in _get_neighbors(y)
+                     if z in stacks)}
+    bee_placed = any(x[1] == Piece.Creature.BEE for x in own_placed)
+    in_hand = {}
+    for piece in unplaced:
+        if piece[0] == color and (bee_placed or len(own_placed) < 3 or
+                                  piece[1] == Piece.Creature.BEE):
+            in_hand[piece[1]] = min(piece, in_hand.get(piece[1], piece))
+    moves.update(piece + cell for piece in in_hand.values()
+                 for cell in cells)
+
+    # Moves and throws, once the bee is placed.
+    if not bee_placed:
+        return moves
+    for coords, stack in stacks.items():
+        if stack[-1][0] != color:
+            continue
+        if len(stack) > 1 or _is_connected(_without(stacks, coords)):
+            moves.update(stack[-1] + x for x in _get_piece_moves(
+                stacks, coords, stack[-1][1]))
+        moves.update(piece + cell
+                     for piece, cell in _get_throws(stacks, coords))
+    return moves
+
+
+def get_moves(json_object):
+    """Get the moves of GameBoard.get_moves in the form of
+    get_reference_moves."""
+
+    game_board = GameBoard(json_object)
+    return {(piece.color, piece.creature, piece.piece_number, x.q, x.r)
+            for piece, destinations in game_board.get_moves().items()
+            for x in destinations}
+
+
+def get_mismatch(json_object):
+    """Get the Mismatch of json_object, or None if the moves agree."""
+
+    reference_moves = get_reference_moves(json_object)
+    try:
+        moves = get_moves(json_object)
+    except Exception as exception:
+        return Mismatch(reference_moves, set(), repr(exception))
+    if moves == reference_moves:
+        return None
+    return Mismatch(reference_moves - moves, moves - reference_moves, None)
+
+
+def get_positions(seed, plies, creatures=None):
+    """Yield the to_json_object of each position of a seeded random game of
+    up to plies plies, starting from GameBoard().
+
+    If creatures is given, only those creatures and the bees are played
+    with."""
+
+    json_object = GameBoard().to_json_object()
+    if creatures is not None:
+        names = {x.name for x in creatures} | {Piece.Creature.BEE.name}
+        json_object["pieces"] = [x for x in json_object["pieces"]
+                                 if x["creature"] in names]
+    game_board = GameBoard(json_object)
+
+    rng = random.Random(seed)
+    for _ in range(plies):
+        yield game_board.to_json_object()
+        if game_board.get_result() is not None:
+            return
+
+        random_play.play_random_move(game_board, rng)
+
+
+def _get_smaller_positions(json_object):
+    """Yield json_object with a piece in hand or the top piece of a stack
+    taken away, keeping the hive in one piece."""
+
+    pieces = json_object["pieces"]
+    stacks = collections.defaultdict(list)
+    for index, json_piece_object in enumerate(pieces):
+        q = json_piece_object["q"]
+        if q == q:
+            stacks[(q, json_piece_object["r"])].append(
+                (json_piece_object.get("level", 0), index))
+        else:
+            yield dict(json_object, pieces=pieces[:index] + pieces[index + 1:])
+
+    for coords, leveled_indexes in stacks.items():
+        _, index = max(leveled_indexes)
+        if len(leveled_indexes) == 1 and not _is_connected(
+                {x: None for x in stacks if x != coords}):
+            continue
+        yield dict(json_object, pieces=pieces[:index] + pieces[index + 1:])
+
+
+def shrink(json_object):
+    """Get the smallest position found by taking pieces away from
+    json_object while get_mismatch still finds a Mismatch."""
+
+    shrunk = True
+    while shrunk:
+        shrunk = False
+        for smaller in _get_smaller_positions(json_object):
+            if get_mismatch(smaller) is not None:
+                json_object = smaller
+                shrunk = True
+                break
+    return json_object
+
+
+def _move_to_json(move):
+    color, creature, piece_number, q, r = move
+    return [color.name, creature.name, piece_number, q, r]
+
+
+def write_mismatch(path, json_object, seed, ply):
+    """Write the position json_object, with its Mismatch, to path."""
+
+    mismatch = get_mismatch(json_object)
+    with open(path, "w") as json_file:
+        json.dump({
+            "seed": seed,
+            "ply": ply,
+            "position": json_object,
+            "missing": sorted(_move_to_json(x) for x in mismatch.missing),
+            "extra": sorted(_move_to_json(x) for x in mismatch.extra),
+            "error": mismatch.error,
+        }, json_file, indent=2)
+
+
+def _parse_creatures(text):
+    try:
+        return [Piece.Creature[x.strip().upper()] for x in text.split(",")]
+    except KeyError as error:
+        raise argparse.ArgumentTypeError("Not a creature: " + str(error))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--plies", type=int, default=60,
+                        help="Positions checked per game")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Seed of the first game, counting up")
+    parser.add_argument("--creatures", type=_parse_creatures,
+                        help="Comma separated creatures to play with, "
+                        "by default all")
+    parser.add_argument("--output-dir", default="move_fuzz_failures",
+                        help="Directory to write shrunk positions to")
+    args = parser.parse_args(argv)
+
+    position_count = 0
+    failure_count = 0
+    for seed in range(args.seed, args.seed + args.games):
+        for ply, json_object in enumerate(
+                get_positions(seed, args.plies, args.creatures)):
+            position_count += 1
+            if get_mismatch(json_object) is None:
+                continue
+
+            failure_count += 1
+            os.makedirs(args.output_dir, exist_ok=True)
+            path = os.path.join(args.output_dir,
+                                "seed{}_ply{}.json".format(seed, ply))
+            write_mismatch(path, shrink(json_object), seed, ply)
+            print("Mismatch at seed {}, ply {}: wrote {}".format(
+                seed, ply, path))
+            break  # Later positions of the game likely differ the same way.
+
+    print("Checked {} positions of {} games, {} mismatches".format(
+        position_count, args.games, failure_count))
+    return 1 if failure_count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
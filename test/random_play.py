@@ -0,0 +1,49 @@
+"""Seeded random play, shared by the tests and the scripts in test/.
+
+Moves are chosen from the sorted pieces of GameBoard.get_moves and their
+destinations sorted by (q, r), so a seed plays the same game on every run.
+"""
+import random
+from rules.game_board import GameBoard
+
+
+def get_random_move(game_board, rng):
+    """Get a move of game_board chosen with the random.Random rng, or None
+    if player_turn has to pass."""
+
+    piece_moves = game_board.get_moves()
+    if not piece_moves:
+        return None
+    piece = rng.choice(sorted(piece_moves.keys()))
+    destination = rng.choice(
+        sorted(piece_moves[piece], key=lambda x: (x.q, x.r)))
+    return piece.get_moved_absolute(destination.q, destination.r)
+
+
+def play_random_move(game_board, rng):
+    """Play get_random_move on game_board, or pass if it is None, and
+    return it."""
+
+    move = get_random_move(game_board, rng)
+    if move is None:
+        game_board.pass_turn()
+    else:
+        game_board.place(move)
+    return move
+
+
+def get_random_boards(seed, count, max_moves):
+    """Get a list of count boards, each played from GameBoard() for 1 to
+    max_moves - 1 random moves, or until a player has to pass."""
+
+    rng = random.Random(seed)
+    game_boards = []
+    for _ in range(count):
+        game_board = GameBoard()
+        for _ in range(rng.randrange(1, max_moves)):
+            move = get_random_move(game_board, rng)
+            if move is None:
+                break
+            game_board.place(move)
+        game_boards.append(game_board)
+    return game_boards
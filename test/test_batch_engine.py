@@ -0,0 +1,110 @@
+import unittest
+import numpy
+from evaluation import batch_engine
+from evaluation import features
+from rules.piece import Piece
+
+
+class BatchEngineTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = batch_engine.BatchEngine.new_games(8)
+        self.rng = numpy.random.default_rng(3)
+
+    def get_move_sets(self, moves):
+        slots = features.get_piece_slots()
+        move_sets = [set() for _ in range(len(self.engine))]
+        for game_index, slot_index, q, r in zip(
+                moves.game_indices, moves.slot_indices, moves.q, moves.r):
+            color, creature, piece_number = slots[slot_index]
+            move_sets[game_index].add(
+                (color, creature, piece_number, int(q), int(r)))
+        return move_sets
+
+    def get_game_board_move_set(self, game_board):
+        return {(piece.color, piece.creature, piece.piece_number, x.q, x.r)
+                for piece, destinations in game_board.get_moves().items()
+                for x in destinations}
+
+    def get_position(self, game_board):
+        stacks = {
+            (x.q, x.r): tuple((y.color, y.creature, y.piece_number)
+                              for y in game_board.get_stack(x.q, x.r))
+            for x in game_board.get_placed_pieces()}
+        return sorted(stacks.items()), game_board.player_turn
+
+    def test_matches_game_board(self):
+        for ply in range(40):
+            moves = self.engine.get_moves()
+            move_sets = self.get_move_sets(moves)
+            game_boards = self.engine.to_game_boards()
+
+            for game_index, game_board in enumerate(game_boards):
+                if self.engine.results[game_index] != batch_engine.ONGOING:
+                    self.assertEqual(moves.counts[game_index], 0)
+                    continue
+
+                with self.subTest(ply=ply, game_index=game_index):
+                    self.assertEqual(
+                        move_sets[game_index],
+                        self.get_game_board_move_set(game_board))
+
+            ongoing = self.engine.results == batch_engine.ONGOING
+            move_indices = self.engine.get_random_move_indices(
+                moves, self.rng)
+            self.engine.step(moves, move_indices)
+
+            # Applying the move to a GameBoard gives the same position.
+            for game_index, game_board in enumerate(game_boards):
+                move_index = move_indices[game_index]
+                if not ongoing[game_index]:
+                    continue
+                if move_index < 0:
+                    game_board.player_turn = game_board.opposite_color()
+                    continue
+
+                slot = features.get_piece_slots()[
+                    moves.slot_indices[move_index]]
+                piece = next(x for x in game_board.get_pieces()
+                             if (x.color, x.creature, x.piece_number) == slot)
+                game_board.place(piece.get_moved_absolute(
+                    int(moves.q[move_index]), int(moves.r[move_index])))
+
+            for game_index, game_board in enumerate(
+                    self.engine.to_game_boards()):
+                with self.subTest(ply=ply, game_index=game_index):
+                    self.assertEqual(
+                        self.get_position(game_board),
+                        self.get_position(game_boards[game_index]))
+
+    def test_pass(self):
+        game_boards = self.engine.to_game_boards()[:1]
+        engine = batch_engine.BatchEngine(game_boards)
+        moves = engine.get_moves()
+        engine.step(moves, [-1])
+
+        self.assertEqual(engine.state["player_turn"][0], Piece.Color.BLACK)
+        self.assertFalse(engine.state["placed"].any())
+
+    def test_results(self):
+        for _ in range(200):
+            self.engine.step_random(self.rng)
+
+        for game_index, game_board in enumerate(
+                self.engine.to_game_boards()):
+            surrounded = []
+            for color in Piece.Color:
+                bees = [x for x in game_board.get_placed_pieces(color)
+                        if x.creature == Piece.Creature.BEE]
+                surrounded.append(bool(bees) and all(
+                    Piece.is_piece(x)
+                    for x in bees[0].get_neighbors(game_board)))
+
+            result = self.engine.results[game_index]
+            with self.subTest(game_index=game_index):
+                if result == batch_engine.ONGOING:
+                    self.assertFalse(any(surrounded))
+                elif result == batch_engine.DRAW:
+                    self.assertTrue(all(surrounded))
+                else:
+                    self.assertTrue(surrounded[1 - result])
@@ -0,0 +1,38 @@
+import unittest
+import benchmark_rules
+from rules.piece import Piece
+
+
+class BenchmarkRulesTestCase(unittest.TestCase):
+
+    def test_positions(self):
+        positions = benchmark_rules.get_positions()
+
+        self.assertEqual(len(positions["endgame"].get_placed_pieces()), 22)
+        self.assertEqual(positions["tall_stacks"].get_stack_height(0, 0), 6)
+
+    def test_benchmarks(self):
+        positions = benchmark_rules.get_positions()
+        benchmarks = benchmark_rules.get_benchmarks(positions["endgame"])
+
+        for name in ("HexGrid.get_cell", "HexCell.get_neighbors",
+                     "Piece.can_move", "Piece._get_placements",
+                     "GameBoard.get_moves", "GameBoard.place"):
+            self.assertIn(name, benchmarks)
+        for function in benchmarks.values():
+            function()
+
+        game_board = positions["endgame"]
+        creatures = {x.creature for x in game_board.get_placed_pieces()
+                     if game_board.get_cell(x.q, x.r) is x}
+        self.assertEqual(
+            {x for x in benchmarks if x.startswith("Piece.get_moves_")},
+            {"Piece.get_moves_" + Piece.Creature(x).name for x in creatures})
+
+    def test_get_regressions(self):
+        baseline = {"a": 1.0, "b": 1.0, "c": 1.0}
+        results = {"a": 1.2, "b": 1.3, "d": 5.0}
+
+        self.assertEqual(
+            benchmark_rules.get_regressions(results, baseline, 0.25),
+            {"b": (1.0, 1.3)})
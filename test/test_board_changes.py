@@ -0,0 +1,84 @@
+import json
+import random
+import unittest
+import random_play
+from rules.board_changes import ClientBoard
+from rules.game_board import GameBoard
+from rules.piece import Piece
+
+
+class BoardChangesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.game_board = GameBoard()
+        self.game_board.start_change_log()
+        self.rng = random.Random(4)
+
+    def play_random_moves(self, move_count):
+        for _ in range(move_count):
+            random_play.play_random_move(self.game_board, self.rng)
+
+    def get_position(self, game_board):
+        stacks = {
+            (x.q, x.r): tuple(str(y) for y in game_board.get_stack(x.q, x.r))
+            for x in game_board.get_placed_pieces()}
+        return sorted(stacks.items()), game_board.player_turn
+
+    def test_changes(self):
+        self.play_random_moves(2)
+        changes = self.game_board.get_changes()
+
+        self.assertEqual(self.game_board.get_change_sequence(), 2)
+        self.assertEqual([x["sequence"] for x in changes], [1, 2])
+        self.assertEqual(changes[0]["from"], None)
+        self.assertEqual(changes[0]["to"], [0, 0])
+        self.assertEqual(changes[0]["level"], 0)
+        self.assertEqual(changes[0]["turn"], "BLACK")
+        self.assertEqual(changes[1]["turn"], "WHITE")
+        self.assertEqual(self.game_board.get_changes(1), changes[1:])
+
+    def test_client_board(self):
+        self.play_random_moves(10)
+        snapshot = json.loads(json.dumps(self.game_board.to_json_object()))
+        client_board = ClientBoard(snapshot)
+        self.assertEqual(client_board.sequence, 10)
+
+        for _ in range(6):
+            sequence = client_board.sequence
+            self.play_random_moves(10)
+            changes = json.loads(json.dumps(
+                self.game_board.get_changes(sequence)))
+            client_board.apply(changes)
+
+            self.assertEqual(client_board.sequence,
+                             self.game_board.get_change_sequence())
+            self.assertEqual(self.get_position(client_board.game_board),
+                             self.get_position(self.game_board))
+
+        # Applying changes again does nothing.
+        client_board.apply(self.game_board.get_changes())
+        self.assertEqual(self.get_position(client_board.game_board),
+                         self.get_position(self.game_board))
+
+    def test_missing_change(self):
+        client_board = ClientBoard(self.game_board.to_json_object())
+        self.play_random_moves(3)
+
+        with self.assertRaises(ValueError):
+            client_board.apply(self.game_board.get_changes(1))
+
+    def test_pass(self):
+        self.game_board.pass_turn()
+        change, = self.game_board.get_changes()
+
+        self.assertIsNone(change["piece"])
+        self.assertEqual(change["turn"], "BLACK")
+
+    def test_copy(self):
+        board_copy = self.game_board.copy()
+        board_copy.force_place(Piece(
+            Piece.Creature.BEE, Piece.Color.WHITE, 0, 0, 0))
+
+        self.assertEqual(self.game_board.get_changes(), [])
+        with self.assertRaises(ValueError):
+            board_copy.get_changes()
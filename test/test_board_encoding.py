@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+import numpy
+import random_play
+from evaluation import board_encoding
+from rules.game_board import GameBoard
+from rules.piece import Piece
+
+
+class BoardEncodingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.game_boards = [GameBoard()] + random_play.get_random_boards(
+            3, 10, 30)
+
+        # A stack of three, with the bee at the bottom.
+        stacked_game_board = GameBoard()
+        for creature, color, piece_number in (
+                (Piece.Creature.BEE, Piece.Color.WHITE, 0),
+                (Piece.Creature.BEETLE, Piece.Color.BLACK, 0),
+                (Piece.Creature.BEETLE, Piece.Color.WHITE, 1)):
+            stacked_game_board.force_place(
+                Piece(creature, color, piece_number, 3, -2))
+        stacked_game_board.force_place(
+            Piece(Piece.Creature.ANT, Piece.Color.BLACK, 0, 4, -2))
+        self.game_boards.append(stacked_game_board)
+
+    def test_shape(self):
+        array = board_encoding.encode(self.game_boards[1])
+        self.assertEqual(array.shape, board_encoding.get_shape())
+
+    def test_round_trip(self):
+        for i, game_board in enumerate(self.game_boards):
+            with self.subTest(i):
+                array = board_encoding.encode(game_board)
+                decoded = board_encoding.decode(array)
+                self.assertEqual(decoded.player_turn, game_board.player_turn)
+                self.assertEqual(len(decoded.get_placed_pieces()),
+                                 len(game_board.get_placed_pieces()))
+                numpy.testing.assert_array_equal(
+                    board_encoding.encode(decoded), array)
+
+    def test_stack_levels(self):
+        array = board_encoding.encode(self.game_boards[-1])
+        decoded = board_encoding.decode(array)
+
+        top = decoded.get_cell(0, 0)
+        self.assertEqual(top.creature, Piece.Creature.BEETLE)
+        self.assertEqual(top.color, Piece.Color.WHITE)
+        self.assertEqual(top.above.color, Piece.Color.BLACK)
+        self.assertEqual(top.above.above.creature, Piece.Creature.BEE)
+
+    def test_hand_planes(self):
+        array = board_encoding.encode(GameBoard())
+        hand_planes = array[-1 - 2 * len(Piece.Creature):-1, 0, 0]
+        expected = [GameBoard.get_piece_creature_counts()[x]
+                    for x in Piece.Creature] * 2
+        self.assertEqual(list(hand_planes), expected)
+
+    def test_npy(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "boards.npy")
+            out = board_encoding.create_npy(path, len(self.game_boards))
+            end = board_encoding.encode_game_boards(
+                iter(self.game_boards[:3]), out)
+            end = board_encoding.encode_game_boards(
+                self.game_boards[3:], out, end)
+            self.assertEqual(end, len(self.game_boards))
+            out.flush()
+            del out
+
+            loaded = numpy.load(path, mmap_mode="r")
+            for i, game_board in enumerate(self.game_boards):
+                with self.subTest(i):
+                    numpy.testing.assert_array_equal(
+                        loaded[i], board_encoding.encode(game_board))
+            del loaded
@@ -0,0 +1,66 @@
+import io
+import json
+import unittest
+import random_play
+from rules import bulk_load
+from rules.game_board import GameBoard
+from rules.piece import Piece
+
+
+class BulkLoadTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.game_boards = random_play.get_random_boards(6, 5, 40)
+        self.game_boards.append(self.get_stacked_board())
+
+    def get_stacked_board(self):
+        game_board = GameBoard()
+        for creature, color, piece_number in (
+                (Piece.Creature.BEE, Piece.Color.WHITE, 0),
+                (Piece.Creature.BEETLE, Piece.Color.BLACK, 0),
+                (Piece.Creature.BEETLE, Piece.Color.WHITE, 0),
+                (Piece.Creature.MOSQUITO, Piece.Color.BLACK, 0)):
+            game_board.force_place(Piece(creature, color, piece_number, 0, 0))
+        game_board.force_place(Piece(
+            Piece.Creature.BEE, Piece.Color.BLACK, 0, 1, 0))
+        return game_board
+
+    def get_position(self, game_board):
+        stacks = {}
+        for piece in game_board.get_placed_pieces():
+            stack = game_board.get_stack(piece.q, piece.r)
+            self.assertIs(game_board.get_cell(piece.q, piece.r), stack[-1])
+            self.assertEqual([x.above for x in stack[1:]], list(stack[:-1]))
+            stacks[(piece.q, piece.r)] = tuple(str(x) for x in stack)
+        unplaced = sorted(str(x) for x in game_board.get_unplaced_pieces())
+        return sorted(stacks.items()), unplaced, game_board.player_turn
+
+    def get_lines(self):
+        lines = io.StringIO()
+        bulk_load.write_json_lines(self.game_boards, lines)
+        lines.seek(0)
+        return lines
+
+    def test_load_json_lines(self):
+        for trusted in (True, False):
+            game_boards, report = bulk_load.load_json_lines(
+                self.get_lines(), trusted)
+            self.assertEqual(report.board_count, len(self.game_boards))
+            for game_board, expected in zip(game_boards, self.game_boards):
+                with self.subTest(trusted=trusted):
+                    self.assertEqual(self.get_position(game_board),
+                                     self.get_position(expected))
+                    self.assertEqual(game_board.get_moves().keys(),
+                                     expected.get_moves().keys())
+
+    def test_stack_order(self):
+        json_object = self.get_stacked_board().to_json_object()
+        json_object["pieces"].reverse()
+
+        expected = self.get_position(self.get_stacked_board())
+        self.assertEqual(
+            self.get_position(GameBoard.load_json_objects([json_object])[0]),
+            expected)
+        self.assertEqual(
+            self.get_position(GameBoard(json.loads(json.dumps(json_object)))),
+            expected)
@@ -2,7 +2,7 @@ import unittest
 from unittest.mock import patch
 from rules.game_board import GameBoard
 from rules.piece import Piece
-from console_client.console_client import ConsoleClient
+from console_client.console_client import ConsoleClient, play_game
 
 
 @patch("builtins.input")
@@ -32,6 +32,35 @@ class ConsoleClientInputTestCase(unittest.TestCase):
                     len(selections))
 
 
+class PlayGameTestCase(unittest.TestCase):
+
+    def test_pass(self):
+        # White can surround the black bee by moving the ant to 1,-1.
+        game_board = GameBoard()
+        pieces = [
+            (Piece.Creature.BEE, Piece.Color.BLACK, 0, 0, 0),
+            (Piece.Creature.BEE, Piece.Color.WHITE, 0, 1, 0),
+            (Piece.Creature.GRASSHOPPER, Piece.Color.WHITE, 0, 0, 1),
+            (Piece.Creature.GRASSHOPPER, Piece.Color.WHITE, 1, -1, 1),
+            (Piece.Creature.SPIDER, Piece.Color.BLACK, 0, -1, 0),
+            (Piece.Creature.SPIDER, Piece.Color.BLACK, 1, 0, -1),
+            (Piece.Creature.ANT, Piece.Color.WHITE, 0, 2, 0),
+            (Piece.Creature.ANT, Piece.Color.BLACK, 0, -2, 0),
+        ]
+        for creature, color, piece_number, q, r in pieces:
+            game_board.force_place(
+                Piece(creature, color, piece_number, q, r))
+        winning_move = Piece(
+            Piece.Creature.ANT, Piece.Color.WHITE, 0, 1, -1)
+
+        client = ConsoleClient(game_board)
+        with patch.object(client, "get_move",
+                          side_effect=[None, None, winning_move]):
+            # Passes don't end the game, only the surrounded bee does.
+            self.assertEqual(play_game(client), GameBoard.Result.WHITE_WON)
+        self.assertEqual(game_board.get_ply_count(), 3)
+
+
 class ConsoleClinetGameStateTestCase(unittest.TestCase):
 
     def setUp(self):
@@ -0,0 +1,98 @@
+import unittest
+import random_play
+from evaluation import features
+from rules.game_board import GameBoard
+from rules.piece import Piece
+
+
+class FeaturesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.game_boards = [GameBoard()] + random_play.get_random_boards(
+            5, 20, 30)
+
+        self.features = features.extract_features(self.game_boards)
+
+    def get_feature(self, board_index, name):
+        return self.features[board_index,
+                             features.FEATURE_NAMES.index(name)]
+
+    def test_shape(self):
+        self.assertEqual(self.features.shape,
+                         (len(self.game_boards), len(features.FEATURE_NAMES)))
+
+    def test_mobility(self):
+        for board_index, game_board in enumerate(self.game_boards):
+            for color in Piece.Color:
+                game_board_copy = game_board.copy()
+                game_board_copy.player_turn = color
+                movable_pieces = [
+                    x for x in game_board.get_placed_pieces(color)
+                    if not game_board.bee_is_unplaced(color) and
+                    game_board.get_cell(x.q, x.r) is x]
+
+                for creature in Piece.Creature:
+                    expected = sum(
+                        len(x.get_moves(game_board_copy))
+                        for x in movable_pieces if x.creature == creature)
+                    name = (color.name.lower() + "_mobility_" +
+                            creature.name.lower())
+                    with self.subTest(board_index=board_index, name=name):
+                        self.assertEqual(
+                            self.get_feature(board_index, name), expected)
+
+    def test_placements(self):
+        for board_index, game_board in enumerate(self.game_boards):
+            for color in Piece.Color:
+                game_board_copy = game_board.copy()
+                game_board_copy.player_turn = color
+                unplaced_pieces = list(
+                    game_board_copy.get_unplaced_pieces(color))
+
+                expected = 0
+                if unplaced_pieces:
+                    expected = len(set(
+                        unplaced_pieces[0].get_moves(game_board_copy)))
+                name = color.name.lower() + "_placements"
+                with self.subTest(board_index=board_index, name=name):
+                    self.assertEqual(
+                        self.get_feature(board_index, name), expected)
+
+    def test_pinned(self):
+        for board_index, game_board in enumerate(self.game_boards):
+            for color in Piece.Color:
+                game_board_copy = game_board.copy()
+                game_board_copy.player_turn = color
+                expected = sum(
+                    1 for x in game_board.get_placed_pieces(color)
+                    if len(game_board.get_placed_pieces()) > 1 and
+                    not x.can_move(game_board_copy))
+                name = color.name.lower() + "_pinned"
+                with self.subTest(board_index=board_index, name=name):
+                    self.assertEqual(
+                        self.get_feature(board_index, name), expected)
+
+    def test_empty_board(self):
+        for color in ("white", "black"):
+            self.assertEqual(
+                self.get_feature(0, color + "_in_hand"),
+                sum(GameBoard.get_piece_creature_counts().values()))
+            self.assertEqual(self.get_feature(0, color + "_placements"), 1)
+            self.assertEqual(self.get_feature(0, color + "_bee_liberties"), 6)
+            self.assertEqual(
+                self.get_feature(0, color + "_enemy_bee_distance"), 0)
+
+    def test_bee_liberties(self):
+        for board_index, game_board in enumerate(self.game_boards):
+            for color in Piece.Color:
+                bees = [x for x in game_board.get_placed_pieces(color)
+                        if x.creature == Piece.Creature.BEE]
+                expected = 6
+                if bees:
+                    expected = sum(
+                        1 for x in bees[0].get_neighbors(game_board)
+                        if not Piece.is_piece(x))
+                name = color.name.lower() + "_bee_liberties"
+                with self.subTest(board_index=board_index, name=name):
+                    self.assertEqual(
+                        self.get_feature(board_index, name), expected)
@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import fuzz_moves
+from rules.game_board import GameBoard
+from rules.piece import Piece
+
+
+class FuzzMovesTestCase(unittest.TestCase):
+
+    def test_agree(self):
+        for seed, creatures in [
+                (0, None),
+                (1, [Piece.Creature.PILLBUG, Piece.Creature.MOSQUITO,
+                     Piece.Creature.BEETLE, Piece.Creature.LADYBUG])]:
+            for json_object in fuzz_moves.get_positions(seed, 40, creatures):
+                self.assertIsNone(fuzz_moves.get_mismatch(json_object))
+
+    def test_creatures(self):
+        json_object = next(fuzz_moves.get_positions(
+            0, 1, [Piece.Creature.ANT]))
+        self.assertEqual({x["creature"] for x in json_object["pieces"]},
+                         {"BEE", "ANT"})
+        self.assertEqual(len(json_object["pieces"]), 8)
+
+    def test_reference_moves(self):
+        game_board = GameBoard()
+        for creature, color, q, r in [
+                (Piece.Creature.BEE, Piece.Color.WHITE, 0, 0),
+                (Piece.Creature.BEE, Piece.Color.BLACK, 1, 0),
+                (Piece.Creature.GRASSHOPPER, Piece.Color.WHITE, -1, 0)]:
+            game_board.force_place(Piece(creature, color, 0, q, r))
+
+        moves = fuzz_moves.get_reference_moves(game_board.to_json_object())
+        self.assertIn((Piece.Color.WHITE, Piece.Creature.GRASSHOPPER, 0,
+                       2, 0), moves)
+        self.assertIn((Piece.Color.WHITE, Piece.Creature.GRASSHOPPER, 1,
+                       -2, 0), moves)
+        self.assertNotIn((Piece.Color.WHITE, Piece.Creature.GRASSHOPPER, 2,
+                          -2, 0), moves)
+        self.assertEqual(moves, fuzz_moves.get_moves(
+            game_board.to_json_object()))
+
+    @patch.object(Piece, "get_moves_GRASSHOPPER", return_value=set())
+    def test_shrink(self, get_moves_magic_mock):
+        for json_object in fuzz_moves.get_positions(2, 60):
+            mismatch = fuzz_moves.get_mismatch(json_object)
+            if mismatch is not None:
+                break
+        self.assertIsNotNone(mismatch)
+        self.assertFalse(mismatch.extra)
+
+        shrunk = fuzz_moves.shrink(json_object)
+        self.assertLess(len(shrunk["pieces"]), len(json_object["pieces"]))
+        self.assertEqual(
+            {x[1] for x in fuzz_moves.get_mismatch(shrunk).missing},
+            {Piece.Creature.GRASSHOPPER})
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "mismatch.json")
+            fuzz_moves.write_mismatch(path, shrunk, 2, 10)
+            with open(path) as json_file:
+                saved = json.load(json_file)
+        self.assertEqual(len(saved["position"]["pieces"]),
+                         len(shrunk["pieces"]))
+        self.assertEqual(saved["missing"][0][1], "GRASSHOPPER")
+        self.assertEqual(saved["extra"], [])
+        GameBoard(saved["position"]).get_moves()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -156,6 +156,35 @@ class GameBoardTestCase(unittest.TestCase):
         self.assertIs(beetle_off_of_hive, self.game_board.get_cell(
             beetle_off_of_hive.q, beetle_off_of_hive.r))
 
+    def test_stack_index(self):
+        beetle_on_top_of_hive = Piece(
+            Piece.Creature.BEETLE,
+            Piece.Color.WHITE,
+            0,
+            -1, 0)
+        beetle_off_of_hive = Piece(
+            Piece.Creature.BEETLE,
+            Piece.Color.WHITE,
+            0,
+            -1, -1)
+
+        self.game_board.force_place(beetle_on_top_of_hive)
+        self.assertEqual(self.game_board.get_stack_height(-1, 0), 2)
+        self.assertEqual(self.game_board.get_stack(-1, 0),
+                         (self.black_beetle_0, beetle_on_top_of_hive))
+
+        self.game_board.force_place(beetle_off_of_hive)
+        self.assertEqual(self.game_board.get_stack(-1, 0),
+                         (self.black_beetle_0,))
+        self.assertEqual(self.game_board.get_stack_height(-1, -1), 1)
+        self.assertIsNone(beetle_off_of_hive.above)
+        self.assertEqual(self.game_board.get_stack_height(5, 5), 0)
+
+        stacks = self.game_board.get_stacks()
+        self.assertEqual(len(stacks), len(self.game_board.get_placed_pieces()))
+        for (q, r), stack in stacks.items():
+            self.assertEqual(stack, self.game_board.get_stack(q, r))
+
     def test_place_floating(self):
         floating_piece = Piece(
             Piece.Creature.BEETLE,
@@ -178,6 +207,135 @@ class GameBoardTestCase(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.game_board.place(invalid_placement)
 
+    def test_place_unknown_piece(self):
+        unknown_piece = Piece(
+            Piece.Creature.BEE,
+            Piece.Color.WHITE,
+            5,
+            0, 0)
+
+        with self.assertRaises(ValueError):
+            self.game_board.place(unknown_piece)
+
+    def test_place_move(self):
+        moved_ant = self.white_ant_1.get_moved_absolute(-2, -1)
+        self.game_board.place(moved_ant)
+
+        self.assertIs(moved_ant, self.game_board.get_cell(-2, -1))
+        self.assertIs(moved_ant, self.game_board.get_piece(moved_ant))
+        self.assertNotIn(self.white_ant_1,
+                         self.game_board.get_unplaced_pieces())
+        self.assertEqual(self.game_board.player_turn, Piece.Color.BLACK)
+
+    def test_pass_turn(self):
+        ply_count = self.game_board.get_ply_count()
+        self.game_board.pass_turn()
+
+        self.assertEqual(self.game_board.player_turn, Piece.Color.BLACK)
+        self.assertEqual(self.game_board.get_ply_count(), ply_count + 1)
+
+    def test_force_move(self):
+        # Black isn't on turn, so only force_move may move its ant.
+        new_piece = self.black_ant_1.get_moved_absolute(1, 1)
+        self.assertFalse(self.game_board.is_valid_move(new_piece))
+        ply_count = self.game_board.get_ply_count()
+        self.game_board.force_move(new_piece)
+
+        self.assertEqual(self.game_board.get_stack(1, 1), (new_piece,))
+        self.assertEqual(self.game_board.get_stack(-1, 2), ())
+        self.assertEqual(self.game_board.player_turn, Piece.Color.BLACK)
+        self.assertEqual(self.game_board.get_ply_count(), ply_count + 1)
+
+    def test_get_piece_creature_counts(self):
+        counts = GameBoard.get_piece_creature_counts()
+        self.assertEqual(counts[Piece.Creature.ANT], 3)
+        self.assertEqual(
+            len(self.game_board.get_pieces()),
+            sum(counts.values()) * len(Piece.Color))
+
+        counts[Piece.Creature.ANT] = 0  # Changing the copy is harmless.
+        self.assertEqual(
+            GameBoard.get_piece_creature_counts()[Piece.Creature.ANT], 3)
+
+    def test_is_valid_move(self):
+        for game_board in self._get_played_game_boards():
+            piece_moves = game_board.get_moves()
+            for piece in game_board.get_pieces():
+                moves = set(piece_moves.get(piece, ()))
+                for q in range(-5, 5):
+                    for r in range(-5, 5):
+                        new_piece = piece.get_moved_absolute(q, r)
+                        with self.subTest(new_piece=repr(new_piece)):
+                            self.assertEqual(
+                                game_board.get_cell(q, r) in moves,
+                                game_board.is_valid_move(new_piece))
+
+    def _get_played_game_boards(self):
+        yield self.game_board
+
+        game_board = GameBoard()
+        for _ in range(12):
+            piece_moves = game_board.get_moves()
+            piece = sorted(piece_moves.keys())[-1]
+            destination = sorted(piece_moves[piece],
+                                 key=lambda x: (x.q, x.r))[0]
+            game_board.place(piece.get_moved_absolute(
+                destination.q, destination.r))
+            yield game_board
+
+    def test_copy(self):
+        json_object = self.game_board.to_json_object()
+        board_copy = self.game_board.copy()
+        self.assertEqual(self.game_board, board_copy)
+
+        board_copy.place(self.white_ant_1.get_moved_absolute(-2, -1))
+        self.assertNotEqual(self.game_board, board_copy)
+        self.assertEqual(GameBoard(json_object), self.game_board)
+        self.assertIs(self.white_ant_1, self.game_board.get_cell(-3, 0))
+        self.assertEqual(self.white_ant_1.q, -3)
+
+        self.game_board.place(self.white_bee_0.get_moved_absolute(1, 0))
+        self.assertIs(board_copy.get_cell(1, -1),
+                      board_copy.get_piece(self.white_bee_0))
+        self.assertEqual(board_copy.player_turn, Piece.Color.BLACK)
+
+    def test_copy_move_placed_piece(self):
+        board_copy = self.game_board.copy()
+        unplaced_count = len(board_copy.get_unplaced_pieces())
+
+        board_copy.place(self.white_ant_1.get_moved_absolute(-2, -1))
+        self.assertEqual(len(board_copy.get_unplaced_pieces()),
+                         unplaced_count)
+        self.assertTrue(board_copy.get_piece(self.white_ant_1).is_placed())
+
+        # The ant is moved again, not placed from the hand.
+        board_copy.place(self.black_ant_1.get_moved_absolute(0, 2))
+        board_copy.place(self.white_ant_1.get_moved_absolute(-3, 0))
+        self.assertEqual(len(board_copy.get_unplaced_pieces()),
+                         unplaced_count)
+        self.assertEqual(len(self.game_board.get_unplaced_pieces()),
+                         unplaced_count)
+
+    def test_force_place_unplaced_pieces(self):
+        unplaced_count = len(self.game_board.get_unplaced_pieces())
+
+        # Moving a placed piece leaves the unplaced pieces as they were.
+        self.game_board.force_place(
+            self.white_ant_1.get_moved_absolute(-2, -1))
+        self.assertEqual(len(self.game_board.get_unplaced_pieces()),
+                         unplaced_count)
+        self.assertNotIn(self.white_ant_1,
+                         self.game_board.get_unplaced_pieces())
+
+        # Placing a piece only takes that piece out of them.
+        self.game_board.force_place(Piece(
+            Piece.Creature.ANT,
+            Piece.Color.WHITE,
+            2,
+            -3, 0))
+        self.assertEqual(len(self.game_board.get_unplaced_pieces()),
+                         unplaced_count - 1)
+
     def test_get_moves(self):
         available_moves = self.game_board.get_moves()
 
@@ -188,7 +346,7 @@ class GameBoardTestCase(unittest.TestCase):
                     list(available_moves[starting_piece]))
 
         self.assertNotIn(
-            self.game_board._get_piece(Piece(
+            self.game_board.get_piece(Piece(
                 Piece.Creature.GRASSHOPPER,
                 Piece.Color.WHITE,
                 2
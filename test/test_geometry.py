@@ -0,0 +1,94 @@
+import unittest
+from rules import geometry
+from rules.game_board import GameBoard
+from rules.hexcell import Direction, HexCell
+from rules.piece import Piece
+
+
+class GeometryTestCase(unittest.TestCase):
+
+    def test_distance(self):
+        far = 3 * geometry.WINDOW_RADIUS
+        for first, second in [
+                ((0, 0), (0, 0)),
+                ((1, -2), (-3, 5)),
+                ((geometry.WINDOW_RADIUS, 0), (-geometry.WINDOW_RADIUS, 0)),
+                ((0, -far), (far, 0)),
+                ((far, far), (-1, 2))]:
+            with self.subTest(first=first, second=second):
+                self.assertEqual(
+                    geometry.get_distance(first, second),
+                    HexCell(*first).get_distance(HexCell(*second)))
+
+        radius = 2 * geometry.WINDOW_RADIUS
+        for dq in range(-radius, radius + 1):
+            for dr in range(-radius, radius + 1):
+                self.assertEqual(
+                    geometry.get_distance((dq, dr), (0, 0)),
+                    max(abs(dq), abs(dr), abs(dq + dr)))
+
+    def test_ring(self):
+        far = (5 * geometry.WINDOW_RADIUS, 0)
+        for center in [(0, 0), (2, -3), far]:
+            self.assertEqual(geometry.get_ring(center, 0), (center,))
+            for radius in (1, 2, 5, geometry.WINDOW_RADIUS + 1):
+                ring = geometry.get_ring(center, radius)
+                self.assertEqual(len(ring), 6 * radius)
+                self.assertEqual(len(set(ring)), len(ring))
+                self.assertTrue(all(geometry.get_distance(center, x) ==
+                                    radius for x in ring))
+                # Neighbors follow each other around the ring.
+                for first, second in zip(ring, ring[1:] + ring[:1]):
+                    self.assertEqual(geometry.get_distance(first, second), 1)
+
+        self.assertEqual(geometry.get_ring((0, 0), 1)[0], (1, 0))
+        self.assertEqual(
+            [(q - far[0], r) for q, r in geometry.get_ring(far, 3)],
+            list(geometry.get_ring((0, 0), 3)))
+
+    def test_spiral(self):
+        for center in [(1, 1), (4 * geometry.WINDOW_RADIUS, 0)]:
+            spiral = geometry.get_spiral(center, 3)
+            self.assertEqual(len(spiral), 1 + 3 * 3 * 4)
+            self.assertEqual(len(set(spiral)), len(spiral))
+            self.assertEqual(spiral[0], center)
+            distances = [geometry.get_distance(center, x) for x in spiral]
+            self.assertEqual(distances, sorted(distances))
+
+    def test_line(self):
+        self.assertEqual(geometry.get_line((0, 0), Direction.Q_POS, 3),
+                         ((1, 0), (2, 0), (3, 0)))
+        start = (-2 * geometry.WINDOW_RADIUS, 1)
+        for direction in Direction:
+            line = geometry.get_line(start, direction, 4)
+            self.assertEqual(
+                [HexCell(*start).get_direction_to(HexCell(*x))
+                 for x in line], [direction] * 4)
+            self.assertEqual(
+                [geometry.get_distance(start, x) for x in line],
+                [1, 2, 3, 4])
+
+    def test_piece_distances(self):
+        game_board = GameBoard()
+        pieces = [
+            (Piece.Creature.BEE, Piece.Color.WHITE, 0, 0, 0),
+            (Piece.Creature.BEE, Piece.Color.BLACK, 0, 1, 0),
+            (Piece.Creature.BEETLE, Piece.Color.WHITE, 0, 1, 0),
+            (Piece.Creature.ANT, Piece.Color.BLACK, 0, 2, 0),
+        ]
+        for creature, color, piece_number, q, r in pieces:
+            game_board.force_place(
+                Piece(creature, color, piece_number, q, r))
+
+        distances = geometry.get_piece_distances(game_board, (0, 0))
+        self.assertEqual(len(distances), 4)
+        for piece, distance in distances.items():
+            self.assertEqual(distance, piece.get_distance(HexCell(0, 0)))
+
+        distances = geometry.get_piece_distances(
+            game_board, (0, 0), Piece.Color.BLACK)
+        self.assertEqual(sorted(distances.values()), [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
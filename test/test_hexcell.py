@@ -28,6 +28,13 @@ class HexCellTestCase(unittest.TestCase):
 
         self.assertEqual(first, second)
 
+    def test_nan_hash(self):
+        first = HexCell(math.nan, math.nan)
+        second = HexCell(math.nan, math.nan)
+
+        self.assertEqual(hash(first), hash(second))
+        self.assertIn(second, {first})
+
     def test_difference_zero(self):
         first = HexCell(0, 0)
         second = HexCell(0, 0)
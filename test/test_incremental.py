@@ -0,0 +1,107 @@
+import random
+import unittest
+from evaluation import features, incremental
+from evaluation.incremental import IncrementalEvaluator
+from rules.game_board import GameBoard
+from rules.piece import Piece
+from search import alpha_beta
+
+
+class IncrementalEvaluatorTestCase(unittest.TestCase):
+
+    def test_random_games(self):
+        rng = random.Random(11)
+        for game_index in range(6):
+            evaluator = IncrementalEvaluator(GameBoard())
+            for ply in range(60):
+                moves = alpha_beta.get_move_list(evaluator.game_board)
+                move = rng.choice(moves) if moves else None
+                evaluator.apply(move)
+                with self.subTest(game_index=game_index, ply=ply):
+                    self.assertEqual(
+                        evaluator.get_terms(),
+                        incremental.get_terms(evaluator.game_board))
+
+                # Take back some moves and play others.
+                if moves and rng.random() < 0.2:
+                    terms = evaluator.get_terms()
+                    evaluator.apply(rng.choice(moves))
+                    evaluator.undo()
+                    evaluator.undo()
+                    evaluator.apply(move)
+                    self.assertEqual(evaluator.get_terms(), terms)
+
+                if evaluator.game_board.get_result() is not None:
+                    break
+
+    def test_features(self):
+        rng = random.Random(5)
+        game_board = GameBoard()
+        for _ in range(40):
+            moves = alpha_beta.get_move_list(game_board)
+            game_board = alpha_beta.play(
+                game_board, rng.choice(moves) if moves else None)
+
+        terms = incremental.get_terms(game_board)
+        values = dict(zip(features.FEATURE_NAMES,
+                          features.extract_features([game_board])[0]))
+        for color in Piece.Color:
+            prefix = color.name.lower() + "_"
+            mobility = sum(values[prefix + "mobility_" + x.name.lower()]
+                           for x in Piece.Creature)
+            self.assertEqual(terms["mobility"][color], mobility)
+            for name in ("bee_liberties", "pinned", "in_hand"):
+                self.assertEqual(terms[name][color], values[prefix + name])
+
+    def test_evaluate(self):
+        evaluator = IncrementalEvaluator(GameBoard())
+        self.assertEqual(evaluator.evaluate(), 0)
+
+        evaluator.apply(Piece(Piece.Creature.BEE, Piece.Color.WHITE, 0,
+                              0, 0))
+        evaluator.apply(Piece(Piece.Creature.BEE, Piece.Color.BLACK, 0,
+                              1, 0))
+        evaluator.apply(Piece(Piece.Creature.BEETLE, Piece.Color.WHITE, 0,
+                              -1, 0))
+        evaluator.apply(Piece(Piece.Creature.ANT, Piece.Color.BLACK, 0,
+                              2, 0))
+        evaluator.apply(Piece(Piece.Creature.BEETLE, Piece.Color.WHITE, 0,
+                              0, 0))
+        terms = evaluator.get_terms()
+        self.assertEqual(terms["beetle_control"], [1, 0])
+        self.assertEqual(terms["pinned"], [1, 1])
+        self.assertEqual(terms["bee_liberties"], [5, 4])
+
+        evaluator.weights = {"beetle_control": 1.0}
+        self.assertEqual(evaluator.game_board.player_turn,
+                         Piece.Color.BLACK)
+        self.assertEqual(evaluator.evaluate(), -1.0)
+
+    def test_move_cache(self):
+        # Mobility is counted without filling the board's move cache.
+        evaluator = IncrementalEvaluator(GameBoard())
+        for creature, color, q, r in (
+                (Piece.Creature.BEE, Piece.Color.WHITE, 0, 0),
+                (Piece.Creature.BEE, Piece.Color.BLACK, 1, 0),
+                (Piece.Creature.ANT, Piece.Color.WHITE, -1, 0),
+                (Piece.Creature.SPIDER, Piece.Color.BLACK, 2, 0)):
+            evaluator.apply(Piece(creature, color, 0, q, r))
+            self.assertEqual(evaluator.game_board.get_move_cache(), {})
+        self.assertGreater(sum(evaluator.get_terms()["mobility"]), 0)
+
+    def test_undo(self):
+        game_board = GameBoard()
+        evaluator = IncrementalEvaluator(game_board)
+        with self.assertRaises(ValueError):
+            evaluator.undo()
+
+        evaluator.apply(Piece(Piece.Creature.ANT, Piece.Color.WHITE, 0,
+                              0, 0))
+        evaluator.undo()
+        self.assertEqual(evaluator.get_terms(),
+                         incremental.get_terms(GameBoard()))
+        self.assertFalse(list(game_board.get_placed_pieces()))
+
+
+if __name__ == '__main__':
+    unittest.main()
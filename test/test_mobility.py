@@ -0,0 +1,112 @@
+import random
+import unittest
+from evaluation import features
+from rules import mobility
+from rules.game_board import GameBoard
+from rules.piece import Piece
+from search import alpha_beta
+
+
+def _get_expected_counts(game_board):
+    """Count each piece's moves with Piece.get_moves, on a copy of
+    game_board with its color to move."""
+
+    counts = {}
+    for color in Piece.Color:
+        board_copy = game_board.copy()
+        board_copy.player_turn = color
+        if board_copy.bee_is_unplaced(color):
+            continue
+        for piece in board_copy.get_placed_pieces(color):
+            if board_copy.get_cell(piece.q, piece.r) is not piece:
+                continue
+            moves = piece.get_moves(board_copy)
+            if piece.can_move(board_copy):
+                counts[piece] = len(moves)
+    return counts
+
+
+class MobilityTestCase(unittest.TestCase):
+
+    def test_random_games(self):
+        rng = random.Random(3)
+        for game_index in range(6):
+            game_board = GameBoard()
+            for ply in range(50):
+                with self.subTest(game_index=game_index, ply=ply):
+                    self.assertEqual(
+                        mobility.get_piece_move_counts(game_board),
+                        _get_expected_counts(game_board))
+
+                moves = alpha_beta.get_move_list(game_board)
+                game_board = alpha_beta.play(
+                    game_board, rng.choice(moves) if moves else None)
+                if game_board.get_result() is not None:
+                    break
+
+    def test_features(self):
+        rng = random.Random(8)
+        game_board = GameBoard()
+        for _ in range(40):
+            moves = alpha_beta.get_move_list(game_board)
+            game_board = alpha_beta.play(
+                game_board, rng.choice(moves) if moves else None)
+
+        values = dict(zip(features.FEATURE_NAMES,
+                          features.extract_features([game_board])[0]))
+        creature_counts = mobility.get_creature_move_counts(game_board)
+        self.assertEqual(len(creature_counts), 16)
+        for (color, creature), count in creature_counts.items():
+            self.assertEqual(count, values["{}_mobility_{}".format(
+                color.name.lower(), creature.name.lower())])
+
+        color_counts = mobility.get_color_move_counts(game_board)
+        for color in Piece.Color:
+            self.assertEqual(
+                color_counts[color],
+                sum(x for (y, _), x in creature_counts.items()
+                    if y == color))
+
+    def test_stacks(self):
+        game_board = GameBoard()
+        pieces = [
+            (Piece.Creature.BEE, Piece.Color.WHITE, 0, 0, 0),
+            (Piece.Creature.BEE, Piece.Color.BLACK, 0, 1, 0),
+            (Piece.Creature.MOSQUITO, Piece.Color.WHITE, 0, 1, 0),
+            (Piece.Creature.ANT, Piece.Color.BLACK, 0, -1, 0),
+            (Piece.Creature.LADYBUG, Piece.Color.BLACK, 0, 2, -1),
+        ]
+        for creature, color, piece_number, q, r in pieces:
+            game_board.force_place(
+                Piece(creature, color, piece_number, q, r))
+        white_bee, black_bee, mosquito, ant, ladybug = (
+            game_board.get_stack(0, 0)[0], game_board.get_stack(1, 0)[0],
+            game_board.get_stack(1, 0)[1], game_board.get_stack(-1, 0)[0],
+            game_board.get_stack(2, -1)[0])
+
+        counts = mobility.get_piece_move_counts(game_board)
+        self.assertEqual(game_board.get_move_cache(), {})
+        self.assertEqual(counts, _get_expected_counts(game_board))
+        self.assertNotIn(black_bee, counts)  # Covered.
+        self.assertNotIn(white_bee, counts)  # Pinned.
+        self.assertEqual(counts[mosquito], 6)  # Moves as a beetle.
+        self.assertEqual(mobility.get_move_count(game_board, ant),
+                         counts[ant])
+        self.assertEqual(mobility.get_move_count(game_board, white_bee), 0)
+        self.assertEqual(
+            mobility.get_move_counts(game_board, [ant, white_bee]),
+            {ant: counts[ant]})
+        self.assertGreater(counts[ladybug], 0)
+
+    def test_bee_unplaced(self):
+        game_board = GameBoard()
+        game_board.force_place(
+            Piece(Piece.Creature.ANT, Piece.Color.WHITE, 0, 0, 0))
+        game_board.force_place(
+            Piece(Piece.Creature.BEE, Piece.Color.BLACK, 0, 1, 0))
+        # Only black, whose bee is placed, can move.
+        self.assertEqual(mobility.get_color_move_counts(game_board), [0, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import io
+import random
+import unittest
+import random_play
+from rules import notation
+from rules.game_board import GameBoard
+from rules.piece import Piece
+
+
+class NotationTestCase(unittest.TestCase):
+
+    def get_random_game(self, seed, move_count):
+        rng = random.Random(seed)
+        game_board = GameBoard()
+        moves = []
+        for _ in range(move_count):
+            move = random_play.get_random_move(game_board, rng)
+            moves.append(move)
+            notation.play_move(game_board, move)
+        return game_board, moves
+
+    def get_position(self, game_board):
+        stacks = {
+            (x.q, x.r): tuple(notation.piece_to_string(y)
+                              for y in game_board.get_stack(x.q, x.r))
+            for x in game_board.get_placed_pieces()}
+        return sorted(stacks.items()), game_board.player_turn
+
+    def test_piece(self):
+        for text in ("wQ", "bA3", "wS1", "bM", "wP"):
+            self.assertEqual(
+                notation.piece_to_string(notation.parse_piece(text)), text)
+
+        piece = notation.parse_piece("bG2")
+        self.assertEqual(
+            (piece.color, piece.creature, piece.piece_number),
+            (Piece.Color.BLACK, Piece.Creature.GRASSHOPPER, 1))
+
+        for text in ("wQ1", "wA", "wA4", "xA1", "wZ1"):
+            with self.assertRaises(ValueError):
+                notation.parse_piece(text)
+
+    def test_parse_move(self):
+        game_board = GameBoard()
+        move = notation.parse_move(game_board, "wS1")
+        self.assertEqual((move.q, move.r), (0, 0))
+        notation.play_move(game_board, move)
+
+        for text, coords in (("bS1 -wS1", (-1, 0)),
+                             ("bS1 wS1-", (1, 0)),
+                             ("bS1 \\wS1", (0, -1)),
+                             ("bS1 wS1/", (1, -1)),
+                             ("bS1 /wS1", (-1, 1)),
+                             ("bS1 wS1\\", (0, 1)),
+                             ("bB1 wS1", (0, 0))):
+            move = notation.parse_move(game_board, text)
+            with self.subTest(text=text):
+                self.assertEqual((move.q, move.r), coords)
+
+        self.assertIsNone(notation.parse_move(game_board, "pass"))
+        for text in ("bS1 -wS1-", "bS1 -wA1", "bS1", "bS1 +wS1"):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    notation.parse_move(game_board, text)
+
+    def test_round_trip(self):
+        games = [self.get_random_game(seed, 60) for seed in range(4)]
+
+        lines = io.StringIO()
+        notation.write_games((moves for _, moves in games), lines)
+        lines.seek(0)
+
+        read_games = list(notation.read_games(lines))
+        self.assertEqual(len(read_games), len(games))
+        for (game_board, _), (read_game_board, read_moves) in zip(
+                games, read_games):
+            self.assertEqual(self.get_position(read_game_board),
+                             self.get_position(game_board))
+            self.assertEqual(len(read_moves), 60)
+
+    def test_read_games(self):
+        lines = [
+            "# A comment",
+            "",
+            "Base+MLP;InProgress;White[3];wS1;bG1 -wS1;wQ wS1/;bQ /bG1",
+        ]
+        (game_board, moves), = notation.read_games(lines)
+
+        self.assertEqual(len(moves), 4)
+        self.assertEqual(game_board.player_turn, Piece.Color.WHITE)
+        self.assertEqual(
+            notation.piece_to_string(game_board.get_cell(-2, 1)), "bQ")
+
+        with self.assertRaisesRegex(ValueError, "Line 2"):
+            list(notation.read_games(["wS1;bS1 -wS1", "wS1;bS1 -wS1-"]))
+        with self.assertRaises(ValueError):
+            list(notation.read_games(["wS1;bS1 wS1-;wQ -bS1"]))
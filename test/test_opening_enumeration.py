@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+from rules.game_board import GameBoard
+from rules.piece import Piece
+from search import opening_enumeration
+
+
+def _get_board(pieces, player_turn=Piece.Color.WHITE):
+    game_board = GameBoard()
+    for creature, color, piece_number, q, r in pieces:
+        game_board.force_place(Piece(creature, color, piece_number, q, r))
+    game_board.player_turn = player_turn
+    return game_board
+
+
+class OpeningEnumerationTestCase(unittest.TestCase):
+
+    def test_canonical_key(self):
+        game_board = _get_board([
+            (Piece.Creature.BEE, Piece.Color.WHITE, 0, 0, 0),
+            (Piece.Creature.ANT, Piece.Color.BLACK, 0, 1, 0),
+            (Piece.Creature.BEETLE, Piece.Color.BLACK, 1, 1, 0),
+        ])
+        # Shifted, rotated and reflected, with other piece numbers.
+        other_board = _get_board([
+            (Piece.Creature.BEE, Piece.Color.WHITE, 0, 5, 5),
+            (Piece.Creature.ANT, Piece.Color.BLACK, 2, 5, 4),
+            (Piece.Creature.BEETLE, Piece.Color.BLACK, 0, 5, 4),
+        ])
+        key = opening_enumeration.get_canonical_key(game_board)
+        self.assertEqual(opening_enumeration.get_canonical_key(other_board),
+                         key)
+
+        other_board.player_turn = Piece.Color.BLACK
+        self.assertNotEqual(
+            opening_enumeration.get_canonical_key(other_board), key)
+
+        # Stacks keep their order.
+        stacked_board = _get_board([
+            (Piece.Creature.BEE, Piece.Color.WHITE, 0, 0, 0),
+            (Piece.Creature.BEETLE, Piece.Color.BLACK, 1, 1, 0),
+            (Piece.Creature.ANT, Piece.Color.BLACK, 0, 1, 0),
+        ])
+        self.assertNotEqual(
+            opening_enumeration.get_canonical_key(stacked_board), key)
+
+    def test_get_game_board(self):
+        game_board = _get_board([
+            (Piece.Creature.BEE, Piece.Color.WHITE, 0, 0, 0),
+            (Piece.Creature.ANT, Piece.Color.BLACK, 0, 1, 0),
+            (Piece.Creature.BEETLE, Piece.Color.BLACK, 1, 1, 0),
+            (Piece.Creature.ANT, Piece.Color.WHITE, 2, -1, 0),
+        ], Piece.Color.BLACK)
+        key = opening_enumeration.get_canonical_key(game_board)
+        loaded_board = opening_enumeration.get_game_board(key)
+        self.assertEqual(opening_enumeration.get_canonical_key(loaded_board),
+                         key)
+        self.assertEqual(loaded_board.player_turn, Piece.Color.BLACK)
+        self.assertEqual(len(loaded_board.get_placed_pieces()), 4)
+        self.assertEqual(len(loaded_board.get_moves()),
+                         len(game_board.get_moves()))
+
+    def test_enumerate_positions(self):
+        # Every first piece is alike wherever it goes, as is the second.
+        counts = opening_enumeration.enumerate_positions(3)
+        self.assertEqual(counts[:3], [1, 8, 64])
+
+        expected = [1]
+        seen = {opening_enumeration.get_canonical_key(GameBoard())}
+        frontier = set(seen)
+        for _ in range(3):
+            frontier = set().union(*(opening_enumeration.get_child_keys(x)
+                                     for x in frontier)) - seen
+            seen |= frontier
+            expected.append(len(frontier))
+        self.assertEqual(counts, expected)
+
+    def test_spill(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(
+                opening_enumeration.enumerate_positions(
+                    3, memory_limit=7, directory=directory),
+                opening_enumeration.enumerate_positions(3))
+            self.assertEqual(os.listdir(directory), [])
+
+        with self.assertRaises(ValueError):
+            opening_enumeration.enumerate_positions(3, memory_limit=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
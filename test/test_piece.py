@@ -120,6 +120,14 @@ class PieceMovementTestCase(unittest.TestCase):
 
         self.assert_move_coords(calculated_moves, expected_move_coords)
 
+    def test_bee_moves_reusable(self):
+        self.game_board.player_turn = Piece.Color.BLACK
+        calculated_moves = self.black_bee_0.get_moves(self.game_board)
+
+        self.assertEqual({(x.q, x.r) for x in calculated_moves},
+                         {(-3, 1), (-1, 1)})
+        self.assertEqual(len(calculated_moves), 2)
+
     def test_spider(self):
         white_spider_1 = Piece(
             Piece.Creature.SPIDER,
@@ -151,6 +159,60 @@ class PieceMovementTestCase(unittest.TestCase):
 
         self.assert_move_coords(calculated_moves, expected_move_coords)
 
+    def test_beetle_on_hive(self):
+        white_beetle_0 = Piece(
+            Piece.Creature.BEETLE,
+            Piece.Color.WHITE,
+            0,
+            -1, 0)
+        self.game_board.force_place(white_beetle_0)
+
+        calculated_moves = white_beetle_0.get_moves(self.game_board)
+        self.assertEqual(
+            {(x.q, x.r) for x in calculated_moves},
+            {(0, 0), (-1, 1), (-2, 1), (-2, 0), (-1, -1), (0, -1)})
+
+    def test_beetle_gate(self):
+        game_board = GameBoard()
+        for creature, color, piece_number, q, r in (
+                (Piece.Creature.BEE, Piece.Color.BLACK, 0, 1, -1),
+                (Piece.Creature.BEETLE, Piece.Color.BLACK, 0, 1, -1),
+                (Piece.Creature.BEE, Piece.Color.WHITE, 0, 0, 1),
+                (Piece.Creature.BEETLE, Piece.Color.BLACK, 1, 0, 1),
+                (Piece.Creature.ANT, Piece.Color.WHITE, 0, 1, 0)):
+            game_board.force_place(
+                Piece(creature, color, piece_number, q, r))
+
+        white_beetle_0 = Piece(
+            Piece.Creature.BEETLE,
+            Piece.Color.WHITE,
+            0,
+            0, 0)
+        game_board.force_place(white_beetle_0)
+
+        # Both sides of the gate to (1, 0) are two high.
+        destination = HexCell(1, 0)
+        self.assertNotIn(destination, white_beetle_0.get_moves(game_board))
+        self.assertFalse(
+            white_beetle_0.is_valid_move(game_board, destination))
+
+        game_board.force_place(Piece(
+            Piece.Creature.BEETLE, Piece.Color.WHITE, 1, 1, 0))
+        self.assertIn((1, 0), {(x.q, x.r) for x in
+                               white_beetle_0.get_moves(game_board)})
+        self.assertTrue(
+            white_beetle_0.is_valid_move(game_board, destination))
+
+    def test_covered_piece(self):
+        white_beetle_0 = Piece(
+            Piece.Creature.BEETLE,
+            Piece.Color.WHITE,
+            0,
+            0, 1)
+        self.game_board.force_place(white_beetle_0)
+        self.assertFalse(self.white_ant_0.can_move(self.game_board))
+        self.assertNotIn(self.white_ant_0, self.game_board.get_moves())
+
     def test_grasshopper(self):
         white_grasshopper_0 = Piece(
             Piece.Creature.GRASSHOPPER,
@@ -165,6 +227,20 @@ class PieceMovementTestCase(unittest.TestCase):
 
         self.assert_move_coords(calculated_moves, expected_move_coords)
 
+    def test_grasshopper_must_jump(self):
+        white_grasshopper_0 = Piece(
+            Piece.Creature.GRASSHOPPER,
+            Piece.Color.WHITE,
+            0,
+            -4, 0)
+        self.game_board.force_place(white_grasshopper_0)
+
+        # Only the jump over the row of pieces, not the empty neighbors.
+        self.assertEqual(
+            {(x.q, x.r)
+             for x in white_grasshopper_0.get_moves(self.game_board)},
+            {(1, 0)})
+
     def test_ant(self):
         calculated_moves = self.white_ant_1.get_moves(self.game_board)
 
@@ -310,3 +386,130 @@ class PieceIndependentTestCase(unittest.TestCase):
 
         self.assertLess(first, second)
         self.assertLess(second, third)
+
+
+class ExpansionPieceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # wB0 bB0, with white bee 0 (wB0) at 0,0. Tests add their piece.
+        self.game_board = GameBoard()
+        self.white_bee_0 = Piece(
+            Piece.Creature.BEE,
+            Piece.Color.WHITE,
+            0,
+            0, 0)
+        self.black_bee_0 = Piece(
+            Piece.Creature.BEE,
+            Piece.Color.BLACK,
+            0,
+            1, 0)
+        self.game_board.force_place(self.white_bee_0)
+        self.game_board.force_place(self.black_bee_0)
+
+    def get_coords(self, hex_cells):
+        return {(x.q, x.r) for x in hex_cells}
+
+    def test_ladybug(self):
+        white_ladybug_0 = Piece(
+            Piece.Creature.LADYBUG,
+            Piece.Color.WHITE,
+            0,
+            -1, 0)
+        self.game_board.force_place(white_ladybug_0)
+
+        self.assertEqual(
+            self.get_coords(white_ladybug_0.get_moves(self.game_board)),
+            {(2, 0), (1, 1), (2, -1), (1, -1), (0, 1)})
+        self.assertTrue(white_ladybug_0.is_valid_move(
+            self.game_board, HexCell(2, -1)))
+        self.assertFalse(white_ladybug_0.is_valid_move(
+            self.game_board, HexCell(-1, 1)))
+
+    def test_mosquito(self):
+        white_mosquito_0 = Piece(
+            Piece.Creature.MOSQUITO,
+            Piece.Color.WHITE,
+            0,
+            -1, 0)
+        self.game_board.force_place(white_mosquito_0)
+
+        # Only next to a bee.
+        self.assertEqual(
+            self.get_coords(white_mosquito_0.get_moves(self.game_board)),
+            {(-1, 1), (0, -1)})
+
+        white_beetle_0 = Piece(
+            Piece.Creature.BEETLE,
+            Piece.Color.WHITE,
+            0,
+            -1, 1)
+        self.game_board.force_place(white_beetle_0)
+
+        # Next to a bee and a beetle, so able to climb onto the hive.
+        moves = self.get_coords(white_mosquito_0.get_moves(self.game_board))
+        self.assertIn((0, 0), moves)
+        self.assertIn((-1, 1), moves)
+        self.assertTrue(white_mosquito_0.is_valid_move(
+            self.game_board, HexCell(0, 0)))
+
+    def test_mimicked_creatures(self):
+        creature = Piece.Creature
+        self.assertEqual(
+            Piece.get_mimicked_creatures(
+                [creature.BEE, creature.ANT, creature.SPIDER,
+                 creature.MOSQUITO, creature.BEETLE]),
+            {creature.ANT, creature.BEETLE})
+        self.assertEqual(
+            Piece.get_mimicked_creatures([creature.BEE, creature.PILLBUG]),
+            {creature.PILLBUG})
+
+    def test_pillbug_throw(self):
+        white_pillbug_0 = Piece(
+            Piece.Creature.PILLBUG,
+            Piece.Color.WHITE,
+            0,
+            -1, 0)
+        self.game_board.force_place(white_pillbug_0)
+
+        # The white bee can't be lifted without splitting the hive.
+        self.assertEqual(white_pillbug_0.get_throws(self.game_board), {})
+
+    def test_mosquito_throw_next_to_ant(self):
+        white_mosquito_0 = Piece(
+            Piece.Creature.MOSQUITO,
+            Piece.Color.WHITE,
+            0,
+            1, -1)
+        for piece in (
+                white_mosquito_0,
+                Piece(Piece.Creature.PILLBUG, Piece.Color.WHITE, 0, 2, -1),
+                Piece(Piece.Creature.ANT, Piece.Color.WHITE, 0, 1, -2)):
+            self.game_board.force_place(piece)
+
+        # Mimicking the ant drops the pillbug's moves, but not its ability.
+        throws = white_mosquito_0.get_throws(self.game_board)
+        self.assertIn(self.black_bee_0, throws)
+        self.assertTrue(white_mosquito_0.is_valid_throw(
+            self.game_board, self.black_bee_0, HexCell(0, -1)))
+
+    def test_pillbug_throw_enemy(self):
+        white_pillbug_0 = Piece(
+            Piece.Creature.PILLBUG,
+            Piece.Color.WHITE,
+            0,
+            1, -1)
+        self.game_board.force_place(white_pillbug_0)
+
+        throws = white_pillbug_0.get_throws(self.game_board)
+        self.assertEqual(set(throws.keys()),
+                         {self.white_bee_0, self.black_bee_0})
+        self.assertEqual(self.get_coords(throws[self.black_bee_0]),
+                         {(2, -1), (2, -2), (0, -1), (1, -2)})
+
+        thrown_bee = self.black_bee_0.get_moved_absolute(1, -2)
+        self.assertTrue(self.game_board.is_valid_move(thrown_bee))
+        self.assertIn(self.black_bee_0, self.game_board.get_moves())
+
+        self.game_board.place(thrown_bee)
+        self.assertIs(thrown_bee, self.game_board.get_cell(1, -2))
+        self.assertEqual(self.game_board.player_turn, Piece.Color.BLACK)
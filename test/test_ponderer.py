@@ -0,0 +1,93 @@
+import time
+import unittest
+from unittest.mock import patch
+from console_client.console_client import ConsoleClient
+from console_client.ponderer import Ponderer
+from rules.game_board import GameBoard
+from rules.piece import Piece
+from search import alpha_beta
+
+
+def _wait_for(condition, timeout=30):
+    end = time.time() + timeout
+    while not condition():
+        if time.time() > end:
+            raise AssertionError("Timed out")
+        time.sleep(0.01)
+
+
+class PondererTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # White can surround the black bee by moving the ant to 1,-1.
+        self.game_board = GameBoard()
+        pieces = [
+            (Piece.Creature.BEE, Piece.Color.BLACK, 0, 0, 0),
+            (Piece.Creature.BEE, Piece.Color.WHITE, 0, 1, 0),
+            (Piece.Creature.GRASSHOPPER, Piece.Color.WHITE, 0, 0, 1),
+            (Piece.Creature.GRASSHOPPER, Piece.Color.WHITE, 1, -1, 1),
+            (Piece.Creature.SPIDER, Piece.Color.BLACK, 0, -1, 0),
+            (Piece.Creature.SPIDER, Piece.Color.BLACK, 1, 0, -1),
+            (Piece.Creature.ANT, Piece.Color.WHITE, 0, 2, 0),
+            (Piece.Creature.ANT, Piece.Color.BLACK, 0, -2, 0),
+        ]
+        for creature, color, piece_number, q, r in pieces:
+            self.game_board.force_place(
+                Piece(creature, color, piece_number, q, r))
+        self.ponderer = Ponderer(max_depth=1)
+
+    def tearDown(self):
+        self.ponderer.stop()
+
+    def test_hint(self):
+        self.assertIsNone(self.ponderer.get_hint(self.game_board))
+        self.ponderer.start(self.game_board)
+        _wait_for(lambda: not self.ponderer.is_running())
+
+        hint = self.ponderer.get_hint(self.game_board)
+        self.assertEqual(alpha_beta.play(self.game_board, hint).get_result(),
+                         GameBoard.Result.WHITE_WON)
+        self.assertEqual(self.ponderer.get_result(self.game_board)[2], 1)
+
+    def test_replies(self):
+        self.game_board.player_turn = Piece.Color.BLACK
+        self.ponderer.start(self.game_board)
+        _wait_for(lambda: not self.ponderer.is_running())
+
+        # Every reply was searched, so the bot doesn't have to.
+        move = alpha_beta.get_move_list(self.game_board)[0]
+        self.game_board.place(move.get_moved_absolute(move.q, move.r))
+        with patch.object(alpha_beta, "get_best_move") as get_best_move:
+            reply = self.ponderer.get_move(self.game_board, 1)
+        get_best_move.assert_not_called()
+        self.assertIsNotNone(reply)
+        self.game_board.place(reply)
+
+    def test_stop(self):
+        ponderer = Ponderer(max_depth=10)
+        ponderer.start(GameBoard())
+        self.assertTrue(ponderer.is_running())
+        ponderer.stop()
+        self.assertFalse(ponderer.is_running())
+        self.assertIsNotNone(ponderer.get_move(GameBoard(), 1))
+
+    @patch("builtins.input")
+    def test_console_client(self, input_magic_mock):
+        client = ConsoleClient(self.game_board, self.ponderer)
+
+        def get_input(prompt):
+            if input_magic_mock.call_count == 1:
+                _wait_for(lambda: not self.ponderer.is_running())
+            return inputs.pop(0)
+
+        inputs = ["h", "0", "0"]
+        input_magic_mock.side_effect = get_input
+        with patch("builtins.print") as print_magic_mock:
+            move = client.get_move()
+        self.assertIsNotNone(move)
+        self.assertFalse(self.ponderer.is_running())
+        print_magic_mock.assert_any_call("Hint: WHITE ANT 0 to (1, -1)")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import random
+import tempfile
+import unittest
+import random_play
+from database.position_database import PositionDatabase, get_position_hash
+from rules import notation
+from rules.game_board import GameBoard
+from rules.piece import Piece
+
+
+class PositionDatabaseTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.database = PositionDatabase()
+        self.games = [self.get_random_game(seed) for seed in range(4)]
+
+    def tearDown(self):
+        self.database.close()
+
+    def get_random_game(self, seed):
+        rng = random.Random(seed)
+        game_board = GameBoard()
+        moves = []
+        for _ in range(12):
+            moves.append(random_play.get_random_move(game_board, rng))
+            notation.play_move(game_board, moves[-1])
+        return moves
+
+    def get_board(self, moves):
+        game_board = GameBoard()
+        for move in moves:
+            notation.play_move(game_board, move)
+        return game_board
+
+    def test_position_hash(self):
+        first = GameBoard()
+        second = GameBoard()
+        for game_board, (q, r) in ((first, (0, 0)), (second, (5, -3))):
+            game_board.force_place(Piece(
+                Piece.Creature.ANT, Piece.Color.WHITE, 0, q, r))
+            game_board.force_place(Piece(
+                Piece.Creature.ANT, Piece.Color.BLACK, 1, q + 1, r))
+        self.assertEqual(get_position_hash(first), get_position_hash(second))
+
+        second.player_turn = Piece.Color.BLACK
+        self.assertNotEqual(get_position_hash(first),
+                            get_position_hash(second))
+
+    def test_get_games(self):
+        game_ids = self.database.add_games(
+            (x, None, "seed " + str(i)) for i, x in enumerate(self.games))
+        self.assertEqual(self.database.get_game_count(), 4)
+
+        self.assertEqual(self.database.get_games(GameBoard()),
+                         [(x, 0) for x in game_ids])
+        self.assertEqual(
+            self.database.get_games(self.get_board(self.games[2][:7])),
+            [(game_ids[2], 7)])
+
+    def test_get_result_counts(self):
+        self.database.add_game(self.games[0], GameBoard.Result.WHITE_WON)
+        self.database.add_game(self.games[1], GameBoard.Result.WHITE_WON)
+        self.database.add_game(self.games[2], GameBoard.Result.DRAW)
+        self.database.add_game(self.games[3])
+
+        self.assertEqual(
+            self.database.get_result_counts(GameBoard()),
+            {GameBoard.Result.WHITE_WON: 2, GameBoard.Result.DRAW: 1,
+             None: 1})
+        self.assertEqual(
+            self.database.get_result_counts(
+                self.get_board(self.games[1])),
+            {GameBoard.Result.WHITE_WON: 1})
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "positions.sqlite")
+            with PositionDatabase(path) as database:
+                database.add_game(self.games[0])
+            with PositionDatabase(path) as database:
+                self.assertEqual(len(database.get_games(
+                    self.get_board(self.games[0]))), 1)
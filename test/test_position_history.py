@@ -0,0 +1,119 @@
+import unittest
+from rules.game_board import GameBoard
+from rules.piece import Piece
+
+
+def _play(game_board, creature, color, piece_number, q, r):
+    game_board.force_place(Piece(creature, color, piece_number, q, r))
+    game_board.pass_turn()
+
+
+class PositionHistoryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.game_board = GameBoard()
+        _play(self.game_board, Piece.Creature.BEE, Piece.Color.WHITE, 0, 0, 0)
+        _play(self.game_board, Piece.Creature.BEE, Piece.Color.BLACK, 0, 1, 0)
+        _play(self.game_board, Piece.Creature.ANT, Piece.Color.WHITE, 0, -1, 0)
+        _play(self.game_board, Piece.Creature.ANT, Piece.Color.BLACK, 0, 2, 0)
+
+    def _shuffle_ants(self):
+        """Move both ants away and back, returning to the same position."""
+
+        _play(self.game_board, Piece.Creature.ANT, Piece.Color.WHITE, 0, -1, 1)
+        _play(self.game_board, Piece.Creature.ANT, Piece.Color.BLACK, 0, 2, -1)
+        _play(self.game_board, Piece.Creature.ANT, Piece.Color.WHITE, 0, -1, 0)
+        _play(self.game_board, Piece.Creature.ANT, Piece.Color.BLACK, 0, 2, 0)
+
+    def test_zobrist_hash(self):
+        # The same stacks give the same hash, whatever the order they were
+        # placed in and whichever piece of a creature is used.
+        game_board = GameBoard()
+        _play(game_board, Piece.Creature.BEE, Piece.Color.WHITE, 0, 0, 0)
+        _play(game_board, Piece.Creature.ANT, Piece.Color.BLACK, 2, 2, 0)
+        _play(game_board, Piece.Creature.ANT, Piece.Color.WHITE, 1, -1, 0)
+        _play(game_board, Piece.Creature.BEE, Piece.Color.BLACK, 0, 1, 0)
+        self.assertEqual(game_board.get_zobrist_hash(),
+                         self.game_board.get_zobrist_hash())
+
+        game_board.pass_turn()
+        self.assertNotEqual(game_board.get_zobrist_hash(),
+                            self.game_board.get_zobrist_hash())
+
+        loaded_board = GameBoard(self.game_board.to_json_object())
+        self.assertEqual(loaded_board.get_zobrist_hash(),
+                         self.game_board.get_zobrist_hash())
+        loaded_board, = GameBoard.load_json_objects(
+            [self.game_board.to_json_object()])
+        self.assertEqual(loaded_board.get_zobrist_hash(),
+                         self.game_board.get_zobrist_hash())
+
+    def test_zobrist_hash_stacks(self):
+        start_hash = self.game_board.get_zobrist_hash()
+        _play(self.game_board, Piece.Creature.BEETLE, Piece.Color.WHITE, 0,
+              -2, 0)
+        _play(self.game_board, Piece.Creature.BEETLE, Piece.Color.BLACK, 0,
+              3, 0)
+        placed_hash = self.game_board.get_zobrist_hash()
+        self.assertNotEqual(placed_hash, start_hash)
+
+        _play(self.game_board, Piece.Creature.BEETLE, Piece.Color.WHITE, 0,
+              -1, 0)
+        self.assertNotEqual(self.game_board.get_zobrist_hash(), placed_hash)
+        _play(self.game_board, Piece.Creature.BEETLE, Piece.Color.BLACK, 0,
+              3, 0)
+        _play(self.game_board, Piece.Creature.BEETLE, Piece.Color.WHITE, 0,
+              -2, 0)
+        _play(self.game_board, Piece.Creature.BEETLE, Piece.Color.BLACK, 0,
+              3, 0)
+        self.assertEqual(self.game_board.get_zobrist_hash(), placed_hash)
+
+    def test_repetition_count(self):
+        self.assertEqual(self.game_board.get_repetition_count(), 1)
+        self._shuffle_ants()
+        self.assertEqual(self.game_board.get_repetition_count(), 2)
+        self._shuffle_ants()
+        self.assertEqual(self.game_board.get_repetition_count(), 3)
+
+        # A placement starts the count again.
+        _play(self.game_board, Piece.Creature.SPIDER, Piece.Color.WHITE, 0,
+              -2, 0)
+        self.assertEqual(self.game_board.get_repetition_count(), 1)
+
+    def test_copy(self):
+        self._shuffle_ants()
+        board_copy = self.game_board.copy()
+        self._shuffle_ants()
+        self.assertEqual(self.game_board.get_repetition_count(), 3)
+        self.assertEqual(board_copy.get_repetition_count(), 2)
+        self.assertEqual(len(self.game_board.get_unplaced_pieces()), 24)
+        self.assertEqual(board_copy.get_ply_count(), 8)
+        self.assertEqual(len(board_copy.get_position_history()), 9)
+        self.assertEqual(self.game_board.get_position_history()[:9],
+                         board_copy.get_position_history())
+
+    def test_position_history(self):
+        history = self.game_board.get_position_history()
+        self.assertEqual(len(history), 5)
+        self.assertEqual(history[0], GameBoard().get_zobrist_hash())
+        self.assertEqual(history[-1], self.game_board.get_zobrist_hash())
+        self.assertEqual(self.game_board.get_ply_count(), 4)
+
+    def test_repetition_limit(self):
+        self.game_board.repetition_limit = 3
+        self._shuffle_ants()
+        self.assertIsNone(self.game_board.get_result())
+        self._shuffle_ants()
+        self.assertEqual(self.game_board.get_result(), GameBoard.Result.DRAW)
+
+    def test_move_limit(self):
+        self.game_board.move_limit = 6
+        _play(self.game_board, Piece.Creature.ANT, Piece.Color.WHITE, 0, -1, 1)
+        self.assertIsNone(self.game_board.get_result())
+        self.game_board.pass_turn()
+        self.assertEqual(self.game_board.get_result(), GameBoard.Result.DRAW)
+        self.assertIsNone(GameBoard().get_result())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from rules.game_board import GameBoard
+from rules.piece import Piece
+from search import alpha_beta, proof_number
+
+
+class ProofNumberTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # The black bee at 0,0 has one empty neighbor, at 1,-1, which the
+        # white ant can reach. Black has no moves or placements.
+        self.game_board = GameBoard()
+        pieces = [
+            (Piece.Creature.BEE, Piece.Color.BLACK, 0, 0, 0),
+            (Piece.Creature.BEE, Piece.Color.WHITE, 0, 1, 0),
+            (Piece.Creature.GRASSHOPPER, Piece.Color.WHITE, 0, 0, 1),
+            (Piece.Creature.GRASSHOPPER, Piece.Color.WHITE, 1, -1, 1),
+            (Piece.Creature.SPIDER, Piece.Color.WHITE, 0, -1, 0),
+            (Piece.Creature.BEETLE, Piece.Color.WHITE, 0, 0, -1),
+            (Piece.Creature.ANT, Piece.Color.WHITE, 0, -2, 0),
+        ]
+        for creature, color, piece_number, q, r in pieces:
+            self.game_board.force_place(
+                Piece(creature, color, piece_number, q, r))
+
+    def test_win(self):
+        self.game_board.player_turn = Piece.Color.WHITE
+        solution = proof_number.solve(self.game_board)
+        self.assertTrue(solution.proven)
+        self.assertEqual(
+            alpha_beta.play(self.game_board, solution.move).get_result(),
+            GameBoard.Result.WHITE_WON)
+
+        solution = proof_number.solve(self.game_board, Piece.Color.BLACK)
+        self.assertFalse(solution.proven)
+        self.assertIsNone(solution.move)
+
+    def test_loss(self):
+        # Black has to pass, and then loses.
+        self.game_board.player_turn = Piece.Color.BLACK
+        self.assertEqual(alpha_beta.get_move_list(self.game_board), [])
+
+        solution = proof_number.solve(self.game_board)
+        self.assertFalse(solution.proven)
+        solution = proof_number.solve(self.game_board, Piece.Color.WHITE)
+        self.assertTrue(solution.proven)
+        self.assertIsNone(solution.move)
+
+    def test_table_size(self):
+        self.game_board.player_turn = Piece.Color.BLACK
+        solution = proof_number.solve(self.game_board, Piece.Color.WHITE,
+                                      table_size=1)
+        self.assertTrue(solution.proven)
+
+    def test_node_budget(self):
+        solution = proof_number.solve(GameBoard(), node_budget=5)
+        self.assertIsNone(solution.proven)
+        self.assertIsNone(solution.move)
+        self.assertEqual(solution.node_count, 6)
+
+    def test_finished(self):
+        self.game_board.force_place(
+            Piece(Piece.Creature.ANT, Piece.Color.WHITE, 0, 1, -1))
+        solution = proof_number.solve(self.game_board, Piece.Color.WHITE)
+        self.assertEqual(solution, (True, None, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
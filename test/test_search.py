@@ -0,0 +1,112 @@
+from concurrent import futures
+import math
+import random
+import unittest
+from unittest.mock import MagicMock, patch
+from evaluation.shared_boards import SharedBoards
+from rules.game_board import GameBoard
+from rules.piece import Piece
+from search import alpha_beta
+from search import parallel
+
+
+def _minimax(game_board, depth):
+    result = game_board.get_result()
+    if result is not None or depth == 0:
+        return alpha_beta.negamax(game_board, 0)
+
+    return max(-_minimax(alpha_beta.play(game_board, x), depth - 1)
+               for x in alpha_beta.get_move_list(game_board) or [None])
+
+
+def _evaluate_constant(game_board):
+    return 42.0
+
+
+class SearchTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.game_boards = []
+
+        rng = random.Random(2)
+        for _ in range(3):
+            game_board = GameBoard()
+            for _ in range(8):
+                moves = alpha_beta.get_move_list(game_board)
+                game_board = alpha_beta.play(game_board, rng.choice(moves))
+            self.game_boards.append(game_board)
+
+    def get_bee_win_board(self):
+        """Get a board where white can surround the black bee with the
+        white ant."""
+
+        game_board = GameBoard()
+        pieces = [
+            (Piece.Creature.BEE, Piece.Color.BLACK, 0, 0, 0),
+            (Piece.Creature.BEE, Piece.Color.WHITE, 0, 0, -1),
+            (Piece.Creature.SPIDER, Piece.Color.WHITE, 0, 1, -1),
+            (Piece.Creature.SPIDER, Piece.Color.WHITE, 1, 1, 0),
+            (Piece.Creature.BEETLE, Piece.Color.WHITE, 0, -1, 0),
+            (Piece.Creature.GRASSHOPPER, Piece.Color.WHITE, 0, -1, 1),
+            (Piece.Creature.ANT, Piece.Color.WHITE, 0, 0, -2),
+        ]
+        for creature, color, piece_number, q, r in pieces:
+            game_board.force_place(Piece(creature, color, piece_number, q, r))
+        return game_board
+
+    def test_get_result(self):
+        game_board = self.get_bee_win_board()
+        self.assertIsNone(game_board.get_result())
+
+        game_board.force_place(Piece(
+            Piece.Creature.ANT, Piece.Color.WHITE, 0, 0, 1))
+        self.assertEqual(game_board.get_result(), GameBoard.Result.WHITE_WON)
+
+    def test_negamax(self):
+        for board_index, game_board in enumerate(self.game_boards):
+            with self.subTest(board_index=board_index):
+                self.assertEqual(alpha_beta.negamax(game_board, 2),
+                                 _minimax(game_board, 2))
+
+    def test_get_best_move(self):
+        value, move = alpha_beta.get_best_move(self.get_bee_win_board(), 1)
+
+        self.assertEqual(value, alpha_beta.WIN_VALUE)
+        self.assertEqual((move.creature, move.q, move.r),
+                         (Piece.Creature.ANT, 0, 1))
+
+    def test_parallel(self):
+        with futures.ProcessPoolExecutor(2) as executor:
+            value, move, depth = parallel.get_best_move(
+                self.get_bee_win_board(), math.inf, executor=executor,
+                worker_count=2)
+            self.assertEqual((value, depth), (alpha_beta.WIN_VALUE, 1))
+            self.assertEqual((move.creature, move.q, move.r),
+                             (Piece.Creature.ANT, 0, 1))
+
+            for board_index, game_board in enumerate(self.game_boards):
+                value, move, depth = parallel.get_best_move(
+                    game_board, math.inf, max_depth=2, executor=executor,
+                    worker_count=2)
+                expected, _ = alpha_beta.get_best_move(game_board, 2)
+                with self.subTest(board_index=board_index):
+                    self.assertEqual((value, depth), (expected, 2))
+
+    @patch.object(SharedBoards, "get_moves", return_value=[])
+    def test_parallel_no_moves(self, get_moves_magic_mock):
+        executor = MagicMock()
+        self.assertEqual(
+            parallel.get_best_move(self.game_boards[0], math.inf,
+                                   executor=executor,
+                                   evaluate=_evaluate_constant),
+            (42.0, None, 0))
+        executor.submit.assert_not_called()
+
+    def test_parallel_deadline(self):
+        game_board = self.game_boards[0]
+        value, move, depth = parallel.get_best_move(
+            game_board, 0.5, worker_count=2)
+
+        self.assertIn(str(move) + str((move.q, move.r)),
+                      {str(x) + str((x.q, x.r))
+                       for x in alpha_beta.get_move_list(game_board)})
@@ -0,0 +1,121 @@
+import multiprocessing
+import unittest
+import random_play
+from evaluation import features
+from evaluation.shared_boards import SharedBoards
+from rules.game_board import GameBoard
+
+
+def _get_worker_positions(name):
+    shared_boards = SharedBoards.attach(name)
+    try:
+        return [_get_position(shared_boards.get_game_board(i))
+                for i in range(len(shared_boards))]
+    finally:
+        shared_boards.close()
+
+
+def _store_keys(name, keys, count):
+    shared_boards = SharedBoards.attach(name)
+    try:
+        for i in range(count):
+            key = keys[i % len(keys)]
+            shared_boards.store(key, _get_table_value(key), 3)
+    finally:
+        shared_boards.close()
+
+
+def _get_table_value(key):
+    return key * 0.5 + 0.25
+
+
+def _get_position(game_board):
+    stacks = {
+        (x.q, x.r): tuple(str(y) for y in game_board.get_stack(x.q, x.r))
+        for x in game_board.get_placed_pieces()}
+    return sorted(stacks.items()), int(game_board.player_turn)
+
+
+class SharedBoardsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.game_boards = [GameBoard()] + random_play.get_random_boards(
+            7, 6, 30)
+
+        self.piece_moves = [x.get_moves() for x in self.game_boards]
+        self.shared_boards = SharedBoards.create(
+            self.game_boards, self.piece_moves, table_size=16)
+
+    def tearDown(self):
+        self.shared_boards.close()
+
+    def test_get_game_board(self):
+        for board_index, game_board in enumerate(self.game_boards):
+            with self.subTest(board_index=board_index):
+                self.assertEqual(
+                    _get_position(
+                        self.shared_boards.get_game_board(board_index)),
+                    _get_position(game_board))
+
+    def test_packed(self):
+        expected = features.pack_game_boards(self.game_boards)
+        for name, values in expected.items():
+            with self.subTest(name=name):
+                self.assertTrue(
+                    (self.shared_boards.packed[name] == values).all())
+
+    def test_get_moves(self):
+        for board_index, piece_moves in enumerate(self.piece_moves):
+            expected = {(str(x), y.q, y.r)
+                        for x, destinations in piece_moves.items()
+                        for y in destinations}
+            moves = self.shared_boards.get_moves(board_index)
+            with self.subTest(board_index=board_index):
+                self.assertEqual(len(moves), len(expected))
+                self.assertEqual({(str(x), x.q, x.r) for x in moves},
+                                 expected)
+
+    def test_table(self):
+        self.assertIsNone(self.shared_boards.probe(3))
+        self.shared_boards.store(3, 0.5, 2)
+        self.assertEqual(self.shared_boards.probe(3), (0.5, 2))
+        self.assertIsNone(self.shared_boards.probe(19))
+
+        # Shallower results don't replace deeper ones.
+        self.shared_boards.store(19, 1.0, 1)
+        self.assertEqual(self.shared_boards.probe(3), (0.5, 2))
+        self.shared_boards.store(19, 1.0, 4)
+        self.assertEqual(self.shared_boards.probe(19), (1.0, 4))
+
+    def test_concurrent_table(self):
+        # Every key shares the single slot, so probes overlap stores.
+        shared_boards = SharedBoards.create([GameBoard()], table_size=1)
+        self.addCleanup(shared_boards.close)
+        keys = list(range(1, 9))
+        writers = [multiprocessing.Process(
+                       target=_store_keys,
+                       args=(shared_boards.name, keys[i::2], 200000))
+                   for i in range(2)]
+        for writer in writers:
+            writer.start()
+
+        hit_count = 0
+        while any(x.is_alive() for x in writers):
+            for key in keys:
+                entry = shared_boards.probe(key)
+                if entry is not None:
+                    hit_count += 1
+                    self.assertEqual(entry, (_get_table_value(key), 3))
+        for writer in writers:
+            writer.join()
+            self.assertEqual(writer.exitcode, 0)
+        self.assertGreater(hit_count, 0)
+
+    def test_attach(self):
+        with multiprocessing.Pool(2) as pool:
+            positions = pool.map(_get_worker_positions,
+                                 [self.shared_boards.name] * 2)
+
+        expected = [_get_position(x) for x in self.game_boards]
+        for worker_positions in positions:
+            self.assertEqual(worker_positions, expected)
@@ -0,0 +1,75 @@
+from concurrent import futures
+import random
+import unittest
+from unittest.mock import MagicMock, patch
+from rules import game_board as game_board_module
+from rules.game_board import GameBoard
+from search import alpha_beta
+
+
+def _get_random_boards(seed, count, plies):
+    rng = random.Random(seed)
+    game_boards = []
+    for _ in range(count):
+        game_board = GameBoard()
+        for _ in range(plies):
+            moves = alpha_beta.get_move_list(game_board)
+            game_board = alpha_beta.play(
+                game_board, rng.choice(moves) if moves else None)
+        game_boards.append(game_board)
+    return game_boards
+
+
+def _normalize(piece_moves):
+    return {piece: {(x.q, x.r) for x in destinations}
+            for piece, destinations in piece_moves.items()}
+
+
+class ThreadedMovesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.game_boards = _get_random_boards(4, 4, 30)
+        self.executor = futures.ThreadPoolExecutor(4)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    @patch.object(game_board_module, "_is_gil_enabled", return_value=False)
+    def test_free_threaded(self, is_gil_enabled_magic_mock):
+        for game_board in self.game_boards:
+            expected = _normalize(
+                GameBoard(game_board.to_json_object()).get_moves())
+            self.assertEqual(
+                _normalize(game_board.get_moves(self.executor)), expected)
+
+        expected = [_normalize(GameBoard(x.to_json_object()).get_moves())
+                    for x in self.game_boards]
+        self.assertEqual(
+            [_normalize(x) for x in GameBoard.get_moves_of_boards(
+                self.game_boards, self.executor)],
+            expected)
+
+    def test_gil_fallback(self):
+        executor = MagicMock()
+        with patch.object(game_board_module, "_is_gil_enabled",
+                          return_value=True):
+            for game_board in self.game_boards:
+                game_board.get_moves(executor)
+            GameBoard.get_moves_of_boards(self.game_boards, executor)
+        executor.map.assert_not_called()
+
+    @patch.object(game_board_module, "_is_gil_enabled", return_value=False)
+    def test_shared_cache(self, is_gil_enabled_magic_mock):
+        # Copies share a move cache until they are changed, so threads on
+        # each copy fill the same one.
+        game_board = self.game_boards[0]
+        copies = [game_board.copy() for _ in range(8)]
+        results = GameBoard.get_moves_of_boards(copies, self.executor)
+        for piece_moves in results[1:]:
+            self.assertEqual(_normalize(piece_moves),
+                             _normalize(results[0]))
+        self.assertIs(copies[0].get_move_cache(), game_board.get_move_cache())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import io
+import math
+import unittest
+from rules import notation
+from rules.game_board import GameBoard
+from search import tournament
+from search.tournament import GameRecord
+
+
+def _get_record(white, black, result):
+    return GameRecord(white, black, 0, result, [], 0.0)
+
+
+class TournamentTestCase(unittest.TestCase):
+
+    def test_parse_player(self):
+        self.assertEqual(tournament.parse_player("depth:2"),
+                         ("depth:2", "depth", 2))
+        self.assertEqual(tournament.parse_player("time:0.5").budget, 0.5)
+        self.assertEqual(tournament.parse_player("random").kind, "random")
+        for spec in ("depth", "depth:0", "depth:x", "random:1", "best"):
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    tournament.parse_player(spec)
+
+    def test_pairings(self):
+        specs = ["random", "depth:1", "depth:2"]
+        pairings = tournament.get_round_robin_pairings(specs, 2)
+        self.assertEqual(len(pairings), 6)
+        for spec in specs:
+            self.assertEqual(sum(x[0] == spec for x in pairings), 2)
+            self.assertEqual(sum(x[1] == spec for x in pairings), 2)
+
+        self.assertEqual(tournament.get_gauntlet_pairings(specs, 2), [
+            ("random", "depth:1"), ("depth:1", "random"),
+            ("random", "depth:2"), ("depth:2", "random")])
+
+        # Odd games_per_pair are rounded up to keep the colors balanced.
+        self.assertEqual(
+            tournament.get_round_robin_pairings(specs[:2], 3),
+            [("random", "depth:1"), ("depth:1", "random")] * 2)
+        self.assertEqual(len(tournament.get_gauntlet_pairings(specs, 1)),
+                         4)
+
+    def test_play_game(self):
+        game_record = tournament.play_game("random", "depth:1", 3,
+                                           move_limit=30)
+        self.assertIn(game_record.result, list(GameBoard.Result))
+        self.assertLessEqual(len(game_record.moves), 30)
+
+        output = io.StringIO()
+        tournament.write_game_records([game_record], output)
+        (game_board, moves), = notation.read_games(
+            output.getvalue().splitlines())
+        self.assertEqual(len(moves), len(game_record.moves))
+
+        # Games are the same for the same seed.
+        self.assertEqual(
+            tournament.play_game("random", "depth:1", 3,
+                                 move_limit=30).moves,
+            game_record.moves)
+
+    def test_run(self):
+        pairings = tournament.get_round_robin_pairings(
+            ["random", "depth:1"], 2)
+        game_records, seconds = tournament.run(
+            pairings, worker_count=2, seed=5, move_limit=20)
+        self.assertGreater(seconds, 0)
+        self.assertEqual([(x.white, x.black) for x in game_records],
+                         pairings)
+        # Both games of a color-swapped pair share a seed and its opening.
+        self.assertEqual([x.seed for x in game_records], [5, 5])
+        self.assertEqual(game_records[0].moves[:2],
+                         game_records[1].moves[:2])
+
+    def test_elo_estimates(self):
+        game_records = (
+            [_get_record("a", "b", GameBoard.Result.WHITE_WON)] * 3 +
+            [_get_record("b", "a", GameBoard.Result.WHITE_WON)] +
+            [_get_record("a", "b", GameBoard.Result.DRAW)] * 2)
+        first, second = tournament.get_elo_estimates(game_records)
+
+        self.assertEqual(first.spec, "a")
+        self.assertEqual(first.games, 6)
+        self.assertAlmostEqual(first.score, 4 / 6)
+        self.assertAlmostEqual(first.elo, 400 * math.log10(2))
+        self.assertAlmostEqual(second.elo, -first.elo)
+        self.assertLess(first.lower, first.elo)
+        self.assertGreater(first.upper, first.elo)
+
+        first, second = tournament.get_elo_estimates(
+            [_get_record("a", "b", GameBoard.Result.BLACK_WON)])
+        self.assertEqual((first.spec, first.elo), ("b", math.inf))
+        self.assertEqual(second.elo, -math.inf)
+
+
+if __name__ == '__main__':
+    unittest.main()
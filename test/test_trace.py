@@ -0,0 +1,107 @@
+import io
+import json
+import unittest
+from rules.game_board import GameBoard
+from rules.piece import Piece
+from rules.trace import Tracer
+
+
+class TraceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.game_board = GameBoard()
+        self.tracer = self.game_board.start_trace(capacity=50)
+
+    def _get_kinds(self):
+        return [x.kind for x in self.tracer.get_events()]
+
+    def test_off(self):
+        game_board = GameBoard()
+        self.assertIsNone(game_board.get_tracer())
+        game_board.get_moves()
+        self.assertIs(self.game_board.start_trace(), self.tracer)
+
+        self.game_board.stop_trace()
+        self.game_board.get_moves()
+        self.assertEqual(len(self.tracer), 0)
+
+    def test_moves(self):
+        self.game_board.place(
+            Piece(Piece.Creature.BEE, Piece.Color.WHITE, 0, 0, 0))
+        self.assertEqual(self._get_kinds(), ["move", "turn"])
+
+        move, turn = self.tracer.get_events()
+        self.assertEqual(move.data["to_coords"], [0, 0])
+        self.assertIsNone(move.data["from_coords"])
+        self.assertEqual(turn.data, {"player_turn": "BLACK"})
+        self.assertLessEqual(move.time_ns, turn.time_ns)
+
+        self.tracer.clear()
+        piece_moves = self.game_board.get_moves()
+        event, = self.tracer.get_events()
+        self.assertEqual(event.kind, "moves_generated")
+        self.assertEqual(event.data["count"],
+                         sum(len(x) for x in piece_moves.values()))
+        self.assertGreaterEqual(event.data["duration_ns"], 0)
+
+    def test_cache(self):
+        for piece in [
+                Piece(Piece.Creature.BEE, Piece.Color.WHITE, 0, 0, 0),
+                Piece(Piece.Creature.BEE, Piece.Color.BLACK, 0, 1, 0)]:
+            self.game_board.place(piece)
+        self.tracer.clear()
+
+        self.game_board.get_moves()
+        self.game_board.get_moves()
+        kinds = self._get_kinds()
+        self.assertEqual(kinds.count("cache_miss"), 1)
+        self.assertEqual(kinds.count("cache_hit"), 1)
+
+    def test_invalid_move(self):
+        with self.assertRaises(ValueError):
+            self.game_board.place(
+                Piece(Piece.Creature.BEE, Piece.Color.BLACK, 0, 0, 0))
+        with self.assertRaises(ValueError):
+            self.game_board.force_place(
+                Piece(Piece.Creature.BEE, Piece.Color.WHITE, 0))
+        self.assertEqual(self._get_kinds(),
+                         ["invalid_move", "invalid_move"])
+        self.assertIn("coordinates",
+                      self.tracer.get_events()[1].data["message"])
+
+    def test_copy(self):
+        board_copy = self.game_board.copy()
+        self.assertIsNone(board_copy.get_tracer())
+        board_copy.get_moves()
+        self.assertEqual(len(self.tracer), 0)
+
+    def test_capacity(self):
+        tracer = Tracer(capacity=3)
+        for i in range(5):
+            tracer.record("turn", index=i)
+        self.assertEqual([x.data["index"] for x in tracer.get_events()],
+                         [2, 3, 4])
+        with self.assertRaises(ValueError):
+            Tracer(capacity=0)
+
+    def test_dump_on_exception(self):
+        output = io.StringIO()
+        with self.assertRaises(ValueError):
+            with self.tracer.dump_on_exception(output):
+                self.game_board.get_moves()
+                self.game_board.place(
+                    Piece(Piece.Creature.ANT, Piece.Color.WHITE, 0, 5, 5))
+
+        lines = [json.loads(x) for x in output.getvalue().splitlines()]
+        self.assertEqual([x["kind"] for x in lines],
+                         ["moves_generated", "invalid_move"])
+        self.assertEqual(set(lines[0]), {"time_ns", "kind", "data"})
+
+        output = io.StringIO()
+        with self.tracer.dump_on_exception(output):
+            pass
+        self.assertEqual(output.getvalue(), "")
+
+
+if __name__ == '__main__':
+    unittest.main()